@@ -0,0 +1,259 @@
+"""
+End-to-end benchmark of the booking burst against the local Booked stand-in.
+
+For each resource count the benchmark logs in from a cold client, fires one
+burst with ``attempt_batch_booking`` and reports:
+
+- cold start to first byte (new client -> first reservation response)
+- burst spread (first vs last request arrival, as seen by the server)
+- p50/p99 per-request latency and total burst duration
+- median queue / send / server time per request (``RequestTiming``)
+- CPU time spent building payloads and parsing the CSRF token
+- peak Python memory during the burst (separate tracemalloc run)
+
+Results are emitted as JSON so runs can be compared between releases.
+
+Run with:
+    uv run python -m benchmarks.bench_burst --output bench.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+from importlib import metadata
+from typing import Any
+from unittest.mock import patch
+
+# The booking module reads credentials at import time; the stand-in accepts any
+os.environ.setdefault("UZH_USERNAME", "benchmark")
+os.environ.setdefault("UZH_PASSWORD", "benchmark")
+os.environ.setdefault("UZH_TOTP_SECRET", "JBSWY3DPEHPK3PXP")
+
+import httpx
+
+from benchmarks.standin import (
+    BookedStandIn,
+    LatencyModel,
+    StandInConfig,
+    point_booker_at,
+)
+from scheduler.amain import (
+    OWNER_ID,
+    BookingRequest,
+    attempt_batch_booking,
+    authenticate_client,
+    build_reservation_request,
+    compile_reservation_template,
+    create_http_client,
+    extract_csrf_token,
+    get_csrf_token_from_schedule_page,
+)
+
+DEFAULT_SIZES = (32, 256, 2048)
+CSRF_REPEATS = 50
+
+
+def percentile(values: list[float], pct: int) -> float:
+    """Percentile (1-99) of a list of values."""
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100, method="inclusive")[pct - 1]
+
+
+def package_version() -> str:
+    """Installed version of the booker."""
+    try:
+        return metadata.version("scheduler")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+class ResponseTimer:
+    """httpx event hooks measuring reservation request latency."""
+
+    def __init__(self) -> None:
+        self.started: dict[int, float] = {}
+        self.latencies: list[float] = []
+        self.first_response_at: float | None = None
+
+    async def on_request(self, request: httpx.Request) -> None:
+        if request.url.path.endswith("reservation.php"):
+            self.started[id(request)] = time.perf_counter()
+
+    async def on_response(self, response: httpx.Response) -> None:
+        started = self.started.pop(id(response.request), None)
+        if started is None:
+            return
+        now = time.perf_counter()
+        self.latencies.append(now - started)
+        if self.first_response_at is None:
+            self.first_response_at = now
+
+    def install(self, client: httpx.AsyncClient) -> None:
+        client.event_hooks["request"].append(self.on_request)
+        client.event_hooks["response"].append(self.on_response)
+
+
+async def run_burst(
+    config: StandInConfig, resources: int, target_date: date, *, trace_memory: bool
+) -> dict[str, Any]:
+    """Log in from a cold client and fire one burst."""
+    async with BookedStandIn(config) as server:
+        with (
+            point_booker_at(server.base_url),
+            patch("scheduler.amain.PREFERRED_RANGE", range(1, resources + 1)),
+            # Stand-in outcomes must not reach the learned seat statistics
+            patch("scheduler.amain.RANK_BY_WIN_RATE", False),
+            patch("scheduler.amain.resource_stats.record"),
+            patch("scheduler.amain.JOURNAL_ATTEMPTS", False),
+        ):
+            cold_start = time.perf_counter()
+            client = create_http_client()
+            timer = ResponseTimer()
+            timer.install(client)
+            try:
+                await authenticate_client(client)
+                csrf_token = await get_csrf_token_from_schedule_page(client)
+
+                if trace_memory:
+                    tracemalloc.start()
+                burst_start = time.perf_counter()
+                results = await attempt_batch_booking(client, csrf_token, target_date)
+                burst_end = time.perf_counter()
+                peak = 0
+                if trace_memory:
+                    _, peak = tracemalloc.get_traced_memory()
+                    tracemalloc.stop()
+            finally:
+                await client.aclose()
+
+        arrivals = sorted(
+            a.received_at
+            for a in server.arrivals
+            if not a.owner.startswith("competitor-")
+        )
+
+    return {
+        "cold_start": cold_start,
+        "timer": timer,
+        "arrivals": arrivals,
+        "burst_duration": burst_end - burst_start,
+        "successes": sum(1 for r in results if r.success),
+        "timings": [r.timing for r in results if r.timing],
+        "memory_peak": peak,
+    }
+
+
+def measure_cpu(resources: int, target_date: date, page: bytes) -> dict[str, float]:
+    """CPU time of payload building (whole burst) and CSRF parsing (per page)."""
+    client = httpx.AsyncClient()
+    requests = [
+        BookingRequest(
+            resource_id=str(resource_id),
+            owner_id=OWNER_ID,
+            reservation_date=target_date,
+        )
+        for resource_id in range(1, resources + 1)
+    ]
+
+    started = time.process_time()
+    template = compile_reservation_template(requests[0], "x" * 44)
+    for request in requests:
+        build_reservation_request(client, request, "x" * 44, template)
+    payload_cpu = time.process_time() - started
+
+    started = time.process_time()
+    for _ in range(CSRF_REPEATS):
+        extract_csrf_token(page)
+    csrf_cpu = (time.process_time() - started) / CSRF_REPEATS
+
+    return {"payload_build_ms": payload_cpu * 1000, "csrf_parse_ms": csrf_cpu * 1000}
+
+
+async def bench_size(config: StandInConfig, resources: int) -> dict[str, Any]:
+    """Benchmark one resource count."""
+    target_date = date.today() + timedelta(days=7)
+    timed = await run_burst(config, resources, target_date, trace_memory=False)
+    traced = await run_burst(config, resources, target_date, trace_memory=True)
+
+    timer: ResponseTimer = timed["timer"]
+    latencies_ms = [latency * 1000 for latency in timer.latencies]
+    arrivals = timed["arrivals"]
+    first_byte = (timer.first_response_at or timed["cold_start"]) - timed["cold_start"]
+    page = BookedStandIn(config)._schedule_page("x" * 43 + "=")
+    phases = {
+        name: [
+            value * 1000
+            for t in timed["timings"]
+            if (value := getattr(t, f"{name}_time")) is not None
+        ]
+        for name in ("queue", "send", "server")
+    }
+
+    return {
+        "resources": resources,
+        "successes": timed["successes"],
+        "cold_start_to_first_byte_ms": first_byte * 1000,
+        "burst_spread_ms": (arrivals[-1] - arrivals[0]) * 1000 if arrivals else 0.0,
+        "burst_duration_ms": timed["burst_duration"] * 1000,
+        "latency_ms": {
+            "p50": percentile(latencies_ms, 50),
+            "p99": percentile(latencies_ms, 99),
+            "max": max(latencies_ms, default=0.0),
+        },
+        "phase_p50_ms": {name: percentile(v, 50) for name, v in phases.items()},
+        "cpu_ms": measure_cpu(resources, target_date, page),
+        "memory_peak_kib": traced["memory_peak"] / 1024,
+    }
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    """Run the benchmark for all sizes."""
+    config = StandInConfig(
+        latency=LatencyModel(args.latency_ms, args.sigma), seed=args.seed
+    )
+    results = [await bench_size(config, size) for size in args.sizes]
+    return {
+        "benchmark": "burst",
+        "version": package_version(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "server": {"latency_median_ms": args.latency_ms, "latency_sigma": args.sigma},
+        "results": results,
+    }
+
+
+def main() -> None:
+    """Entry point."""
+    parser = argparse.ArgumentParser(description="Booking burst benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--latency-ms", type=float, default=40.0)
+    parser.add_argument("--sigma", type=float, default=0.5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    for name in ("scheduler", "httpx"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+    report = json.dumps(asyncio.run(run(args)), indent=2)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report + "\n")
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
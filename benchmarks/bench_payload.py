@@ -0,0 +1,100 @@
+"""
+Microbenchmark: per-request body encoding cost of a reservation burst.
+
+Compares the regular path (payload dict, ``json.dumps``, httpx multipart
+encoding per request) with a precompiled multipart template.
+
+Run with:
+    uv run python -m benchmarks.bench_payload
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import timeit
+from collections.abc import Callable
+from datetime import date
+
+# The booking module reads credentials at import time; none are needed here
+os.environ.setdefault("UZH_USERNAME", "benchmark")
+os.environ.setdefault("UZH_PASSWORD", "benchmark")
+os.environ.setdefault("UZH_TOTP_SECRET", "JBSWY3DPEHPK3PXP")
+
+import httpx
+
+from scheduler.amain import (
+    BookingRequest,
+    build_reservation_request,
+    calculate_booking_times,
+    compile_reservation_template,
+    create_booking_form_parts,
+    create_reservation_payload,
+)
+
+REPEATS = 5
+NUMBER = 2000
+CSRF_TOKEN = "x" * 44
+RESERVATION_DATE = date(2025, 6, 22)
+
+
+def bench(label: str, func: Callable[[], object], number: int = NUMBER) -> float:
+    """Time ``func`` and print the best per-call time in microseconds."""
+    best = min(timeit.repeat(func, repeat=REPEATS, number=number)) / number
+    print(f"  {label:<34} {best * 1e6:8.2f} µs/request")
+    return best
+
+
+def encode_regular_body(request: BookingRequest) -> bytes:
+    """Encode a reservation body the way the per-request path does."""
+    start_time, end_time = calculate_booking_times(
+        request.reservation_date or RESERVATION_DATE
+    )
+    payload = create_reservation_payload(request, start_time, end_time)
+    files = create_booking_form_parts(payload, CSRF_TOKEN)
+    return httpx.Request("POST", "http://bench.invalid/", files=files).read()
+
+
+async def run() -> None:
+    """Run the benchmark."""
+    request = BookingRequest(
+        resource_id="231", owner_id=1843, reservation_date=RESERVATION_DATE
+    )
+
+    async with httpx.AsyncClient() as client:
+        template = compile_reservation_template(request, CSRF_TOKEN)
+
+        print("Reservation body only:")
+        regular_body = bench(
+            "dict + json.dumps + multipart", lambda: encode_regular_body(request)
+        )
+        template_body = bench("template splice", lambda: template.render("231"))
+        bench(
+            "template compile (once per burst)",
+            lambda: compile_reservation_template(request, CSRF_TOKEN),
+            number=NUMBER // 10,
+        )
+
+        print("Full request build (httpx.Request, headers, cookies, body):")
+        regular_request = bench(
+            "regular",
+            lambda: build_reservation_request(client, request, CSRF_TOKEN).read(),
+        )
+        template_request = bench(
+            "templated",
+            lambda: build_reservation_request(
+                client, request, CSRF_TOKEN, template
+            ).read(),
+        )
+
+        print(f"Speedup body:    {regular_body / template_body:.1f}x")
+        print(f"Speedup request: {regular_request / template_request:.1f}x")
+
+
+def main() -> None:
+    """Entry point."""
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,635 @@
+"""
+Local stand-in for the Booked endpoints used by the booker.
+
+Serves the login flow (``index.php``, ``auth/confirm-account.php``), the
+schedule page with its CSRF token, ``api/reservation.php?action=create`` and
+``schedule.php?dr=reservations`` over real local sockets, with configurable
+server latency, session expiry, a release instant before which the target day
+is "too far in the future", and simulated competitors racing for the same
+seats. Error payloads use the German messages the real server sends.
+
+Run standalone (no network required):
+    uv run python -m benchmarks.standin --port 8080 --competitors 20
+
+or use ``BookedStandIn`` as an async context manager from benchmarks/tests.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import random
+import secrets
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from email.utils import formatdate
+from typing import Any, Self
+from urllib.parse import parse_qs, urlsplit
+
+logger = logging.getLogger(__name__)
+
+BASE_PATH = "/ub/Web/"
+
+TOO_FAR_ERROR = (
+    "Die Reservierung liegt zu weit in der Zukunft. "
+    "Der späteste Zeitpunkt ist {latest:%d/%m/%Y} 23:59:00."
+)
+ONE_AT_A_TIME_ERROR = (
+    "Es ist nur eine Reservierung zur selben Zeit möglich.\n{day:%d/%m/%Y}\n"
+)
+CONFLICT_ERROR = (
+    "Es gibt in Konflikt stehende Reservierungen an folgenden Tagen:\n{day:%d/%m/%Y}"
+)
+
+STATUS_TEXT = {200: "OK", 302: "Found", 401: "Unauthorized", 404: "Not Found"}
+
+
+@dataclass
+class LatencyModel:
+    """Log-normal latency distribution (``sigma=0`` gives a fixed latency)."""
+
+    median_ms: float = 40.0
+    sigma: float = 0.5
+
+    def sample(self, rng: random.Random) -> float:
+        """Draw one latency in seconds."""
+        if self.sigma <= 0:
+            return self.median_ms / 1000
+        return rng.lognormvariate(0.0, self.sigma) * self.median_ms / 1000
+
+
+@dataclass
+class StandInConfig:
+    """Behaviour of the stand-in server."""
+
+    latency: LatencyModel = field(default_factory=LatencyModel)
+    session_ttl: float = 6 * 60 * 60
+    horizon_days: int = 7
+    # Epoch instant the booking window opens; before it, the last bookable day
+    # is one day earlier (like the real server before midnight)
+    release_at: float | None = None
+    clock_offset: float = 0.0
+    page_size: int = 170_000
+    token_position: float = 0.8
+    keepalive_timeout: float = 5.0
+    competitors: int = 0
+    competitor_burst: int = 4
+    competitor_resources: range = range(231, 263)
+    competitor_slot: tuple[datetime, datetime] | None = None
+    competitor_reaction: LatencyModel = field(
+        default_factory=lambda: LatencyModel(median_ms=30.0, sigma=0.6)
+    )
+    seed: int | None = None
+
+
+@dataclass
+class Reservation:
+    """A reservation held by a user (or simulated competitor)."""
+
+    reference_number: str
+    owner: str
+    resource_id: str
+    start: datetime
+    end: datetime
+    created_at: float = field(default_factory=time.time)
+
+
+@dataclass
+class Arrival:
+    """A reservation request as observed by the server."""
+
+    received_at: float
+    resource_id: str
+    owner: str
+    success: bool = False
+
+
+@dataclass
+class Session:
+    """Server-side session state."""
+
+    created_at: float
+    authenticated: bool = False
+    csrf_token: str = field(default_factory=lambda: secrets.token_urlsafe(32))
+
+
+class BookedStandIn:
+    """Asyncio HTTP/1.1 server imitating the Booked endpoints."""
+
+    def __init__(self, config: StandInConfig | None = None) -> None:
+        """
+        Create a server (call ``start`` or use ``async with``).
+
+        Args:
+            config: Server behaviour (defaults to ``StandInConfig()``)
+        """
+        self.config = config or StandInConfig()
+        self.rng = random.Random(self.config.seed)
+        self.sessions: dict[str, Session] = {}
+        self.reservations: list[Reservation] = []
+        self.arrivals: list[Arrival] = []
+        self.connections = 0
+        self._server: asyncio.Server | None = None
+        self._competitor_task: asyncio.Task[None] | None = None
+        self._handlers: dict[asyncio.Task[Any], asyncio.StreamWriter] = {}
+        self._lock = asyncio.Lock()
+
+    # --- Lifecycle ---
+
+    @property
+    def port(self) -> int:
+        """Port the server listens on."""
+        if self._server is None:
+            raise RuntimeError("Server is not running")
+        return int(self._server.sockets[0].getsockname()[1])
+
+    @property
+    def base_url(self) -> str:
+        """Equivalent of ``BookingDetails.base_url`` for this server."""
+        return f"http://127.0.0.1:{self.port}{BASE_PATH}"
+
+    async def start(self, port: int = 0) -> None:
+        """Start listening (``port=0`` picks a free port)."""
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", port)
+        if self.config.competitors and self.config.competitor_slot:
+            self._competitor_task = asyncio.create_task(self._run_competitors())
+
+    async def stop(self) -> None:
+        """Stop the server and any competitor simulation."""
+        if self._competitor_task:
+            self._competitor_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._competitor_task
+        if self._server:
+            self._server.close()
+            # Close idle keep-alive connections so their handlers finish
+            # before the event loop does
+            handlers = list(self._handlers)
+            for writer in self._handlers.values():
+                writer.close()
+            await asyncio.gather(*handlers, return_exceptions=True)
+            await self._server.wait_closed()
+
+    async def __aenter__(self) -> Self:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.stop()
+
+    # --- Server clock and booking rules ---
+
+    def server_time(self) -> float:
+        """Current epoch time on the simulated server clock."""
+        return time.time() + self.config.clock_offset
+
+    def latest_bookable_day(self) -> date:
+        """Last day reservations may be made for right now."""
+        now = self.server_time()
+        horizon = self.config.horizon_days
+        if self.config.release_at is not None and now < self.config.release_at:
+            horizon -= 1
+        return date.fromtimestamp(now) + timedelta(days=horizon)
+
+    async def reserve(
+        self, owner: str, resource_id: str, start: datetime, end: datetime
+    ) -> tuple[str | None, str | None]:
+        """
+        Apply the booking rules to one request after the server latency.
+
+        Returns:
+            Tuple of (reference_number, error); exactly one is set
+        """
+        arrival = Arrival(time.perf_counter(), resource_id, owner)
+        self.arrivals.append(arrival)
+        await asyncio.sleep(self.config.latency.sample(self.rng))
+
+        async with self._lock:
+            latest = self.latest_bookable_day()
+            if start.date() > latest:
+                return None, TOO_FAR_ERROR.format(latest=latest)
+
+            def overlaps(r: Reservation) -> bool:
+                return r.start < end and start < r.end
+
+            if any(r.owner == owner and overlaps(r) for r in self.reservations):
+                return None, ONE_AT_A_TIME_ERROR.format(day=start)
+            if any(
+                r.resource_id == resource_id and overlaps(r) for r in self.reservations
+            ):
+                return None, CONFLICT_ERROR.format(day=start)
+
+            reference_number = secrets.token_hex(4).upper()
+            self.reservations.append(
+                Reservation(reference_number, owner, resource_id, start, end)
+            )
+            arrival.success = True
+            return reference_number, None
+
+    async def cancel(self, reference_number: str) -> bool:
+        """
+        Cancel a reservation, freeing its resource.
+
+        Returns:
+            Whether the reservation existed
+        """
+        async with self._lock:
+            for reservation in self.reservations:
+                if reservation.reference_number == reference_number:
+                    self.reservations.remove(reservation)
+                    return True
+            return False
+
+    async def _run_competitors(self) -> None:
+        """Simulated users bursting at the release instant."""
+        config = self.config
+        assert config.competitor_slot is not None
+        start, end = config.competitor_slot
+        if config.release_at is not None:
+            await asyncio.sleep(max(0.0, config.release_at - self.server_time()))
+
+        async def competitor(index: int) -> None:
+            await asyncio.sleep(config.competitor_reaction.sample(self.rng))
+            resources = self.rng.sample(
+                list(config.competitor_resources),
+                min(config.competitor_burst, len(config.competitor_resources)),
+            )
+            await asyncio.gather(
+                *(
+                    self.reserve(f"competitor-{index}", str(r), start, end)
+                    for r in resources
+                )
+            )
+
+        await asyncio.gather(*(competitor(i) for i in range(config.competitors)))
+
+    # --- HTTP plumbing ---
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self.connections += 1
+        task = asyncio.current_task()
+        if task:
+            self._handlers[task] = writer
+        try:
+            while True:
+                try:
+                    request_line = await asyncio.wait_for(
+                        reader.readline(), timeout=self.config.keepalive_timeout
+                    )
+                except TimeoutError:
+                    break
+                if not request_line:
+                    break
+
+                method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                headers: dict[str, str] = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                body = b""
+                if length := int(headers.get("content-length", "0")):
+                    body = await reader.readexactly(length)
+
+                status, response_headers, response_body = await self._route(
+                    method, target, headers, body
+                )
+                self._write_response(
+                    writer, method, status, response_headers, response_body
+                )
+                await writer.drain()
+
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            if task:
+                self._handlers.pop(task, None)
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    def _write_response(
+        self,
+        writer: asyncio.StreamWriter,
+        method: str,
+        status: int,
+        headers: dict[str, str],
+        body: bytes,
+    ) -> None:
+        timeout = int(self.config.keepalive_timeout)
+        lines = [
+            f"HTTP/1.1 {status} {STATUS_TEXT.get(status, 'OK')}",
+            f"Date: {formatdate(self.server_time(), usegmt=True)}",
+            "Server: Apache/2.4.55 (Win64) OpenSSL/1.1.1t PHP/8.1.31",
+            "Connection: Keep-Alive",
+            f"Keep-Alive: timeout={timeout}, max=100",
+            f"Content-Length: {len(body)}",
+            *(f"{name}: {value}" for name, value in headers.items()),
+        ]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        if method != "HEAD":
+            writer.write(body)
+
+    # --- Routing ---
+
+    async def _route(
+        self, method: str, target: str, headers: dict[str, str], body: bytes
+    ) -> tuple[int, dict[str, str], bytes]:
+        url = urlsplit(target)
+        path = url.path.removeprefix(BASE_PATH.rstrip("/")).lstrip("/")
+        query = parse_qs(url.query)
+        session_id, session = self._session_from(headers)
+
+        if path in ("", "index.php") and method == "POST":
+            return self._login(body)
+        if path == "" or (path == "index.php" and session and session.authenticated):
+            return redirect("schedule.php")
+        if path == "index.php":
+            return html(LOGIN_PAGE)
+
+        if path == "auth/confirm-account.php":
+            if session is None:
+                return redirect(f"{BASE_PATH}index.php")
+            if method == "POST" and query.get("action") == ["Confirm"]:
+                return self._confirm(session_id, session, body)
+            return html(TWO_FACTOR_PAGE.format(token=session.csrf_token))
+
+        if path == "schedule.php" and query.get("dr") == ["reservations"]:
+            if not self._is_authenticated(session):
+                return 401, {}, b""
+            return self._schedule_reservations(headers, body)
+
+        if path == "schedule.php":
+            if session is None:
+                return redirect("index.php")
+            if not self._is_authenticated(session):
+                return redirect(f"{BASE_PATH}auth/confirm-account.php")
+            return html(self._schedule_page(session.csrf_token))
+
+        if path == "api/reservation.php" and query.get("action") == ["create"]:
+            if (
+                session is None
+                or not self._is_authenticated(session)
+                or headers.get("x-csrf-token") != session.csrf_token
+            ):
+                return 401, {}, b""
+            return await self._create_reservation(session_id, headers, body)
+
+        return 404, {"Content-Type": "text/html"}, b"Not Found"
+
+    def _session_from(self, headers: dict[str, str]) -> tuple[str, Session | None]:
+        cookies = dict(
+            part.strip().split("=", 1)
+            for part in headers.get("cookie", "").split(";")
+            if "=" in part
+        )
+        session_id = cookies.get("PHPSESSID", "")
+        return session_id, self.sessions.get(session_id)
+
+    def _is_authenticated(self, session: Session | None) -> bool:
+        if session is None or not session.authenticated:
+            return False
+        return time.time() - session.created_at < self.config.session_ttl
+
+    def _login(self, body: bytes) -> tuple[int, dict[str, str], bytes]:
+        form = parse_qs(body.decode())
+        if not form.get("email") or not form.get("password"):
+            return html(LOGIN_PAGE)
+
+        session_id = secrets.token_hex(13)
+        self.sessions[session_id] = Session(created_at=time.time())
+        status, headers, response_body = redirect("schedule.php")
+        headers["Set-Cookie"] = f"PHPSESSID={session_id}; path={BASE_PATH.rstrip('/')}"
+        return status, headers, response_body
+
+    def _confirm(
+        self, session_id: str, session: Session, body: bytes
+    ) -> tuple[int, dict[str, str], bytes]:
+        form = parse_urlencoded(body)
+        otp = form.get("OTP", "")
+        if form.get("CSRF_TOKEN") != session.csrf_token or not (
+            otp.isdigit() and len(otp) == 6
+        ):
+            return json_response({"success": False})
+
+        session.authenticated = True
+        session.created_at = time.time()
+        status, headers, response_body = json_response(
+            {"resumeUrl": "schedule.php", "success": True}
+        )
+        headers["Set-Cookie"] = (
+            f"login_token={secrets.token_hex(25)}; path={BASE_PATH.rstrip('/')}"
+        )
+        return status, headers, response_body
+
+    def _schedule_page(self, csrf_token: str) -> bytes:
+        token_input = (
+            f'<input type="hidden" id="csrf_token" name="CSRF_TOKEN" '
+            f'value="{csrf_token}"/>'
+        ).encode()
+        filler_size = max(0, self.config.page_size - len(token_input))
+        before = int(filler_size * self.config.token_position)
+        return pad_html(before) + token_input + pad_html(filler_size - before)
+
+    def _schedule_reservations(
+        self, headers: dict[str, str], body: bytes
+    ) -> tuple[int, dict[str, str], bytes]:
+        form = parse_multipart(body, headers.get("content-type", ""))
+        begin = date.fromisoformat(form.get("beginDate", "1970-01-01"))
+        end = date.fromisoformat(form.get("endDate", "9999-12-31"))
+        # Like Booked, a LAST_REFRESH marker limits the listing to reservations
+        # created since then; cancellations only show up in full listings
+        since = form.get("LAST_REFRESH") or None
+        created_after = datetime.fromisoformat(since).timestamp() if since else 0.0
+        items = [
+            reservation_item(r)
+            for r in self.reservations
+            if begin <= r.start.date() <= end and r.created_at >= created_after
+        ]
+        return json_response(items)
+
+    async def _create_reservation(
+        self, session_id: str, headers: dict[str, str], body: bytes
+    ) -> tuple[int, dict[str, str], bytes]:
+        form = parse_multipart(body, headers.get("content-type", ""))
+        reservation = json.loads(form["request"])["reservation"]
+        start = parse_client_time(reservation["start"])
+        end = parse_client_time(reservation["end"])
+        resource_id = str(reservation["resourceIds"][0])
+
+        reference_number, error = await self.reserve(
+            session_id, resource_id, start, end
+        )
+        return json_response(
+            {
+                "success": True,
+                "data": {
+                    "referenceNumber": reference_number,
+                    "success": reference_number is not None,
+                    "canBeRetried": False,
+                    "canJoinWaitlist": False,
+                    "errors": [error] if error else [],
+                    "warnings": [],
+                    "retryMessages": [None] if error else [],
+                    "retryParameters": [],
+                    "requiresApproval": False,
+                    "showDetails": False,
+                    "dates": [],
+                    "payment": None,
+                },
+                "error": None,
+            }
+        )
+
+
+# --- Helpers ---
+
+
+LOGIN_PAGE = """<!DOCTYPE html><html><body>
+<form name="login" id="login" class="form-horizontal" method="post" action="/ub/Web/">
+<input type="text" id="email" name='email'/>
+<input type="password" id="password" name='password' value=""/>
+<input type="hidden" name='captcha' value=""/>
+<input type="hidden" name='resume' value=""/>
+</form></body></html>"""
+
+TWO_FACTOR_PAGE = """<!DOCTYPE html><html><body>
+<form id="confirm-form" method="post" ajaxAction="Confirm">
+<input type="text" id="passcode" name='OTP' placeholder="Einmaliger Passcode"/>
+<input type="hidden" name='resume' value="/ub/Web/schedule.php"/>
+<input type="hidden" id="csrf_token" name="CSRF_TOKEN" value="{token}"/>
+</form></body></html>"""
+
+
+def pad_html(size: int) -> bytes:
+    """Markup filler of exactly ``size`` bytes."""
+    row = b'<div class="reservable clickres slot"></div>\n'
+    return (row * (size // len(row) + 1))[:size]
+
+
+def html(body: str | bytes) -> tuple[int, dict[str, str], bytes]:
+    """HTML response."""
+    data = body.encode() if isinstance(body, str) else body
+    return 200, {"Content-Type": "text/html; charset=UTF-8"}, data
+
+
+def json_response(payload: Any) -> tuple[int, dict[str, str], bytes]:
+    """JSON response."""
+    return 200, {"Content-Type": "application/json"}, json.dumps(payload).encode()
+
+
+def redirect(location: str) -> tuple[int, dict[str, str], bytes]:
+    """302 redirect."""
+    return 302, {"Location": location, "Content-Type": "text/html"}, b""
+
+
+def parse_client_time(value: str) -> datetime:
+    """Parse the booker's ``2025-06-22T18:00:00.000Z`` timestamps (naive)."""
+    return datetime.fromisoformat(value.removesuffix("Z"))
+
+
+def reservation_item(reservation: Reservation) -> dict[str, Any]:
+    """Reservation as listed by ``schedule.php?dr=reservations``."""
+    return {
+        "ReferenceNumber": reservation.reference_number,
+        "ResourceId": int(reservation.resource_id),
+        "StartDate": reservation.start.isoformat(sep=" "),
+        "EndDate": reservation.end.isoformat(sep=" "),
+        "IsReservation": True,
+    }
+
+
+def parse_multipart(body: bytes, content_type: str) -> dict[str, str]:
+    """Parse a ``multipart/form-data`` body into a field dict."""
+    _, _, boundary = content_type.partition("boundary=")
+    if not boundary:
+        return {}
+    fields = {}
+    for part in body.split(b"--" + boundary.encode()):
+        head, separator, value = part.partition(b"\r\n\r\n")
+        if not separator:
+            continue
+        for line in head.decode("latin-1").split("\r\n"):
+            if line.lower().startswith("content-disposition") and 'name="' in line:
+                name = line.split('name="', 1)[1].split('"', 1)[0]
+                fields[name] = value.removesuffix(b"\r\n").decode()
+    return fields
+
+
+def parse_urlencoded(body: bytes) -> dict[str, str]:
+    """Parse a urlencoded form body (the 2FA form is posted urlencoded)."""
+    return {key: values[0] for key, values in parse_qs(body.decode()).items()}
+
+
+@contextlib.contextmanager
+def point_booker_at(base_url: str) -> Iterator[None]:
+    """
+    Temporarily point ``scheduler.amain`` at another Booked instance.
+
+    Args:
+        base_url: Base URL ending in ``/ub/Web/``
+    """
+    from scheduler import amain
+
+    overrides = {
+        "BASE_URL": base_url,
+        "LOGIN_PAGE_URL": base_url + "index.php",
+        "LOGIN_ACTION_URL": base_url + "index.php",
+        "TFA_VALIDATE_URL": base_url + "auth/confirm-account.php?action=Confirm",
+    }
+    originals = {name: getattr(amain, name) for name in overrides}
+    for name, value in overrides.items():
+        setattr(amain, name, value)
+    try:
+        yield
+    finally:
+        for name, value in originals.items():
+            setattr(amain, name, value)
+
+
+async def serve(args: argparse.Namespace) -> None:
+    """Run the stand-in until interrupted."""
+    slot_day = date.today() + timedelta(days=7)
+    config = StandInConfig(
+        latency=LatencyModel(args.latency_ms, args.sigma),
+        competitors=args.competitors,
+        competitor_slot=(
+            datetime.combine(slot_day, datetime.min.time()).replace(hour=6, minute=30),
+            datetime.combine(slot_day, datetime.min.time()).replace(hour=16, minute=30),
+        ),
+        release_at=time.time() + args.release_in if args.release_in else None,
+        seed=args.seed,
+    )
+    server = BookedStandIn(config)
+    await server.start(args.port)
+    print(f"Booked stand-in listening on {server.base_url}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+def main() -> None:
+    """Entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency-ms", type=float, default=40.0)
+    parser.add_argument("--sigma", type=float, default=0.5)
+    parser.add_argument("--competitors", type=int, default=0)
+    parser.add_argument("--release-in", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(serve(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
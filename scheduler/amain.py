@@ -12,21 +12,55 @@ import datetime as dt
 import json
 import logging
 import time
+from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from datetime import date, datetime, timedelta
-from typing import Any, AsyncGenerator, Protocol
+from typing import Any, Protocol
 
 import httpx
 import pyotp
 from bs4 import BeautifulSoup
 
+from scheduler import metrics
+from scheduler.availability import (
+    IntervalIndex,
+    ScheduleFeed,
+    order_by_availability,
+)
+from scheduler.calibration import BurstObservation, FiringCalibrator
+from scheduler.clock import estimate_clock_offset
 from scheduler.config import (
+    BookingConstants,
     BookingDetails,
     LoginDetails,
-    BookingConstants,
+    journal_path,
     persistent_cache,
 )
+from scheduler.csrf import CsrfStreamScanner, scan_csrf_token
+from scheduler.errors import (
+    ErrorAction,
+    ErrorCode,
+    ReservationFailure,
+    classify_exception,
+    classify_http_status,
+    classify_server_errors,
+)
+from scheduler.firing import (
+    SPIN_THRESHOLD_SECONDS,
+    monotonic_deadline,
+    next_release_time,
+    sleep_until,
+)
+from scheduler.governor import ConcurrencyGovernor
+from scheduler.horizon import HorizonLearner
+from scheduler.journal import AttemptEntry, AttemptJournal, BurstEntry
+from scheduler.resource_stats import ResourceStatsStore
+from scheduler.retry import RetryPolicy, RetryScheduler
+from scheduler.session_store import SessionRecord, SessionStore
+from scheduler.templates import PLACEHOLDER, MultipartTemplate
+from scheduler.timing import RequestTiming, summarize_timings
+from scheduler.waves import WaveOutcome, WavePlan
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -55,6 +89,15 @@ class BookingResult:
     success: bool
     error: str | None = None
     reference_number: str | None = None
+    timing: RequestTiming | None = None
+    failure: ReservationFailure | None = None
+    # Burst wave that sent the request
+    wave: str | None = None
+
+    @property
+    def error_code(self) -> ErrorCode | None:
+        """Classified error, or None for a success."""
+        return self.failure.code if self.failure else None
 
 
 class AuthenticatedClient(Protocol):
@@ -116,6 +159,25 @@ PREFERRED_START_TIME_MINUTE = booking_details.preferred_start_time_minute
 PREFERRED_END_TIME_HOUR = booking_details.preferred_end_time_hour
 PREFERRED_END_TIME_MINUTE = booking_details.preferred_end_time_minute
 STANDARD_ATTRIBUTE_VALUES = booking_details.standard_attribute_values
+WARM_CONNECTIONS = booking_details.warm_connections or len(PREFERRED_RANGE)
+MAX_CONNECTIONS_PER_HOST = booking_details.max_connections_per_host
+STOP_ON_FIRST_SUCCESS = booking_details.stop_on_first_success
+WAVE_PLAN = booking_details.wave_plan
+ADAPTIVE_FIRING = booking_details.adaptive_firing
+RANK_BY_WIN_RATE = booking_details.rank_by_win_rate
+JOURNAL_ATTEMPTS = booking_details.journal_attempts
+METRICS_PORT = booking_details.metrics_port
+SCHEDULE_ID = booking_details.schedule_id
+SKIP_TAKEN_RESOURCES = booking_details.skip_taken_resources
+RETRY_ON_FAIL = booking_details.retry_on_fail
+RETRY_POLICY = RetryPolicy(
+    max_retries=booking_details.max_retries,
+    delay=booking_details.retry_delay_seconds,
+    multiplier=booking_details.retry_backoff,
+    max_delay=booking_details.retry_max_delay_seconds,
+    jitter=booking_details.retry_jitter,
+    deadline=booking_details.retry_deadline_seconds,
+)
 
 # Credentials
 USERNAME = settings.uzh_username
@@ -126,12 +188,16 @@ TOTP_SECRET = settings.uzh_totp_secret
 # --- Utility Functions ---
 
 
-def extract_csrf_token(html_content: str) -> str:
+def extract_csrf_token(html_content: str | bytes) -> str:
     """
     Extract CSRF token from HTML content.
 
+    A byte-level scan handles the usual markup; only if it cannot read the
+    token unambiguously is the page handed to the full HTML parser.
+
     Args:
-        html_content: HTML content containing the CSRF token
+        html_content: HTML content containing the CSRF token (raw bytes avoid
+            decoding the whole page)
 
     Returns:
         The CSRF token value
@@ -139,6 +205,11 @@ def extract_csrf_token(html_content: str) -> str:
     Raises:
         ValueError: If CSRF token is not found or empty
     """
+    raw = html_content if isinstance(html_content, bytes) else html_content.encode()
+    if token := scan_csrf_token(raw):
+        return token
+
+    logger.debug("Fast CSRF scan failed - falling back to HTML parser")
     soup = BeautifulSoup(html_content, "html.parser")
     token_input = soup.find("input", {"name": "CSRF_TOKEN"})
 
@@ -324,7 +395,7 @@ async def handle_2fa_if_required(
         return True
 
     logger.info("2FA step detected")
-    csrf_token_2fa = extract_csrf_token(login_response.text)
+    csrf_token_2fa = extract_csrf_token(login_response.content)
     totp_code = generate_totp_code(TOTP_SECRET)
 
     tfa_payload = {
@@ -398,10 +469,18 @@ async def authenticate_client(client: httpx.AsyncClient) -> bool:
         raise AuthenticationError(f"Authentication failed: {e}") from e
 
 
+# Pages an unauthenticated (or half-authenticated) session is redirected to
+LOGIN_REDIRECT_PATHS = ("/index.php", "/confirm-account.php")
+
+
 async def get_csrf_token_from_schedule_page(client: httpx.AsyncClient) -> str:
     """
     Get CSRF token from the schedule page.
 
+    The page is streamed and scanned as it arrives; the response is closed as
+    soon as the token has been seen, so latency depends on where the token
+    sits in the page rather than on the size of the page.
+
     Args:
         client: Authenticated HTTP client
 
@@ -409,6 +488,7 @@ async def get_csrf_token_from_schedule_page(client: httpx.AsyncClient) -> str:
         CSRF token for booking operations
 
     Raises:
+        SessionExpiredError: If the server redirects to the login flow
         ValueError: If CSRF token cannot be extracted
         httpx.RequestError: If request fails
     """
@@ -418,19 +498,47 @@ async def get_csrf_token_from_schedule_page(client: httpx.AsyncClient) -> str:
         "Accept": BookingConstants.ACCEPT,
     }
 
-    response = await client.get(
+    async with client.stream(
+        "GET",
         BASE_URL,
         headers=schedule_headers,
         timeout=BookingConstants.DEFAULT_TIMEOUT,
         follow_redirects=True,
-    )
-    response.raise_for_status()
+    ) as response:
+        response.raise_for_status()
+        if response.url.path.endswith(LOGIN_REDIRECT_PATHS):
+            raise SessionExpiredError(f"Redirected to {response.url.path}")
+
+        scanner = CsrfStreamScanner()
+        csrf_token = None
+        async for chunk in response.aiter_bytes():
+            if csrf_token := scanner.feed(chunk):
+                break
+
+    if not csrf_token:
+        csrf_token = extract_csrf_token(scanner.body)
 
-    csrf_token = extract_csrf_token(response.text)
     logger.info(f"Fetched CSRF token: {csrf_token[:10]}...")
     return csrf_token
 
 
+async def probe_session(client: httpx.AsyncClient) -> str | None:
+    """
+    Check that a session is still authenticated.
+
+    Args:
+        client: Client carrying the session cookies
+
+    Returns:
+        The current CSRF token, or None if the session is no longer valid
+    """
+    try:
+        return await get_csrf_token_from_schedule_page(client)
+    except (SessionExpiredError, httpx.HTTPStatusError, ValueError) as e:
+        logger.info(f"Session probe failed: {e}")
+        return None
+
+
 # --- Session Management ---
 
 
@@ -461,13 +569,30 @@ async def authenticated_session(
             await client.aclose()
 
 
-def get_cache_keys() -> tuple[str, str, str]:
-    """Get cache keys for session data."""
-    return "client_headers", "csrf_token", "client_cookies_jar"
+session_store = SessionStore(
+    persistent_cache, max_age=BookingConstants.CACHE_EXPIRY_HOURS * 60 * 60
+)
+horizon_learner = HorizonLearner(persistent_cache)
+firing_calibrator = FiringCalibrator(persistent_cache)
+resource_stats = ResourceStatsStore(persistent_cache)
+attempt_journal = AttemptJournal(
+    journal_path,
+    batch_size=BookingConstants.JOURNAL_BATCH_SIZE,
+    flush_interval=BookingConstants.JOURNAL_FLUSH_SECONDS,
+)
+# Occupied intervals of the schedule, kept up to date by every fetch
+schedule_index = IntervalIndex()
+schedule_feeds: dict[date, ScheduleFeed] = {}
+metrics.session_cache_hits.set_function(lambda: session_store.hits)
+metrics.session_cache_misses.set_function(lambda: session_store.misses)
+metrics.session_cache_hit_ratio.set_function(lambda: session_store.hit_ratio)
 
 
 def cache_session_data(
-    headers: dict[str, str], cookies: dict[str, str], csrf_token: str
+    headers: dict[str, str],
+    cookies: dict[str, str],
+    csrf_token: str,
+    created_at: float | None = None,
 ) -> None:
     """
     Cache session data for reuse.
@@ -476,17 +601,32 @@ def cache_session_data(
         headers: HTTP headers to cache
         cookies: Cookies to cache
         csrf_token: CSRF token to cache
+        created_at: When the session was established (defaults to now); the
+            cache entry expires ``CACHE_EXPIRY_HOURS`` after this instant
     """
-    cache_key_headers, cache_key_csrf, cache_key_cookies = get_cache_keys()
-    expiry_seconds = BookingConstants.CACHE_EXPIRY_HOURS * 60 * 60
-
-    persistent_cache.set(cache_key_headers, headers, expire=expiry_seconds)
-    persistent_cache.set(cache_key_cookies, cookies, expire=expiry_seconds)
-    persistent_cache.set(cache_key_csrf, csrf_token, expire=expiry_seconds)
+    session_store.save(
+        SessionRecord(
+            headers=headers,
+            cookies=cookies,
+            csrf_token=csrf_token,
+            created_at=created_at or time.time(),
+        )
+    )
 
     logger.info("Successfully cached session data")
 
 
+def load_session_created_at() -> float | None:
+    """
+    Get when the cached session was established.
+
+    Returns:
+        Epoch timestamp, or None if no session is cached
+    """
+    record = session_store.load()
+    return record.created_at if record else None
+
+
 def load_cached_session_data() -> tuple[
     dict[str, str] | None, dict[str, str] | None, str | None
 ]:
@@ -496,41 +636,30 @@ def load_cached_session_data() -> tuple[
     Returns:
         Tuple of (headers, cookies, csrf_token) or (None, None, None) if cache miss
     """
-    cache_key_headers, cache_key_csrf, cache_key_cookies = get_cache_keys()
-
-    cached_headers = persistent_cache.get(cache_key_headers)
-    cached_csrf = persistent_cache.get(cache_key_csrf)
-    cached_cookies = persistent_cache.get(cache_key_cookies)
-
-    if not all([cached_headers, cached_csrf, cached_cookies]):
+    record = session_store.load()
+    if record is None:
         return None, None, None
 
-    # Validate cache data types
-    if not (
-        isinstance(cached_headers, dict)
-        and isinstance(cached_csrf, str)
-        and isinstance(cached_cookies, dict)
-    ):
-        logger.warning("Cached data type mismatch")
-        return None, None, None
-
-    # Validate cookie values are strings
-    for name, value in cached_cookies.items():
-        if not isinstance(value, str):
-            logger.warning(f"Invalid cookie value type for '{name}'")
-            return None, None, None
-
-    return cached_headers, cached_cookies, cached_csrf
+    return record.headers, record.cookies, record.csrf_token
 
 
-def create_http_client() -> httpx.AsyncClient:
+def create_http_client(pool_size: int | None = None) -> httpx.AsyncClient:
     """
     Create HTTP client with standard headers.
 
+    Args:
+        pool_size: Connections to keep alive (defaults to ``WARM_CONNECTIONS``)
+
     Returns:
         Configured HTTP client
     """
-    client = httpx.AsyncClient()
+    pool_size = pool_size or WARM_CONNECTIONS
+    limits = httpx.Limits(
+        max_connections=max(pool_size, BookingConstants.MAX_CONCURRENT_BOOKINGS),
+        max_keepalive_connections=pool_size,
+        keepalive_expiry=BookingConstants.KEEPALIVE_EXPIRY,
+    )
+    client = httpx.AsyncClient(limits=limits)
     client.headers.update(
         {
             "User-Agent": BookingConstants.USER_AGENT,
@@ -543,6 +672,35 @@ def create_http_client() -> httpx.AsyncClient:
     return client
 
 
+async def warm_up_connections(client: httpx.AsyncClient, count: int) -> int:
+    """
+    Open ``count`` keep-alive connections to the booking server.
+
+    The probes are issued concurrently, so each one occupies its own
+    connection and the pool ends up holding ``count`` connections with TCP
+    and TLS handshakes already done.
+
+    Args:
+        client: HTTP client whose pool should be warmed
+        count: Number of connections to open
+
+    Returns:
+        Number of connections successfully warmed
+    """
+    warmup_url = BASE_URL + "favicon.ico"
+    responses = await asyncio.gather(
+        *(
+            client.head(warmup_url, timeout=BookingConstants.DEFAULT_TIMEOUT)
+            for _ in range(count)
+        ),
+        return_exceptions=True,
+    )
+    warmed = sum(1 for r in responses if isinstance(r, httpx.Response))
+    if warmed < count:
+        logger.warning(f"Only warmed {warmed}/{count} connections")
+    return warmed
+
+
 async def create_fresh_session() -> tuple[httpx.AsyncClient, str]:
     """
     Create a fresh authenticated session.
@@ -567,6 +725,7 @@ async def create_fresh_session() -> tuple[httpx.AsyncClient, str]:
         }
         headers_to_cache = dict(client.headers)
         cache_session_data(headers_to_cache, cookies_to_cache, csrf_token)
+        metrics.session_refreshes.inc()
 
         return client, csrf_token
 
@@ -616,106 +775,269 @@ async def load_client_and_csrf_token(
 # --- Booking Functions ---
 
 
-async def create_single_reservation(
-    client: httpx.AsyncClient, request: BookingRequest, csrf_token: str
-) -> BookingResult:
+def resolve_booking_times(request: BookingRequest) -> tuple[datetime, datetime]:
     """
-    Create a single reservation.
+    Get the start and end time a booking request refers to.
 
     Args:
-        client: Authenticated HTTP client
         request: Booking request details
+
+    Returns:
+        Tuple of (start_time, end_time)
+
+    Raises:
+        ValueError: If neither a reservation date nor explicit times are given
+    """
+    if request.start_time and request.end_time:
+        return request.start_time, request.end_time
+    elif request.reservation_date:
+        return calculate_booking_times(request.reservation_date)
+    raise ValueError("Either reservation_date or start_time/end_time must be provided")
+
+
+def create_booking_form_parts(
+    api_payload: dict[str, Any], csrf_token: str
+) -> dict[str, Any]:
+    """
+    Create the multipart form parts of a reservation POST.
+
+    Args:
+        api_payload: Reservation payload from ``create_reservation_payload``
         csrf_token: CSRF token for the request
 
     Returns:
-        Booking result with success status and details
+        Form parts in httpx ``files=`` format
     """
-    try:
-        # Calculate booking times
-        if request.start_time and request.end_time:
-            start_time, end_time = request.start_time, request.end_time
-        elif request.reservation_date:
-            start_time, end_time = calculate_booking_times(request.reservation_date)
-        else:
-            raise ValueError(
-                "Either reservation_date or start_time/end_time must be provided"
-            )
+    return {
+        "request": (None, json.dumps(api_payload), "application/json"),
+        "CSRF_TOKEN": (None, csrf_token),
+        "BROWSER_TIMEZONE": (None, BookingConstants.TIMEZONE),
+    }
 
-        # Create API payload
-        api_payload = create_reservation_payload(request, start_time, end_time)
 
-        # Prepare form data
-        booking_form_parts = {
-            "request": (None, json.dumps(api_payload), "application/json"),
-            "CSRF_TOKEN": (None, csrf_token),
-            "BROWSER_TIMEZONE": (None, BookingConstants.TIMEZONE),
-        }
+def compile_reservation_template(
+    request: BookingRequest, csrf_token: str
+) -> MultipartTemplate:
+    """
+    Compile the multipart body shared by all requests of a burst.
 
-        booking_headers = {
-            "X-Csrf-Token": csrf_token,
-        }
+    Args:
+        request: Any request of the burst (its resource id is ignored)
+        csrf_token: CSRF token for the burst
 
-        # Make the request
-        booking_url = BASE_URL + "api/reservation.php?action=create"
-        response = await client.post(
+    Returns:
+        Template that only needs the resource id spliced in
+
+    Raises:
+        ValueError: If neither a reservation date nor explicit times are given
+    """
+    start_time, end_time = resolve_booking_times(request)
+    template_request = replace(request, resource_id=PLACEHOLDER)
+    api_payload = create_reservation_payload(template_request, start_time, end_time)
+    return MultipartTemplate.compile(create_booking_form_parts(api_payload, csrf_token))
+
+
+def build_reservation_request(
+    client: httpx.AsyncClient,
+    request: BookingRequest,
+    csrf_token: str,
+    template: MultipartTemplate | None = None,
+) -> httpx.Request:
+    """
+    Build the reservation POST without sending it.
+
+    Building ahead of time moves payload serialization and multipart encoding
+    out of the critical window, so a burst only has to write bytes to sockets.
+
+    Args:
+        client: Authenticated HTTP client
+        request: Booking request details
+        csrf_token: CSRF token for the request
+        template: Precompiled body for this burst; must have been compiled for
+            the same owner, times and CSRF token
+
+    Returns:
+        Fully encoded request ready for ``client.send``
+
+    Raises:
+        ValueError: If neither a reservation date nor explicit times are given
+    """
+    booking_url = BASE_URL + "api/reservation.php?action=create"
+    booking_headers = {
+        "X-Csrf-Token": csrf_token,
+    }
+
+    if template is not None:
+        booking_headers["Content-Type"] = template.content_type
+        return client.build_request(
+            "POST",
             booking_url,
-            files=booking_form_parts,
+            content=template.render(request.resource_id),
             headers=booking_headers,
             timeout=BookingConstants.DEFAULT_TIMEOUT,
         )
-        response.raise_for_status()
 
-        # Process response
-        try:
-            resp_json = response.json()
-            logger.debug(f"Reservation response: {json.dumps(resp_json, indent=2)}")
-
-            if resp_json.get("success") and resp_json.get("data", {}).get("success"):
-                reference_number = resp_json.get("data", {}).get("referenceNumber")
-                return BookingResult(
-                    resource_id=request.resource_id,
-                    success=True,
-                    reference_number=reference_number,
-                )
+    start_time, end_time = resolve_booking_times(request)
+    api_payload = create_reservation_payload(request, start_time, end_time)
 
-            # Extract error message
-            error_msg = None
-            if errors := resp_json.get("data", {}).get("errors"):
-                error_msg = str(errors)
-            elif message := resp_json.get("message"):
-                error_msg = message
+    return client.build_request(
+        "POST",
+        booking_url,
+        files=create_booking_form_parts(api_payload, csrf_token),
+        headers=booking_headers,
+        timeout=BookingConstants.DEFAULT_TIMEOUT,
+    )
 
-            return BookingResult(
-                resource_id=request.resource_id, success=False, error=error_msg
-            )
 
-        except json.JSONDecodeError as e:
-            logger.exception(f"Error parsing reservation response: {e}")
+def parse_reservation_response(
+    request: BookingRequest, response: httpx.Response
+) -> BookingResult:
+    """
+    Turn a reservation API response into a booking result.
+
+    Args:
+        request: Booking request the response belongs to
+        response: Successful (2xx) HTTP response
+
+    Returns:
+        Booking result with success status and details
+    """
+    try:
+        resp_json = response.json()
+        logger.debug(f"Reservation response: {json.dumps(resp_json, indent=2)}")
+
+        if resp_json.get("success") and resp_json.get("data", {}).get("success"):
+            reference_number = resp_json.get("data", {}).get("referenceNumber")
             return BookingResult(
                 resource_id=request.resource_id,
-                success=False,
-                error="Invalid JSON response",
+                success=True,
+                reference_number=reference_number,
             )
 
+        # Extract error message
+        error_msg = None
+        failure = ReservationFailure(ErrorCode.UNKNOWN)
+        if errors := resp_json.get("data", {}).get("errors"):
+            error_msg = str(errors)
+            failure = classify_server_errors(errors)
+        elif message := resp_json.get("message"):
+            error_msg = message
+            failure = classify_server_errors(message)
+
+        return BookingResult(
+            resource_id=request.resource_id,
+            success=False,
+            error=error_msg,
+            failure=failure,
+        )
+
+    except json.JSONDecodeError as e:
+        logger.exception(f"Error parsing reservation response: {e}")
+        return BookingResult(
+            resource_id=request.resource_id,
+            success=False,
+            error="Invalid JSON response",
+            failure=ReservationFailure(
+                ErrorCode.INVALID_RESPONSE, "Invalid JSON response"
+            ),
+        )
+
+
+async def send_reservation_request(
+    client: httpx.AsyncClient,
+    request: BookingRequest,
+    http_request: httpx.Request,
+    timing: RequestTiming | None = None,
+) -> BookingResult:
+    """
+    Send a prebuilt reservation request and process the response.
+
+    Args:
+        client: Authenticated HTTP client
+        request: Booking request details
+        http_request: Request built by ``build_reservation_request``
+        timing: Timing to fill in (started now if None); attached to the result
+
+    Returns:
+        Booking result with success status, details and timing
+
+    Raises:
+        SessionExpiredError: If the server rejects the session (HTTP 401)
+    """
+    timing = timing or RequestTiming.start()
+    http_request.extensions["trace"] = timing.trace
+
+    try:
+        response = await client.send(http_request)
+        timing.completed = time.perf_counter()
+        response.raise_for_status()
+        result = parse_reservation_response(request, response)
+
     except httpx.HTTPStatusError as e:
         if e.response.status_code == 401:
             logger.error("401 Unauthorized - session expired")
             raise SessionExpiredError("Session or CSRF token expired") from e
 
         error_msg = f"HTTP {e.response.status_code}: {e.response.text[:200]}"
-        return BookingResult(
-            resource_id=request.resource_id, success=False, error=error_msg
+        result = BookingResult(
+            resource_id=request.resource_id,
+            success=False,
+            error=error_msg,
+            failure=classify_http_status(e.response.status_code, error_msg),
         )
 
     except Exception as e:
         logger.exception(f"Unexpected error during reservation: {e}")
+        result = BookingResult(
+            resource_id=request.resource_id,
+            success=False,
+            error=str(e),
+            failure=classify_exception(e),
+        )
+
+    result.timing = timing
+    return result
+
+
+async def create_single_reservation(
+    client: httpx.AsyncClient, request: BookingRequest, csrf_token: str
+) -> BookingResult:
+    """
+    Create a single reservation.
+
+    Args:
+        client: Authenticated HTTP client
+        request: Booking request details
+        csrf_token: CSRF token for the request
+
+    Returns:
+        Booking result with success status and details
+    """
+    try:
+        http_request = build_reservation_request(client, request, csrf_token)
+    except Exception as e:
+        logger.exception("Unexpected error during reservation")
         return BookingResult(
             resource_id=request.resource_id, success=False, error=str(e)
         )
 
+    result = await send_reservation_request(client, request, http_request)
+    learn_booking_horizon([result])
+    return result
+
 
 async def attempt_batch_booking(
-    client: httpx.AsyncClient, csrf_token: str, target_date: date | None = None
+    client: httpx.AsyncClient,
+    csrf_token: str,
+    target_date: date | None = None,
+    *,
+    fire_at: datetime | None = None,
+    clock_offset: float = 0.0,
+    governor: ConcurrencyGovernor | None = None,
+    stop_on_success: bool = False,
+    check_availability: bool = False,
+    plan: WavePlan | None = None,
+    firing_shift: float = 0.0,
 ) -> list[BookingResult]:
     """
     Attempt to book multiple resources concurrently (SPAM STRATEGY).
@@ -730,16 +1052,38 @@ async def attempt_batch_booking(
     - High failure rate is expected and normal
     - Better to try everything than miss opportunities
 
+    All requests are built and parked before the burst is released, so when
+    ``fire_at`` is given they go out together at that instant instead of
+    whenever this function happens to be called.
+
     Args:
         client: Authenticated HTTP client
         csrf_token: CSRF token for requests
-        target_date: Date to book (defaults to one week from today)
+        target_date: Date to book (defaults to the newest bookable day at the
+            firing time, see ``bookable_target_date``)
+        fire_at: Wall-clock instant to release the burst (defaults to now)
+        clock_offset: Server clock minus local clock in seconds; ``fire_at`` is
+            interpreted on the server's clock
+        governor: Limits requests in flight (defaults to
+            ``MAX_CONCURRENT_BOOKINGS`` overall and ``MAX_CONNECTIONS_PER_HOST``)
+        stop_on_success: Return as soon as one booking succeeds (or a failure
+            shows that none can) and cancel the outstanding requests - the
+            server allows one reservation at a time
+        check_availability: Fetch the schedule first and try resources that
+            are already taken for the slot last (see ``rank_resources``)
+        plan: Waves to fire around ``fire_at`` (defaults to ``WAVE_PLAN``);
+            waves not yet released once the burst is decided are skipped
+        firing_shift: Seconds to move the release relative to ``fire_at``
+            (see ``FiringCalibrator``); the target day still follows
+            ``fire_at``. Timed bursts are recorded for the calibrator.
 
     Returns:
-        List of booking results (expect 95%+ failure rate - this is normal!)
+        List of booking results (expect 95%+ failure rate - this is normal!).
+        With ``stop_on_success``, cancelled requests are left out.
     """
     if target_date is None:
-        target_date = date.today() + timedelta(days=7)
+        firing_time = fire_at or datetime.now() + timedelta(seconds=clock_offset)
+        target_date = bookable_target_date(firing_time)
 
     resource_count = len(PREFERRED_RANGE)
     logger.info(
@@ -748,39 +1092,183 @@ async def attempt_batch_booking(
     logger.info(f"📍 Resource range: {min(PREFERRED_RANGE)}-{max(PREFERRED_RANGE)}")
     logger.info("⚡ Strategy: Concurrent spam for maximum speed")
 
-    # Create booking requests for ALL resources in range
-    requests = [
-        BookingRequest(
-            resource_id=str(resource_id),
-            owner_id=OWNER_ID,
-            reservation_date=target_date,
+    resource_ids = [str(resource_id) for resource_id in PREFERRED_RANGE]
+    if RANK_BY_WIN_RATE:
+        # Before the availability check, which keeps the order within groups
+        resource_ids = resource_stats.rank(resource_ids)
+    if check_availability:
+        resource_ids = await rank_resources(
+            client, csrf_token, target_date, resource_ids
         )
-        for resource_id in PREFERRED_RANGE
+        if not resource_ids:
+            logger.warning("No free resources left for the target slot")
+            return []
+
+    plan = plan or WAVE_PLAN
+
+    # Create booking requests for ALL resources in range, once per wave in
+    # that wave's order
+    requests: list[BookingRequest] = []
+    request_waves: list[int] = []
+    for index, wave in enumerate(plan.waves):
+        for resource_id in wave.order.apply(resource_ids):
+            requests.append(
+                BookingRequest(
+                    resource_id=resource_id,
+                    owner_id=OWNER_ID,
+                    reservation_date=target_date,
+                )
+            )
+            request_waves.append(index)
+
+    # Encode every request up front so the burst itself only writes bytes;
+    # the shared body is compiled once and only the resource id differs
+    template = compile_reservation_template(requests[0], csrf_token)
+    http_requests = [
+        build_reservation_request(client, request, csrf_token, template)
+        for request in requests
     ]
 
-    # Create tasks for concurrent execution - this is the "spam"
-    # All requests fire simultaneously for maximum speed
+    limiter = governor or ConcurrencyGovernor(
+        BookingConstants.MAX_CONCURRENT_BOOKINGS, MAX_CONNECTIONS_PER_HOST
+    )
+
+    # Park one task per request on its wave's gate - releasing a gate wakes
+    # all of the wave's tasks within a single event loop iteration
+    gates = [asyncio.Event() for _ in plan.waves]
+
+    async def fire(
+        request: BookingRequest, http_request: httpx.Request, wave: int
+    ) -> BookingResult:
+        await gates[wave].wait()
+        timing = RequestTiming.start()
+        async with limiter.slot(http_request.url.host):
+            result = await send_reservation_request(
+                client, request, http_request, timing
+            )
+        result.wave = plan.waves[wave].name
+        return result
+
     tasks = [
-        create_single_reservation(client, request, csrf_token) for request in requests
+        asyncio.create_task(fire(request, http_request, wave))
+        for request, http_request, wave in zip(requests, http_requests, request_waves)
     ]
+    outcomes = [
+        WaveOutcome(wave.name, wave.offset_ms, request_waves.count(index))
+        for index, wave in enumerate(plan.waves)
+    ]
+    decided: asyncio.Task[BookingResult | None] | None = None
+    release_deadline: float | None = None
+
+    try:
+        await asyncio.sleep(0)  # Let every task reach its gate
+
+        if fire_at is not None:
+            logger.info(
+                f"⏳ Holding {len(tasks)} requests until {fire_at.isoformat()} "
+                f"({plan.describe()})"
+            )
+            release_deadline = monotonic_deadline(fire_at, clock_offset=clock_offset)
+            deadline = release_deadline + firing_shift
 
-    # Execute ALL bookings concurrently - the core of the spam strategy
-    logger.info(f"⚡ Firing {len(tasks)} concurrent booking requests...")
-    start_time = asyncio.get_event_loop().time()
+            # Handshakes must be done before the first wave, but close enough
+            # to it that the server has not yet closed the idle connections
+            await sleep_until(
+                deadline - plan.lead_ms / 1000 - BookingConstants.WARMUP_LEAD_SECONDS
+            )
+            warmed = await warm_up_connections(client, WARM_CONNECTIONS)
+        else:
+            # Without a release instant the first wave goes out now
+            deadline = time.perf_counter() + plan.lead_ms / 1000
+
+        # Execute ALL bookings concurrently - the core of the spam strategy
+        start_time = asyncio.get_event_loop().time()
+        for index, wave in enumerate(plan.waves):
+            lateness = await sleep_until(
+                deadline + wave.offset_ms / 1000,
+                spin_threshold=(
+                    SPIN_THRESHOLD_SECONDS
+                    if index == 0
+                    else BookingConstants.WAVE_SPIN_SECONDS
+                ),
+            )
+            if decided is not None and decided.done() and decided.result():
+                outcomes[index].skipped = True
+                for task, task_wave in zip(tasks, request_waves):
+                    if task_wave == index:
+                        task.cancel()
+                continue
 
-    results = await asyncio.gather(*tasks, return_exceptions=True)
+            gates[index].set()
+            outcomes[index].lateness_ms = lateness * 1000
+            if decided is None:
+                decided = asyncio.create_task(wait_for_first_success(tasks))
+
+        decision = await decided if stop_on_success and decided is not None else None
+        if decision is not None and not decision.success:
+            # A STOP failure usually means another of our requests is booking
+            # the slot right now - let the released requests finish and only
+            # cancel once one of them has booked
+            released = [
+                task
+                for task, wave_index in zip(tasks, request_waves)
+                if gates[wave_index].is_set()
+            ]
+            decision = await wait_for_first_success(released, successes_only=True)
+        if decision is not None and decision.success:
+            cancelled = sum(task.cancel() for task in tasks)
+            logger.info(
+                f"🛑 Burst decided - cancelled {cancelled} outstanding requests"
+            )
+
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+        if decided is not None and not decided.done():
+            decided.cancel()
 
     end_time = asyncio.get_event_loop().time()
     duration = end_time - start_time
 
+    if fire_at is not None:
+        logger.info(f"🔥 Warmed {warmed} connections before firing")
+        logger.info(f"🎯 Burst released {outcomes[0].lateness_ms:.3f}ms after target")
     logger.info(
         f"⏱️  Spam booking completed in {duration:.2f}s ({duration / len(tasks):.3f}s avg per request)"
     )
+    logger.info(f"🚦 Governor: {limiter.metrics.summary()}")
+    timings = [
+        result.timing
+        for result in results
+        if isinstance(result, BookingResult) and result.timing
+    ]
+    if timings:
+        logger.info(f"🔬 Request phases: {summarize_timings(timings)}")
+
+    for result, wave_index in zip(results, request_waves):
+        outcome = outcomes[wave_index]
+        if isinstance(result, asyncio.CancelledError):
+            if not outcome.skipped:
+                outcome.cancelled += 1
+        elif isinstance(result, BookingResult) and result.success:
+            outcome.successes += 1
+        elif isinstance(result, BookingResult):
+            outcome.errors[result.error_code] += 1
+        elif isinstance(result, Exception):
+            outcome.errors[classify_exception(result).code] += 1
+    if len(outcomes) > 1:
+        for outcome in outcomes:
+            logger.info(f"🌊 Wave {outcome.summary()}")
+    record_wave_metrics(outcomes)
 
     # Process results and handle exceptions
     processed_results = []
     for i, result in enumerate(results):
-        if isinstance(result, SessionExpiredError):
+        if isinstance(result, asyncio.CancelledError):
+            continue  # Cancelled after another request succeeded
+        elif isinstance(result, SessionExpiredError):
             logger.error(f"Session expired for resource {requests[i].resource_id}")
             raise result  # Re-raise to trigger retry logic
         elif isinstance(result, Exception):
@@ -792,14 +1280,379 @@ async def attempt_batch_booking(
                     resource_id=requests[i].resource_id,
                     success=False,
                     error=str(result),
+                    failure=classify_exception(result),
+                    wave=plan.waves[request_waves[i]].name,
                 )
             )
         else:
             processed_results.append(result)
 
+    record_burst_metrics(processed_results)
+    learn_booking_horizon(processed_results, clock_offset)
+    resource_stats.record(processed_results)
+    if release_deadline is not None:
+        learn_firing_offset(
+            processed_results, release_deadline, clock_offset, firing_shift
+        )
+    journal_burst(
+        processed_results,
+        target_date,
+        release_at=fire_at,
+        release_deadline=release_deadline,
+        firing_shift=firing_shift if fire_at is not None else 0.0,
+        clock_offset=clock_offset,
+        waves=plan.describe(),
+    )
     return processed_results
 
 
+async def rank_resources(
+    client: httpx.AsyncClient,
+    csrf_token: str,
+    target_date: date,
+    resource_ids: list[str],
+) -> list[str]:
+    """
+    Order resources so that those still free for the target slot come first.
+
+    Args:
+        client: Authenticated HTTP client
+        csrf_token: CSRF token for the schedule request
+        target_date: Date of the slot
+        resource_ids: Resources in order of preference
+
+    Returns:
+        Reordered resources (taken ones dropped with ``SKIP_TAKEN_RESOURCES``);
+        the input order if no schedule is configured or it cannot be fetched
+    """
+    if SCHEDULE_ID is None:
+        return resource_ids
+
+    if await poll_schedule(client, csrf_token, target_date) is None:
+        logger.warning("Schedule unavailable - trying resources in preference order")
+        return resource_ids
+
+    start_time, end_time = calculate_booking_times(target_date)
+    taken = set(resource_ids) - set(
+        schedule_index.free_resources(resource_ids, start_time, end_time)
+    )
+    logger.info(
+        f"🗺️  {len(taken)}/{len(resource_ids)} resources already taken for the slot"
+    )
+    return order_by_availability(resource_ids, taken, drop_taken=SKIP_TAKEN_RESOURCES)
+
+
+def schedule_feed(target_date: date) -> ScheduleFeed:
+    """Polling state for the schedule of one day (created on first use)."""
+    feed = schedule_feeds.get(target_date)
+    if feed is None:
+        window_start = datetime.combine(target_date, dt.time())
+        feed = ScheduleFeed(
+            schedule_index,
+            window_start,
+            window_start + timedelta(days=1),
+            full_refresh_interval=timedelta(
+                seconds=BookingConstants.SCHEDULE_FULL_REFRESH_SECONDS
+            ),
+        )
+        schedule_feeds[target_date] = feed
+    return feed
+
+
+async def poll_schedule(
+    client: httpx.AsyncClient, csrf_token: str, target_date: date
+) -> int | None:
+    """
+    Bring ``schedule_index`` up to date for one day.
+
+    Sends the previous poll's ``LAST_REFRESH`` marker so that only changes
+    are listed; a full listing is requested on the first poll and whenever
+    the last one is older than ``SCHEDULE_FULL_REFRESH_SECONDS``.
+
+    Args:
+        client: Authenticated HTTP client
+        csrf_token: CSRF token for the schedule request
+        target_date: Day to poll
+
+    Returns:
+        Number of occupancies received, or None if the schedule could not be
+        fetched (or no schedule is configured)
+    """
+    if SCHEDULE_ID is None:
+        return None
+
+    feed = schedule_feed(target_date)
+    requested_at = datetime.now()
+    marker = feed.marker(requested_at)
+    payload = await fetch_schedule_reservations(
+        client,
+        BASE_URL,
+        SCHEDULE_ID,
+        target_date,
+        target_date,
+        csrf_token,
+        last_refresh=marker,
+    )
+    if payload is None:
+        return None
+
+    received = feed.apply(payload, requested_at, full=not marker)
+    logger.debug(
+        f"🗺️  Schedule {'delta' if marker else 'listing'} for {target_date}: "
+        f"{received} occupancies"
+    )
+    return received
+
+
+def bookable_target_date(now: datetime) -> date:
+    """
+    Newest day whose preferred slot can be booked at server time ``now``.
+
+    Uses the learned booking horizon; until one has been observed the server
+    is assumed to allow booking one week ahead.
+
+    Args:
+        now: Server time at which the booking is made
+
+    Returns:
+        Target date
+    """
+    rule = horizon_learner.load()
+    if rule is None:
+        return now.date() + timedelta(days=7)
+    slot_start = dt.time(PREFERRED_START_TIME_HOUR, PREFERRED_START_TIME_MINUTE)
+    return rule.newest_bookable_day(now, slot_start)
+
+
+def learn_booking_horizon(
+    results: list[BookingResult], clock_offset: float = 0.0
+) -> None:
+    """
+    Update the booking horizon from "too far in the future" failures.
+
+    Args:
+        results: Booking results
+        clock_offset: Server clock minus local clock in seconds
+    """
+    now_wall, now_perf = time.time(), time.perf_counter()
+
+    def server_time(perf: float) -> datetime:
+        return datetime.fromtimestamp(now_wall - (now_perf - perf) + clock_offset)
+
+    for result in results:
+        if result.error_code is not ErrorCode.TOO_FAR_IN_FUTURE:
+            continue
+        assert result.failure is not None
+        sent = received = now_perf
+        if timing := result.timing:
+            sent = timing.request_sent or timing.enqueued
+            received = timing.first_byte or timing.completed or now_perf
+        if horizon_learner.observe(
+            result.failure, (server_time(sent), server_time(received))
+        ):
+            return
+
+
+def learn_firing_offset(
+    results: list[BookingResult],
+    release_deadline: float,
+    clock_offset: float = 0.0,
+    firing_shift: float = 0.0,
+) -> None:
+    """
+    Record when each request of a timed burst left and how it was answered.
+
+    Bursts that left well after their instant (e.g. retries after the release)
+    are not recorded: every request of them is accepted, which would pull the
+    learned shift late.
+
+    Args:
+        results: Booking results of the burst
+        release_deadline: Nominal release instant on the ``time.perf_counter``
+            timescale (before any firing shift)
+        clock_offset: Server clock minus local clock in seconds
+        firing_shift: Shift the burst was fired with in seconds
+    """
+    sends = [
+        (
+            ((timing.request_sent or timing.enqueued) - release_deadline) * 1000,
+            result.error_code,
+        )
+        for result in results
+        if (timing := result.timing) is not None
+    ]
+    late_ms = min((t for t, _ in sends), default=0.0) - firing_shift * 1000
+    if late_ms > BookingConstants.LATE_BURST_SECONDS * 1000:
+        logger.debug(f"Burst left {late_ms:.0f}ms late - not learning from it")
+        return
+    firing_calibrator.record(
+        BurstObservation.from_sends(sends, datetime.now(), clock_offset)
+    )
+
+
+def firing_shift_for_next_burst() -> float:
+    """
+    Shift of the next timed burst learned from past bursts.
+
+    Returns:
+        Seconds to add to the release instant (0 with ``adaptive_firing`` off)
+    """
+    if not ADAPTIVE_FIRING:
+        return 0.0
+    shift_ms = firing_calibrator.suggest_shift_ms()
+    if shift_ms:
+        bursts = len(firing_calibrator.load())
+        logger.info(
+            f"🎚️  Firing {shift_ms:+.1f}ms from the release instant "
+            f"(learned from {bursts} bursts)"
+        )
+    return shift_ms / 1000
+
+
+def journal_burst(
+    results: list[BookingResult],
+    target_date: date | None,
+    *,
+    source: str = "burst",
+    release_at: datetime | None = None,
+    release_deadline: float | None = None,
+    firing_shift: float = 0.0,
+    clock_offset: float = 0.0,
+    waves: str | None = None,
+) -> None:
+    """
+    Queue a burst and its results for the attempt journal.
+
+    The journal is written on a background thread, so this only builds the
+    rows and returns.
+
+    Args:
+        results: Booking results of the burst
+        target_date: Day the burst tried to book
+        source: What fired the burst (``burst`` or ``sniper``)
+        release_at: Nominal release instant of a timed burst (server clock)
+        release_deadline: The same instant on the ``time.perf_counter``
+            timescale; send offsets are journaled relative to it
+        firing_shift: Seconds the release was moved (see ``FiringCalibrator``)
+        clock_offset: Server clock minus local clock in seconds
+        waves: Description of the wave plan
+    """
+    if not JOURNAL_ATTEMPTS or not results:
+        return
+    created_at = load_session_created_at()
+    attempt_journal.record(
+        BurstEntry(
+            source=source,
+            target_date=target_date,
+            release_at=release_at,
+            firing_shift_ms=firing_shift * 1000,
+            clock_offset=clock_offset,
+            session_age=time.time() - created_at if created_at else None,
+            waves=waves,
+        ),
+        [AttemptEntry.from_result(result, release_deadline) for result in results],
+    )
+
+
+# Counter children for the configured range are bound once, up front
+RESOURCE_COUNTERS = {
+    str(resource_id): metrics.bind_resource(str(resource_id))
+    for resource_id in PREFERRED_RANGE
+}
+
+
+def record_wave_metrics(outcomes: list[WaveOutcome]) -> None:
+    """
+    Update the per-wave metrics after a burst.
+
+    Args:
+        outcomes: Outcome of every wave of the burst
+    """
+    for outcome in outcomes:
+        requests = metrics.wave_requests
+        if outcome.skipped:
+            requests.labels(outcome.name, "skipped").inc(outcome.planned)
+            continue
+        metrics.wave_lateness.labels(outcome.name).observe(outcome.lateness_ms / 1000)
+        requests.labels(outcome.name, "success").inc(outcome.successes)
+        requests.labels(outcome.name, "failure").inc(outcome.failures)
+        requests.labels(outcome.name, "cancelled").inc(outcome.cancelled)
+
+
+def record_burst_metrics(results: list[BookingResult]) -> None:
+    """
+    Update the metrics after a burst (kept off the burst itself).
+
+    Args:
+        results: Results of the burst
+    """
+    metrics.bursts.inc()
+    sent_at = []
+    for result in results:
+        counters = RESOURCE_COUNTERS.get(result.resource_id)
+        if counters is None:
+            counters = RESOURCE_COUNTERS[result.resource_id] = metrics.bind_resource(
+                result.resource_id
+            )
+        counters.attempts.inc()
+        if result.success:
+            counters.successes.inc()
+        else:
+            code = result.error_code or ErrorCode.UNKNOWN
+            metrics.booking_errors.labels(result.resource_id, code.value).inc()
+
+        timing = result.timing
+        if timing is not None:
+            if timing.total_time is not None:
+                metrics.request_latency.observe(timing.total_time)
+            if timing.request_sent is not None:
+                sent_at.append(timing.request_sent)
+
+    if sent_at:
+        metrics.burst_spread.observe(max(sent_at) - min(sent_at))
+
+
+async def wait_for_first_success(
+    tasks: list[asyncio.Task[BookingResult]], *, successes_only: bool = False
+) -> BookingResult | None:
+    """
+    Wait until one booking task decides the burst or all of them have finished.
+
+    The burst is decided by a success, or by a failure after which no new
+    request for the slot can succeed (we already hold a reservation at that
+    time - often through another request of the same burst). Only a success
+    justifies cancelling the other requests; after a STOP failure the requests
+    in flight must be allowed to finish.
+
+    Args:
+        tasks: Running booking tasks
+        successes_only: Only a success decides the burst
+
+    Returns:
+        The deciding result, or None if all tasks finished without one
+    """
+    for next_done in asyncio.as_completed(tasks):
+        try:
+            result = await next_done
+        except SessionExpiredError:
+            return None  # Every other request will fail the same way
+        except Exception:
+            logger.debug("Booking task failed", exc_info=True)
+            continue
+
+        if result.success:
+            return result
+        if (
+            not successes_only
+            and result.failure
+            and result.failure.action is ErrorAction.STOP
+        ):
+            logger.info(f"🛑 {result.failure.code.value} - no new request can succeed")
+            return result
+
+    return None
+
+
 def log_booking_summary(results: list[BookingResult]) -> int:
     """
     Log summary of booking results.
@@ -823,15 +1676,38 @@ def log_booking_summary(results: list[BookingResult]) -> int:
 
     if failed:
         for result in failed:
-            logger.warning(f"  Failed resource {result.resource_id}: {result.error}")
+            code = result.error_code.value if result.error_code else "unknown"
+            logger.warning(
+                f"  Failed resource {result.resource_id} [{code}]: {result.error}"
+            )
 
     return len(successful)
 
 
+async def measure_server_clock_offset(client: httpx.AsyncClient) -> float:
+    """
+    Measure how far the server clock is ahead of ours.
+
+    Args:
+        client: HTTP client connected to the booking server
+
+    Returns:
+        Offset in seconds (0.0 if it cannot be measured)
+    """
+    try:
+        estimate = await estimate_clock_offset(client, BASE_URL + "favicon.ico")
+        return estimate.offset
+    except (httpx.RequestError, ValueError) as e:
+        logger.warning(f"Could not measure server clock offset, assuming 0: {e}")
+        return 0.0
+
+
 # --- Main Booking Function ---
 
 
-async def main_async() -> None:
+async def main_async(
+    fire_at: datetime | None = None, policy: RetryPolicy | None = None
+) -> None:
     """
     Main async booking function with retry logic.
 
@@ -839,52 +1715,71 @@ async def main_async() -> None:
     - Authentication with retry on session expiry
     - Batch booking of multiple resources
     - Error handling and logging
+
+    Waiting between rounds never blocks the event loop, so tasks sharing it
+    (metrics endpoint, keep-alive) keep running.
+
+    Args:
+        fire_at: Release the first burst at this instant instead of immediately.
+            Authentication happens beforehand so only the burst itself is timed.
+        policy: Retry policy (defaults to ``RETRY_POLICY`` from the config)
     """
-    max_retries = 1
+    retries = RetryScheduler(policy or RETRY_POLICY)
 
-    for attempt in range(max_retries + 1):
+    while True:
+        attempt = retries.attempt
         try:
-            logger.info(f"Booking attempt {attempt + 1}/{max_retries + 1}")
+            logger.info(f"Booking attempt {attempt}/{retries.attempts_allowed}")
 
-            async with authenticated_session(refresh=attempt > 0) as (
+            async with authenticated_session(refresh=attempt > 1) as (
                 client,
                 csrf_token,
             ):
-                results = await attempt_batch_booking(client, csrf_token)
+                # A cached session must be proven valid before committing to a
+                # timed burst - a 401 at the deadline would cost a full login
+                if fire_at is not None and attempt == 1:
+                    probed_token = await probe_session(client)
+                    if not probed_token:
+                        raise SessionExpiredError("Cached session rejected")
+                    csrf_token = probed_token
+
+                clock_offset = firing_shift = 0.0
+                if fire_at is not None:
+                    clock_offset = await measure_server_clock_offset(client)
+                    firing_shift = firing_shift_for_next_burst()
+
+                results = await attempt_batch_booking(
+                    client,
+                    csrf_token,
+                    fire_at=fire_at,
+                    clock_offset=clock_offset,
+                    stop_on_success=STOP_ON_FIRST_SUCCESS,
+                    check_availability=True,
+                    firing_shift=firing_shift,
+                )
                 success_count = log_booking_summary(results)
 
-                if success_count > 0:
-                    logger.info("✅ Booking completed successfully!")
-                    return
-
-                logger.info("No successful bookings in this attempt")
-
-                # Check if we should retry on general failure
-                if (
-                    hasattr(booking_details, "retry_on_fail")
-                    and booking_details.retry_on_fail
-                ):
-                    if attempt < max_retries:
-                        delay = getattr(booking_details, "retry_delay_seconds", 30)
-                        logger.info(f"Waiting {delay}s before retry...")
-                        time.sleep(delay)
-                        continue
+            if success_count > 0:
+                logger.info("✅ Booking completed successfully!")
+                break
 
-                break  # No retry needed
+            logger.info("No successful bookings in this attempt")
+            if not RETRY_ON_FAIL:
+                break
+            if not await retries.next_attempt([r.error_code for r in results]):
+                break
 
         except SessionExpiredError:
-            if attempt < max_retries:
-                logger.info(f"Session expired. Retrying ({attempt + 1}/{max_retries})")
-                continue
-            logger.error("Max retries reached after session expiry")
-            break
+            logger.info(f"Session expired on attempt {attempt}")
+            if not await retries.next_attempt(immediate=True):
+                logger.error("Max retries reached after session expiry")
+                break
 
-        except Exception as e:
-            logger.exception(f"Unexpected error in booking attempt {attempt + 1}: {e}")
-            if attempt < max_retries:
-                logger.info("Retrying due to unexpected error...")
-                continue
-            break
+        except Exception:
+            logger.exception(f"Unexpected error in booking attempt {attempt}")
+            if not await retries.next_attempt(immediate=True):
+                break
+            logger.info("Retrying due to unexpected error...")
 
     logger.info("Booking process completed")
 
@@ -930,11 +1825,14 @@ async def fetch_schedule_reservations(
     start_date: date,
     end_date: date,
     csrf_token: str,
+    last_refresh: str = "",
 ) -> dict[str, Any] | None:
     """
-    Fetch schedule reservations (unchanged from original).
+    Fetch schedule reservations.
 
-    This function is kept as-is for backward compatibility.
+    Args:
+        last_refresh: ``LAST_REFRESH`` marker of a previous fetch to list
+            only changes since then (empty for the full listing)
     """
     FETCH_URL = BASE_URL.rstrip("/") + "/schedule.php?dr=reservations"
     REFERER_URL = BASE_URL.rstrip("/") + f"/schedule.php?scheduleid={schedule_id}"
@@ -953,7 +1851,7 @@ async def fetch_schedule_reservations(
         "beginDate": (None, start_date_str),
         "endDate": (None, end_date_str),
         "scheduleId": (None, str(schedule_id)),
-        "LAST_REFRESH": (None, ""),
+        "LAST_REFRESH": (None, last_refresh),
         "MIN_CAPACITY": (None, ""),
         "RESOURCE_TYPE_ID": (None, ""),
         "userId": (None, ""),
@@ -997,6 +1895,33 @@ def main() -> None:
     asyncio.run(main_async())
 
 
+def main_at_release() -> None:
+    """
+    Synchronous entry point firing when the next day opens.
+
+    The opening instant follows the learned booking horizon; until one has
+    been observed the configured release time is used.
+    """
+    rule = horizon_learner.load()
+    if rule is not None:
+        slot_start = dt.time(PREFERRED_START_TIME_HOUR, PREFERRED_START_TIME_MINUTE)
+        fire_at, day = rule.next_opening(datetime.now(), slot_start)
+        logger.info(f"📅 {day} opens per learned booking horizon")
+    else:
+        fire_at = next_release_time(
+            booking_details.release_hour,
+            booking_details.release_minute,
+            booking_details.release_second,
+        )
+    logger.info(f"Booking burst scheduled for {fire_at.isoformat()}")
+
+    async def serve_and_book() -> None:
+        async with metrics.metrics_endpoint(METRICS_PORT):
+            await main_async(fire_at=fire_at)
+
+    asyncio.run(serve_and_book())
+
+
 def reload_csrf_token() -> None:
     """Reload CSRF token by refreshing session."""
     asyncio.run(load_client_and_csrf_token(refresh=True))
@@ -0,0 +1,404 @@
+"""
+Resource availability from the schedule's reservation listing.
+
+``schedule.php?dr=reservations`` lists every reservation and blackout of a
+schedule. The listing is loaded into an ``IntervalIndex`` and, before a
+burst, used to move resources that are already taken for the target slot to
+the back of the queue (or drop them), so the limited number of concurrent
+requests goes to seats that can still be booked.
+"""
+
+from __future__ import annotations
+
+import bisect
+import logging
+from array import array
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Field names differ between Booked versions
+_RESOURCE_KEYS = ("ResourceId", "resourceId", "resource_id")
+_START_KEYS = ("StartDate", "startDate", "start", "StartDateTime")
+_END_KEYS = ("EndDate", "endDate", "end", "EndDateTime")
+_REFERENCE_KEYS = ("ReferenceNumber", "referenceNumber", "reference_number")
+_REFRESH_KEYS = ("LAST_REFRESH", "lastRefresh", "last_refresh")
+
+DEFAULT_FULL_REFRESH_INTERVAL = timedelta(minutes=5)
+# Deltas are requested from a little before the previous poll so that clock
+# skew cannot lose changes; repeated items just replace themselves
+DEFAULT_DELTA_OVERLAP = timedelta(seconds=2)
+
+
+@dataclass(frozen=True)
+class Occupancy:
+    """A reservation or blackout holding a resource."""
+
+    resource_id: str
+    start: datetime
+    end: datetime
+    reference_number: str | None = None
+
+    def overlaps(self, start: datetime, end: datetime) -> bool:
+        """Whether this occupancy intersects ``[start, end)``."""
+        return self.start < end and start < self.end
+
+
+def _first(item: dict[str, Any], keys: tuple[str, ...]) -> Any:
+    for key in keys:
+        if (value := item.get(key)) is not None:
+            return value
+    return None
+
+
+def parse_timestamp(value: Any) -> datetime | None:
+    """
+    Parse a listing timestamp into naive local time.
+
+    Args:
+        value: ``2025-05-20 06:30:00``, ISO 8601 (with or without offset) or
+            an epoch timestamp
+
+    Returns:
+        The timestamp, or None if it cannot be parsed
+    """
+    try:
+        if isinstance(value, int | float):
+            return datetime.fromtimestamp(value)
+        parsed = datetime.fromisoformat(str(value).strip())
+    except (TypeError, ValueError, OverflowError, OSError):
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed
+
+
+def parse_schedule_reservations(payload: Any) -> list[Occupancy]:
+    """
+    Extract occupancies from a ``fetch_schedule_reservations`` payload.
+
+    Items that cannot be understood are skipped.
+
+    Args:
+        payload: A list of items, or a dict wrapping one under
+            ``reservations`` or ``data``
+
+    Returns:
+        Occupancies in listing order
+    """
+    if isinstance(payload, dict):
+        payload = payload.get("reservations", payload.get("data"))
+    if not isinstance(payload, list):
+        return []
+
+    occupancies = []
+    skipped = 0
+    for item in payload:
+        if not isinstance(item, dict):
+            skipped += 1
+            continue
+        resource_id = _first(item, _RESOURCE_KEYS)
+        start = parse_timestamp(_first(item, _START_KEYS))
+        end = parse_timestamp(_first(item, _END_KEYS))
+        if resource_id is None or start is None or end is None or end <= start:
+            skipped += 1
+            continue
+        reference = _first(item, _REFERENCE_KEYS)
+        occupancies.append(
+            Occupancy(
+                str(resource_id), start, end, str(reference) if reference else None
+            )
+        )
+
+    if skipped:
+        logger.debug(f"Skipped {skipped} unreadable schedule items")
+    return occupancies
+
+
+def parse_refresh_marker(payload: Any) -> str | None:
+    """
+    Refresh marker returned alongside a listing, if the server sends one.
+
+    Args:
+        payload: A ``fetch_schedule_reservations`` payload
+
+    Returns:
+        The marker to send as ``LAST_REFRESH`` next time, or None
+    """
+    if not isinstance(payload, dict):
+        return None
+    marker = _first(payload, _REFRESH_KEYS)
+    return str(marker) if marker not in (None, "") else None
+
+
+class IntervalIndex:
+    """
+    Occupied intervals per resource with logarithmic-time queries.
+
+    Every resource keeps the union of its occupancies as two sorted arrays of
+    epoch seconds (starts and ends of disjoint intervals), so "is this slot
+    free" is a single bisection. Individual occupancies are remembered by
+    reference number, which lets new listings update or replace entries; only
+    the touched resources are rebuilt.
+    """
+
+    def __init__(self) -> None:
+        """Create an empty index."""
+        self._entries: dict[str, dict[object, Occupancy]] = {}
+        self._resource_of: dict[object, str] = {}
+        self._starts: dict[str, array[int]] = {}
+        self._ends: dict[str, array[int]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._entries.values())
+
+    @property
+    def resources(self) -> set[str]:
+        """Resources with at least one occupancy."""
+        return set(self._entries)
+
+    @staticmethod
+    def _key(occupancy: Occupancy) -> object:
+        # Blackouts have no reference number
+        return occupancy.reference_number or (
+            occupancy.resource_id,
+            occupancy.start,
+            occupancy.end,
+        )
+
+    def update(self, occupancies: Iterable[Occupancy]) -> int:
+        """
+        Add occupancies, replacing entries with the same reference number.
+
+        Args:
+            occupancies: New or changed occupancies
+
+        Returns:
+            Number of occupancies applied
+        """
+        touched: set[str] = set()
+        count = self._add(occupancies, touched)
+        self._rebuild(touched)
+        return count
+
+    def replace_window(
+        self, start: datetime, end: datetime, occupancies: Iterable[Occupancy]
+    ) -> None:
+        """
+        Replace everything overlapping ``[start, end)`` with a fresh listing.
+
+        Entries in the window that are missing from the listing (e.g.
+        cancelled reservations) are removed.
+
+        Args:
+            start: Window start
+            end: Window end
+            occupancies: Complete listing for the window
+        """
+        touched = self._remove_where(lambda o: o.overlaps(start, end))
+        self._add(occupancies, touched)
+        self._rebuild(touched)
+
+    def prune(self, before: datetime) -> None:
+        """Forget occupancies that ended before ``before``."""
+        self._rebuild(self._remove_where(lambda o: o.end <= before))
+
+    def is_free(self, resource_id: str, start: datetime, end: datetime) -> bool:
+        """
+        Whether a resource has no occupancy overlapping ``[start, end)``.
+
+        Args:
+            resource_id: Resource to check
+            start: Slot start
+            end: Slot end
+
+        Returns:
+            True if the slot is free (unknown resources are free)
+        """
+        starts = self._starts.get(resource_id)
+        if not starts:
+            return True
+        # Last interval starting before the slot ends; intervals are disjoint
+        # and sorted, so it is the only one that can reach into the slot
+        i = bisect.bisect_left(starts, _seconds(end)) - 1
+        return i < 0 or self._ends[resource_id][i] <= _seconds(start)
+
+    def free_resources(
+        self, resource_ids: Iterable[str], start: datetime, end: datetime
+    ) -> list[str]:
+        """
+        Resources free for ``[start, end)``, in the given order.
+
+        Args:
+            resource_ids: Candidate resources
+            start: Slot start
+            end: Slot end
+
+        Returns:
+            The free candidates
+        """
+        return [r for r in resource_ids if self.is_free(r, start, end)]
+
+    def occupied(self, start: datetime, end: datetime) -> set[str]:
+        """Resources with an occupancy overlapping ``[start, end)``."""
+        return {r for r in self._entries if not self.is_free(r, start, end)}
+
+    def _add(self, occupancies: Iterable[Occupancy], touched: set[str]) -> int:
+        count = 0
+        for occupancy in occupancies:
+            key = self._key(occupancy)
+            previous = self._resource_of.get(key)
+            if previous is not None and previous != occupancy.resource_id:
+                del self._entries[previous][key]  # Moved to another resource
+                touched.add(previous)
+            self._entries.setdefault(occupancy.resource_id, {})[key] = occupancy
+            self._resource_of[key] = occupancy.resource_id
+            touched.add(occupancy.resource_id)
+            count += 1
+        return count
+
+    def _remove_where(self, predicate: Callable[[Occupancy], bool]) -> set[str]:
+        touched = set()
+        for resource_id, entries in self._entries.items():
+            matching = [k for k, o in entries.items() if predicate(o)]
+            for key in matching:
+                del entries[key]
+                del self._resource_of[key]
+            if matching:
+                touched.add(resource_id)
+        return touched
+
+    def _rebuild(self, resource_ids: Iterable[str]) -> None:
+        for resource_id in resource_ids:
+            entries = self._entries.get(resource_id)
+            if not entries:
+                self._entries.pop(resource_id, None)
+                self._starts.pop(resource_id, None)
+                self._ends.pop(resource_id, None)
+                continue
+
+            starts, ends = array("q"), array("q")
+            for occupancy in sorted(entries.values(), key=lambda o: o.start):
+                start, end = _seconds(occupancy.start), _seconds(occupancy.end)
+                if ends and start <= ends[-1]:
+                    ends[-1] = max(ends[-1], end)  # Merge touching/overlapping
+                else:
+                    starts.append(start)
+                    ends.append(end)
+            self._starts[resource_id] = starts
+            self._ends[resource_id] = ends
+
+
+class ScheduleFeed:
+    """
+    Delta-polling state for one window of the schedule.
+
+    Each poll either lists the whole window (``marker`` is empty) or asks
+    for changes since the previous poll. Full listings replace the window in
+    the index (and drop past days from it), deltas are merged into it.
+    """
+
+    def __init__(
+        self,
+        index: IntervalIndex,
+        start: datetime,
+        end: datetime,
+        *,
+        full_refresh_interval: timedelta = DEFAULT_FULL_REFRESH_INTERVAL,
+        overlap: timedelta = DEFAULT_DELTA_OVERLAP,
+    ) -> None:
+        """
+        Create a feed.
+
+        Args:
+            index: Index kept up to date
+            start: Window start
+            end: Window end
+            full_refresh_interval: Maximum age of the last full listing
+            overlap: How far before the previous poll deltas start when the
+                server does not return a marker itself
+        """
+        self.index = index
+        self.start = start
+        self.end = end
+        self.full_refresh_interval = full_refresh_interval
+        self.overlap = overlap
+        self.last_refresh = ""
+        self.refreshed_at: datetime | None = None
+        self.polls = 0
+        self.full_polls = 0
+
+    def marker(self, now: datetime) -> str:
+        """
+        ``LAST_REFRESH`` value for a poll at ``now``.
+
+        Returns:
+            The marker of the previous poll, or an empty string if a full
+            listing is due
+        """
+        if (
+            self.refreshed_at is None
+            or now - self.refreshed_at >= self.full_refresh_interval
+        ):
+            return ""
+        return self.last_refresh
+
+    def apply(self, payload: Any, requested_at: datetime, *, full: bool) -> int:
+        """
+        Merge a poll result into the index.
+
+        Args:
+            payload: Listing returned by the server
+            requested_at: When the request was sent
+            full: Whether the request was a full listing (empty marker)
+
+        Returns:
+            Number of occupancies received
+        """
+        occupancies = parse_schedule_reservations(payload)
+        if full:
+            self.index.replace_window(self.start, self.end, occupancies)
+            # Reservations of past days would otherwise pile up in a
+            # long-running process
+            self.index.prune(datetime.combine(requested_at.date(), time()))
+            self.refreshed_at = requested_at
+            self.full_polls += 1
+        else:
+            self.index.update(occupancies)
+        self.polls += 1
+
+        marker = parse_refresh_marker(payload)
+        if marker is None:
+            marker = (requested_at - self.overlap).isoformat(
+                sep=" ", timespec="seconds"
+            )
+        self.last_refresh = marker
+        return len(occupancies)
+
+
+def _seconds(moment: datetime) -> int:
+    return int(moment.timestamp())
+
+
+def order_by_availability(
+    resource_ids: Iterable[str], taken: set[str], *, drop_taken: bool = False
+) -> list[str]:
+    """
+    Put free resources first, keeping the preference order within each group.
+
+    Args:
+        resource_ids: Resources in order of preference
+        taken: Resources known to be occupied for the slot
+        drop_taken: Leave occupied resources out entirely
+
+    Returns:
+        Reordered resource ids
+    """
+    resource_ids = list(resource_ids)
+    free = [r for r in resource_ids if r not in taken]
+    if drop_taken:
+        return free
+    return free + [r for r in resource_ids if r in taken]
@@ -0,0 +1,217 @@
+"""
+Firing offset learned from past bursts.
+
+The window opens at a nominal instant, but when exactly the server starts
+accepting requests - relative to when we send them - depends on its clock,
+the network and its own processing. Every timed burst is therefore recorded:
+when each request left (relative to the nominal release instant, on the
+server's clock) and whether the server answered "too far in the future"
+(sent too early) or handled it (booked, conflict, one-at-a-time).
+
+From the recent history the calibrator estimates the edge - the earliest
+send offset that gets accepted - and suggests shifting the next burst so its
+first request leaves just after it. With evidence on only one side of the
+edge (every request accepted, or every request too early) it probes one
+step further towards the other side, so the shift converges across bursts.
+"""
+
+from __future__ import annotations
+
+import logging
+import statistics
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from diskcache import Cache
+
+from scheduler.errors import ErrorCode
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HISTORY = 12
+DEFAULT_STEP_MS = 10.0
+DEFAULT_MARGIN_MS = 2.0
+DEFAULT_MAX_SHIFT_MS = 1000.0
+
+# Answers showing the server handled the request inside the window; network
+# and HTTP errors say nothing about the edge
+ACCEPTED_CODES = frozenset({ErrorCode.CONFLICT, ErrorCode.ONE_AT_A_TIME})
+
+
+@dataclass(frozen=True)
+class BurstObservation:
+    """Send offsets and outcomes of one timed burst."""
+
+    observed_at: datetime
+    # Server clock minus local clock when the burst was fired
+    clock_offset: float
+    # (milliseconds after the nominal release instant, outcome) per request;
+    # the outcome is "success" or an ``ErrorCode`` value
+    samples: tuple[tuple[float, str], ...]
+
+    @classmethod
+    def from_sends(
+        cls,
+        sends: Iterable[tuple[float, ErrorCode | None]],
+        observed_at: datetime,
+        clock_offset: float = 0.0,
+    ) -> BurstObservation:
+        """
+        Build an observation from send offsets.
+
+        Args:
+            sends: (milliseconds after the release instant, error code or None
+                for a success) per request
+            observed_at: When the burst was fired
+            clock_offset: Server clock minus local clock in seconds
+
+        Returns:
+            The observation
+        """
+        return cls(
+            observed_at,
+            clock_offset,
+            tuple(
+                (round(offset_ms, 3), code.value if code else "success")
+                for offset_ms, code in sends
+            ),
+        )
+
+    @property
+    def latest_rejected_ms(self) -> float | None:
+        """Latest send answered "too far in the future"."""
+        rejected = [
+            t for t, outcome in self.samples if outcome == ErrorCode.TOO_FAR_IN_FUTURE
+        ]
+        return max(rejected, default=None)
+
+    @property
+    def earliest_accepted_ms(self) -> float | None:
+        """Earliest send the server handled inside the window."""
+        accepted = [
+            t
+            for t, outcome in self.samples
+            if outcome == "success" or outcome in ACCEPTED_CODES
+        ]
+        return min(accepted, default=None)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Plain representation for the cache."""
+        return {
+            "observed_at": self.observed_at.isoformat(),
+            "clock_offset": self.clock_offset,
+            "samples": [list(sample) for sample in self.samples],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> BurstObservation:
+        """
+        Rebuild an observation from ``to_dict`` output.
+
+        Raises:
+            KeyError, TypeError, ValueError: If the data is malformed
+        """
+        return cls(
+            observed_at=datetime.fromisoformat(data["observed_at"]),
+            clock_offset=float(data["clock_offset"]),
+            samples=tuple((float(t), str(outcome)) for t, outcome in data["samples"]),
+        )
+
+
+class FiringCalibrator:
+    """Keeps the burst history in the persistent cache and suggests a shift."""
+
+    CACHE_KEY = "firing_history"
+
+    def __init__(
+        self,
+        cache: Cache,
+        *,
+        history: int = DEFAULT_HISTORY,
+        step_ms: float = DEFAULT_STEP_MS,
+        margin_ms: float = DEFAULT_MARGIN_MS,
+        max_shift_ms: float = DEFAULT_MAX_SHIFT_MS,
+    ) -> None:
+        """
+        Create a calibrator.
+
+        Args:
+            cache: Persistent cache holding the history
+            history: Number of recent bursts kept and used
+            step_ms: How far to probe past one-sided evidence
+            margin_ms: How far after the estimated edge to fire
+            max_shift_ms: Largest shift ever suggested (either direction)
+        """
+        self.cache = cache
+        self.history = history
+        self.step_ms = step_ms
+        self.margin_ms = margin_ms
+        self.max_shift_ms = max_shift_ms
+
+    def load(self) -> list[BurstObservation]:
+        """
+        Get the recorded bursts, oldest first.
+
+        Returns:
+            The observations (empty if none or the cache entry is invalid)
+        """
+        data = self.cache.get(self.CACHE_KEY) or []
+        try:
+            return [BurstObservation.from_dict(item) for item in data]
+        except (KeyError, TypeError, ValueError):
+            logger.warning("Cached firing history is invalid - ignoring it")
+            return []
+
+    def record(self, observation: BurstObservation) -> None:
+        """Add a burst to the history, dropping the oldest beyond ``history``."""
+        if not observation.samples:
+            return
+        observations = [*self.load(), observation][-self.history :]
+        self.cache.set(self.CACHE_KEY, [o.to_dict() for o in observations])
+
+    def edge_ms(self) -> tuple[float | None, float | None]:
+        """
+        Bounds on the edge of the window from the recent history.
+
+        Returns:
+            Tuple of (median latest rejected send, median earliest accepted
+            send) in milliseconds after the release instant; None where no
+            burst gave evidence
+        """
+        observations = self.load()
+        rejected = [
+            o.latest_rejected_ms
+            for o in observations
+            if o.latest_rejected_ms is not None
+        ]
+        accepted = [
+            o.earliest_accepted_ms
+            for o in observations
+            if o.earliest_accepted_ms is not None
+        ]
+        return (
+            statistics.median(rejected) if rejected else None,
+            statistics.median(accepted) if accepted else None,
+        )
+
+    def suggest_shift_ms(self) -> float:
+        """
+        Shift of the next burst relative to the nominal release instant.
+
+        Returns:
+            Milliseconds to add to the firing time (0 without history)
+        """
+        lower, upper = self.edge_ms()
+        if lower is None:
+            if upper is None:
+                return 0.0
+            shift = upper - self.step_ms  # Always accepted - probe earlier
+        elif upper is None:
+            shift = lower + self.step_ms  # Always too early - probe later
+        elif lower < upper:
+            shift = (lower + upper) / 2 + self.margin_ms
+        else:
+            shift = upper + self.margin_ms  # Noisy overlap - trust acceptance
+        return max(-self.max_shift_ms, min(self.max_shift_ms, shift))
@@ -0,0 +1,208 @@
+"""
+Server clock-offset estimation from HTTP ``Date`` headers.
+
+The booking window opens by the server's clock. Every response carries a
+``Date`` header with one-second resolution; each request bounds the offset
+between the server clock and ours:
+
+    server_date - received_at  <  offset  <  server_date + 1 - sent_at
+
+Intersecting these bounds over several samples, and timing later probes so
+that they straddle a server second boundary, narrows the offset well below
+one second - ultimately down to the round-trip time of a single request.
+"""
+
+from __future__ import annotations
+
+import logging
+import statistics
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+
+import httpx
+
+from scheduler.config import BookingConstants
+from scheduler.firing import sleep_until
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROBE_COUNT = 8
+
+
+@dataclass
+class ClockSample:
+    """One request/response exchange with its local timestamps."""
+
+    sent_at: float
+    received_at: float
+    server_date: float
+
+    @property
+    def rtt(self) -> float:
+        """Round-trip time of the exchange in seconds."""
+        return self.received_at - self.sent_at
+
+    @property
+    def lower_bound(self) -> float:
+        """Smallest offset consistent with this sample."""
+        return self.server_date - self.received_at
+
+    @property
+    def upper_bound(self) -> float:
+        """Largest offset consistent with this sample."""
+        return self.server_date + 1.0 - self.sent_at
+
+    @property
+    def midpoint_offset(self) -> float:
+        """NTP-style point estimate assuming symmetric delays."""
+        midpoint = (self.sent_at + self.received_at) / 2
+        return self.server_date + 0.5 - midpoint
+
+
+@dataclass
+class ClockOffset:
+    """Estimated offset of the server clock relative to the local clock."""
+
+    offset: float
+    uncertainty: float
+    rtt: float
+    samples: int
+
+
+def parse_date_header(response: httpx.Response) -> float | None:
+    """
+    Parse the ``Date`` header of a response into an epoch timestamp.
+
+    Args:
+        response: HTTP response
+
+    Returns:
+        Epoch seconds, or None if the header is missing or malformed
+    """
+    header = response.headers.get("Date")
+    if not header:
+        return None
+    try:
+        return parsedate_to_datetime(header).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def combine_samples(samples: list[ClockSample]) -> ClockOffset:
+    """
+    Combine clock samples into a single offset estimate.
+
+    Args:
+        samples: Samples collected from the server
+
+    Returns:
+        Centre of the intersection of all sample bounds, or the median of the
+        midpoint estimates if the bounds are inconsistent
+
+    Raises:
+        ValueError: If no samples are given
+    """
+    if not samples:
+        raise ValueError("At least one clock sample is required")
+
+    lower = max(sample.lower_bound for sample in samples)
+    upper = min(sample.upper_bound for sample in samples)
+    best_rtt = min(sample.rtt for sample in samples)
+
+    if lower <= upper:
+        return ClockOffset(
+            offset=(lower + upper) / 2,
+            uncertainty=(upper - lower) / 2,
+            rtt=best_rtt,
+            samples=len(samples),
+        )
+
+    # Inconsistent bounds mean a sample was delayed asymmetrically (or the
+    # server clock stepped). Fall back to the robust NTP-style estimate.
+    logger.warning("Clock samples are inconsistent - using median estimate")
+    return ClockOffset(
+        offset=statistics.median(sample.midpoint_offset for sample in samples),
+        uncertainty=0.5 + best_rtt / 2,
+        rtt=best_rtt,
+        samples=len(samples),
+    )
+
+
+async def take_clock_sample(client: httpx.AsyncClient, url: str) -> ClockSample | None:
+    """
+    Take a single clock sample.
+
+    Args:
+        client: HTTP client (ideally with a warm connection to the server)
+        url: URL to probe
+
+    Returns:
+        The sample, or None if the response carried no usable Date header
+    """
+    # HEAD keeps server work minimal; any status code is fine, only the Date
+    # header matters
+    sent_at = time.time()
+    response = await client.head(url, timeout=BookingConstants.DEFAULT_TIMEOUT)
+    received_at = time.time()
+
+    server_date = parse_date_header(response)
+    if server_date is None:
+        return None
+    return ClockSample(
+        sent_at=sent_at, received_at=received_at, server_date=server_date
+    )
+
+
+async def estimate_clock_offset(
+    client: httpx.AsyncClient,
+    url: str,
+    *,
+    probes: int = DEFAULT_PROBE_COUNT,
+) -> ClockOffset:
+    """
+    Estimate the server clock offset.
+
+    A warm-up probe establishes the connection and the first sample yields a
+    coarse estimate. Every following probe is timed to arrive exactly on a server second boundary
+    according to the current estimate, so the Date it returns tells us on
+    which side of the boundary the true offset lies - a bisection of the
+    remaining uncertainty.
+
+    Args:
+        client: HTTP client to probe with
+        url: URL to probe (a cheap static path is best)
+        probes: Number of probes to send
+
+    Returns:
+        Estimated clock offset
+
+    Raises:
+        httpx.RequestError: If the server cannot be reached
+        ValueError: If the server sends no usable Date headers
+    """
+    # Warm-up probe: establishes the connection, result discarded
+    await take_clock_sample(client, url)
+
+    samples: list[ClockSample] = []
+    for _ in range(probes):
+        if samples:
+            estimate = combine_samples(samples)
+            # Aim the middle of the request at the next server second boundary
+            now = time.time()
+            server_now = now + estimate.offset
+            boundary = int(server_now) + 1
+            send_at = boundary - estimate.offset - estimate.rtt / 2
+            if send_at - now < 0.05:
+                send_at += 1.0
+            await sleep_until(time.perf_counter() + (send_at - time.time()))
+
+        if sample := await take_clock_sample(client, url):
+            samples.append(sample)
+
+    estimate = combine_samples(samples)
+    logger.info(
+        f"🕐 Server clock offset {estimate.offset * 1000:+.1f}ms "
+        f"(±{estimate.uncertainty * 1000:.1f}ms, rtt {estimate.rtt * 1000:.1f}ms)"
+    )
+    return estimate
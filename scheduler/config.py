@@ -1,10 +1,15 @@
+from pathlib import Path
+
 from diskcache import Cache
+from pydantic import BaseModel, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from pydantic import Field, BaseModel
-from pathlib import Path
+
+from scheduler.waves import Wave, WaveOrder, WavePlan  # noqa: F401 - for editing the plan
 
 cache_path = Path(__file__).parent / ".cache"
 persistent_cache = Cache(cache_path)
+# SQLite journal of every burst and attempt (see scheduler/journal.py)
+journal_path = cache_path / "journal.sqlite3"
 
 
 class LoginDetails(BaseSettings):
@@ -23,6 +28,38 @@ class BookingConstants:
     MAX_CONCURRENT_BOOKINGS = 50
     TIMEZONE = "Europe/Zurich"
 
+    # Connection pool - the server answers with "Keep-Alive: timeout=5", so idle
+    # connections are dropped client-side just before the server would close them
+    KEEPALIVE_EXPIRY = 4.5
+    WARMUP_LEAD_SECONDS = 2.0
+
+    # Session keeper - probe regularly, refresh well before the cache expires
+    SESSION_CHECK_INTERVAL_SECONDS = 300
+    SESSION_REFRESH_MARGIN_SECONDS = 1800
+
+    # Schedule polling - deltas every few seconds, a full listing now and then
+    SCHEDULE_POLL_INTERVAL_SECONDS = 5
+    SCHEDULE_FULL_REFRESH_SECONDS = 300
+
+    # Cancellation sniper - poll interval bounds, shrinking within the ramp
+    SNIPE_MIN_INTERVAL_SECONDS = 2
+    SNIPE_MAX_INTERVAL_SECONDS = 60
+    SNIPE_RAMP_SECONDS = 6 * 60 * 60
+
+    # Waves after the first spin only this close to their instant, so the
+    # previous wave's requests get the event loop while waiting
+    WAVE_SPIN_SECONDS = 0.001
+    # Timed bursts leaving later than this after their instant (a retry after
+    # the release) say nothing about the firing offset and are not learned from
+    LATE_BURST_SECONDS = 0.1
+
+    # Attempt journal - bursts per write transaction, seconds to collect them
+    JOURNAL_BATCH_SIZE = 64
+    JOURNAL_FLUSH_SECONDS = 1.0
+
+    # Metrics endpoint - local only
+    METRICS_HOST = "127.0.0.1"
+
     # HTTP Headers
     USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/18.3.1 Safari/605.1.15"
     ACCEPT_LANGUAGE = "en-US,en;q=0.9"
@@ -44,3 +81,41 @@ class BookingDetails(BaseModel):
     preferred_end_time_hour: int = 16
     preferred_end_time_minute: int = 30
     standard_attribute_values: list[dict[str, str]] = [{"id": "1", "value": "WWF"}]
+    # Daily instant (local time) at which the booking window opens
+    release_hour: int = 0
+    release_minute: int = 0
+    release_second: int = 0
+    # Connections to open before firing (defaults to the size of the range)
+    warm_connections: int | None = None
+    # Optional cap on concurrent requests per host (on top of MAX_CONCURRENT_BOOKINGS)
+    max_connections_per_host: int | None = None
+    # Waves of the burst around the release instant, e.g.
+    # WavePlan((Wave("A", -20), Wave("B", 0, WaveOrder.REVERSED), Wave("C", 15)))
+    wave_plan: WavePlan = WavePlan()
+    # Move timed bursts towards the earliest send time the server accepted
+    # in past bursts (history in the persistent cache)
+    adaptive_firing: bool = True
+    # Stop the burst at the first confirmed booking (one reservation per slot)
+    stop_on_first_success: bool = True
+    # Serve Prometheus metrics on this local port (book-at-release / keep-session)
+    metrics_port: int | None = None
+    keeper_metrics_port: int | None = None
+    sniper_metrics_port: int | None = None
+    # Schedule listing checked before a burst (no availability check if None)
+    schedule_id: int | None = None
+    # Try resources we won most often (and lost least often) first; the
+    # statistics are kept in the persistent cache
+    rank_by_win_rate: bool = True
+    # Append every burst and attempt to the SQLite journal (``journal-stats``)
+    journal_attempts: bool = True
+    # Leave resources already taken for the slot out instead of trying them last
+    skip_taken_resources: bool = False
+    # Repeat bursts without a success (session expiry is always retried); the
+    # delay grows by retry_backoff per retry - 1.0 keeps it fixed
+    retry_on_fail: bool = False
+    max_retries: int = 1
+    retry_delay_seconds: float = 30
+    retry_backoff: float = 1.0
+    retry_max_delay_seconds: float | None = None
+    retry_jitter: float = 0.0
+    retry_deadline_seconds: float | None = None
@@ -0,0 +1,170 @@
+"""
+Classification of failed reservation attempts.
+
+Booked reports failures as German sentences in ``data.errors``. The three we
+see in practice are:
+
+1. "Die Reservierung liegt zu weit in der Zukunft. Der späteste Zeitpunkt ist
+   19/05/2025 23:59:00." - the booking window is not open yet
+2. "Es ist nur eine Reservierung zur selben Zeit möglich.\\n20/05/2025\\n" - we
+   already hold a reservation at that time
+3. "Es gibt in Konflikt stehende Reservierungen an folgenden Tagen:\\n20/05/2025"
+   - someone else holds this resource
+
+Each message is matched against precompiled patterns and mapped to an error
+code, the dates it mentions and the action the booker should take next.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from datetime import date, datetime
+from enum import StrEnum
+
+import httpx
+
+
+class ErrorCode(StrEnum):
+    """What went wrong with a reservation attempt."""
+
+    TOO_FAR_IN_FUTURE = "too_far_in_future"
+    ONE_AT_A_TIME = "one_at_a_time"
+    CONFLICT = "conflict"
+    HTTP_ERROR = "http_error"
+    NETWORK_ERROR = "network_error"
+    INVALID_RESPONSE = "invalid_response"
+    UNKNOWN = "unknown"
+
+
+class ErrorAction(StrEnum):
+    """What to do after a failure."""
+
+    RETRY = "retry"  # Same request may succeed later
+    NEXT_RESOURCE = "next_resource"  # This resource is gone, others may not be
+    STOP = "stop"  # No request for this slot can succeed
+
+
+ACTIONS = {
+    ErrorCode.TOO_FAR_IN_FUTURE: ErrorAction.RETRY,
+    ErrorCode.ONE_AT_A_TIME: ErrorAction.STOP,
+    ErrorCode.CONFLICT: ErrorAction.NEXT_RESOURCE,
+    ErrorCode.HTTP_ERROR: ErrorAction.RETRY,
+    ErrorCode.NETWORK_ERROR: ErrorAction.RETRY,
+    ErrorCode.INVALID_RESPONSE: ErrorAction.RETRY,
+    ErrorCode.UNKNOWN: ErrorAction.NEXT_RESOURCE,
+}
+
+_DATE = r"(\d{2})/(\d{2})/(\d{4})"
+_TOO_FAR_PATTERN = re.compile(
+    rf"zu weit in der Zukunft.*?{_DATE}(?:\s+(\d{{2}}):(\d{{2}}):(\d{{2}}))?", re.DOTALL
+)
+_ONE_AT_A_TIME_PATTERN = re.compile(r"nur eine Reservierung zur selben Zeit")
+_CONFLICT_PATTERN = re.compile(r"in Konflikt stehende Reservierungen")
+_DATE_PATTERN = re.compile(_DATE)
+
+
+@dataclass(frozen=True)
+class ReservationFailure:
+    """A classified reservation failure."""
+
+    code: ErrorCode
+    message: str = ""
+    # Latest bookable instant (TOO_FAR_IN_FUTURE)
+    latest_bookable: datetime | None = None
+    # Days the message refers to (ONE_AT_A_TIME, CONFLICT)
+    dates: tuple[date, ...] = ()
+    status_code: int | None = None
+
+    @property
+    def action(self) -> ErrorAction:
+        """What the booker should do next."""
+        return ACTIONS[self.code]
+
+
+def _parse_dates(message: str) -> tuple[date, ...]:
+    return tuple(
+        date(int(year), int(month), int(day))
+        for day, month, year in _DATE_PATTERN.findall(message)
+    )
+
+
+def classify_message(message: str) -> ReservationFailure:
+    """
+    Classify one server error message.
+
+    Args:
+        message: Error text from ``data.errors``
+
+    Returns:
+        Classified failure (``UNKNOWN`` if no pattern matches)
+    """
+    if match := _TOO_FAR_PATTERN.search(message):
+        day, month, year, hour, minute, second = match.groups()
+        latest = datetime(
+            int(year),
+            int(month),
+            int(day),
+            int(hour or 23),
+            int(minute or 59),
+            int(second or 59),
+        )
+        return ReservationFailure(
+            ErrorCode.TOO_FAR_IN_FUTURE, message, latest_bookable=latest
+        )
+    if _ONE_AT_A_TIME_PATTERN.search(message):
+        return ReservationFailure(
+            ErrorCode.ONE_AT_A_TIME, message, dates=_parse_dates(message)
+        )
+    if _CONFLICT_PATTERN.search(message):
+        return ReservationFailure(
+            ErrorCode.CONFLICT, message, dates=_parse_dates(message)
+        )
+    return ReservationFailure(ErrorCode.UNKNOWN, message)
+
+
+def classify_server_errors(errors: list[str] | str) -> ReservationFailure:
+    """
+    Classify the ``data.errors`` of a failed reservation response.
+
+    Args:
+        errors: Error messages (or a single message)
+
+    Returns:
+        The first recognised failure, or ``UNKNOWN`` carrying all messages
+    """
+    messages = [errors] if isinstance(errors, str) else [str(e) for e in errors]
+    for message in messages:
+        failure = classify_message(message)
+        if failure.code is not ErrorCode.UNKNOWN:
+            return failure
+    return ReservationFailure(ErrorCode.UNKNOWN, "\n".join(messages))
+
+
+def classify_http_status(status_code: int, message: str = "") -> ReservationFailure:
+    """
+    Classify a non-2xx reservation response.
+
+    Args:
+        status_code: HTTP status
+        message: Error text for the result
+
+    Returns:
+        ``HTTP_ERROR`` failure carrying the status
+    """
+    return ReservationFailure(ErrorCode.HTTP_ERROR, message, status_code=status_code)
+
+
+def classify_exception(exc: BaseException) -> ReservationFailure:
+    """
+    Classify an exception raised while sending a reservation.
+
+    Args:
+        exc: The exception
+
+    Returns:
+        ``NETWORK_ERROR`` for transport problems, otherwise ``UNKNOWN``
+    """
+    if isinstance(exc, httpx.TransportError):
+        return ReservationFailure(ErrorCode.NETWORK_ERROR, str(exc))
+    return ReservationFailure(ErrorCode.UNKNOWN, str(exc))
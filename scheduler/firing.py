@@ -0,0 +1,83 @@
+"""
+Precision release-time firing for competitive booking bursts.
+
+The booking window opens at a fixed wall-clock instant. Everything that can be
+done ahead of time (authentication, request building) happens before that
+instant; this module provides the timing primitives used to release the burst
+as close to the target as the event loop allows.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+# Coarse sleeps are handed to the event loop until this close to the deadline,
+# after which we spin on the high-resolution counter. asyncio.sleep routinely
+# overshoots by a millisecond or more, spinning does not.
+SPIN_THRESHOLD_SECONDS = 0.005
+
+
+def monotonic_deadline(target: datetime, *, clock_offset: float = 0.0) -> float:
+    """
+    Convert a wall-clock instant into a ``time.perf_counter`` deadline.
+
+    Args:
+        target: Wall-clock instant to fire at (naive values are local time)
+        clock_offset: Seconds to add to the local clock to obtain server time
+
+    Returns:
+        Deadline on the ``time.perf_counter`` timescale
+    """
+    # Sample both clocks back to back so the conversion error stays in the
+    # sub-microsecond range.
+    perf_now = time.perf_counter()
+    wall_now = time.time()
+    return perf_now + (target.timestamp() - (wall_now + clock_offset))
+
+
+async def sleep_until(
+    deadline: float, *, spin_threshold: float = SPIN_THRESHOLD_SECONDS
+) -> float:
+    """
+    Sleep until a ``time.perf_counter`` deadline with sub-millisecond precision.
+
+    Args:
+        deadline: Target instant on the ``time.perf_counter`` timescale
+        spin_threshold: Remaining time below which we busy-wait instead of sleeping
+
+    Returns:
+        Lateness in seconds (negative values never occur; zero if already past)
+    """
+    remaining = deadline - time.perf_counter()
+    while remaining > spin_threshold:
+        await asyncio.sleep(remaining - spin_threshold)
+        remaining = deadline - time.perf_counter()
+
+    while time.perf_counter() < deadline:
+        pass
+
+    return max(0.0, time.perf_counter() - deadline)
+
+
+def next_release_time(
+    hour: int, minute: int, second: int = 0, *, now: datetime | None = None
+) -> datetime:
+    """
+    Get the next occurrence of the daily booking release time.
+
+    Args:
+        hour: Release hour (local time)
+        minute: Release minute
+        second: Release second
+        now: Reference time (defaults to the current local time)
+
+    Returns:
+        The next release instant strictly after ``now``
+    """
+    now = now or datetime.now()
+    release = now.replace(hour=hour, minute=minute, second=second, microsecond=0)
+    if release <= now:
+        release += timedelta(days=1)
+    return release
@@ -0,0 +1,117 @@
+"""
+Concurrency governor for booking bursts.
+
+Caps the number of reservation requests in flight (globally and optionally per
+host) so that widening the resource range does not overwhelm the event loop,
+the connection pool or the server. Time spent waiting for a slot is recorded
+so the limits can be tuned.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+
+from scheduler.config import BookingConstants
+
+# Recent queueing delays kept for inspection (the totals cover all slots)
+WAIT_HISTORY = 1024
+
+
+@dataclass
+class GovernorMetrics:
+    """Queueing statistics collected by a governor."""
+
+    acquired: int = 0
+    queued: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+    in_flight: int = 0
+    peak_in_flight: int = 0
+    waits: deque[float] = field(default_factory=lambda: deque(maxlen=WAIT_HISTORY))
+
+    @property
+    def mean_wait(self) -> float:
+        """Mean queueing delay per acquired slot in seconds."""
+        return self.total_wait / self.acquired if self.acquired else 0.0
+
+    def record_wait(self, wait: float) -> None:
+        """Record the queueing delay of one acquired slot."""
+        self.acquired += 1
+        self.total_wait += wait
+        self.waits.append(wait)
+        self.max_wait = max(self.max_wait, wait)
+
+    def summary(self) -> str:
+        """One-line human readable summary."""
+        return (
+            f"{self.acquired} slots, {self.queued} queued, "
+            f"peak {self.peak_in_flight} in flight, "
+            f"wait mean {self.mean_wait * 1000:.2f}ms max {self.max_wait * 1000:.2f}ms"
+        )
+
+
+class ConcurrencyGovernor:
+    """Semaphore-based limiter with an optional per-host cap."""
+
+    def __init__(
+        self,
+        max_concurrent: int = BookingConstants.MAX_CONCURRENT_BOOKINGS,
+        per_host: int | None = None,
+    ) -> None:
+        """
+        Create a governor.
+
+        Args:
+            max_concurrent: Maximum requests in flight overall
+            per_host: Maximum requests in flight per host (no cap if None)
+        """
+        self.max_concurrent = max_concurrent
+        self.per_host = per_host
+        self.metrics = GovernorMetrics()
+        self._global = asyncio.Semaphore(max_concurrent)
+        self._hosts: dict[str, asyncio.Semaphore] = {}
+
+    def _host_semaphore(self, host: str) -> asyncio.Semaphore | None:
+        if self.per_host is None:
+            return None
+        if host not in self._hosts:
+            self._hosts[host] = asyncio.Semaphore(self.per_host)
+        return self._hosts[host]
+
+    @asynccontextmanager
+    async def slot(self, host: str = "") -> AsyncIterator[None]:
+        """
+        Hold one request slot for the duration of the block.
+
+        Args:
+            host: Host the request goes to (only used with a per-host cap)
+        """
+        host_semaphore = self._host_semaphore(host)
+        if self._global.locked() or (host_semaphore and host_semaphore.locked()):
+            self.metrics.queued += 1
+
+        started = time.perf_counter()
+        if host_semaphore is None:
+            async with self._global, self._track(started):
+                yield
+        else:
+            # Host first: waiting for a saturated host must not hold a global
+            # slot that requests to other hosts could use
+            async with host_semaphore, self._global, self._track(started):
+                yield
+
+    @asynccontextmanager
+    async def _track(self, started: float) -> AsyncIterator[None]:
+        metrics = self.metrics
+        metrics.record_wait(time.perf_counter() - started)
+        metrics.in_flight += 1
+        metrics.peak_in_flight = max(metrics.peak_in_flight, metrics.in_flight)
+        try:
+            yield
+        finally:
+            metrics.in_flight -= 1
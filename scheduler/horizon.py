@@ -0,0 +1,211 @@
+"""
+Booking horizon learned from "too far in the future" responses.
+
+When a reservation is too far ahead the server names the latest bookable
+instant ("Der späteste Zeitpunkt ist 19/05/2025 23:59:00"). Relative to the
+server's date at the time of the request, that instant gives the policy: a
+number of days ahead plus a cut-off time on the last day. The rule is kept in
+the persistent cache and used to pick the target day of a burst and the
+instant at which the next day opens.
+
+The server's date is only known from our own clock, so observations made
+within ``ambiguity`` of midnight (on the server's clock) are ignored - for
+those the days-ahead count could be off by one.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import Any
+
+from diskcache import Cache
+
+from scheduler.errors import ErrorCode, ReservationFailure
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_AMBIGUITY = timedelta(seconds=2)
+
+
+@dataclass(frozen=True)
+class HorizonRule:
+    """Server policy: bookable up to ``cutoff`` on the day ``days_ahead`` ahead."""
+
+    days_ahead: int
+    cutoff: time
+    observed_at: datetime
+
+    @classmethod
+    def from_observation(
+        cls, latest_bookable: datetime, observed_at: datetime
+    ) -> HorizonRule:
+        """
+        Derive the rule from one server response.
+
+        Args:
+            latest_bookable: Latest bookable instant named by the server
+            observed_at: Server time at which the request was handled
+
+        Returns:
+            The rule in effect at ``observed_at``
+        """
+        return cls(
+            days_ahead=(latest_bookable.date() - observed_at.date()).days,
+            cutoff=latest_bookable.time(),
+            observed_at=observed_at,
+        )
+
+    def latest_bookable(self, now: datetime) -> datetime:
+        """Latest bookable instant at server time ``now``."""
+        return datetime.combine(
+            now.date() + timedelta(days=self.days_ahead), self.cutoff
+        )
+
+    def newest_bookable_day(self, now: datetime, slot_start: time) -> date:
+        """
+        Newest day on which a slot starting at ``slot_start`` can be booked.
+
+        Args:
+            now: Server time
+            slot_start: Start time of the slot
+
+        Returns:
+            The day
+        """
+        latest = self.latest_bookable(now)
+        if slot_start <= self.cutoff:
+            return latest.date()
+        return latest.date() - timedelta(days=1)
+
+    def opens_at(self, slot_start: datetime) -> datetime:
+        """
+        Server time at which a slot becomes bookable.
+
+        Args:
+            slot_start: Start of the slot
+
+        Returns:
+            Midnight of the first day whose horizon covers the slot
+        """
+        day = slot_start.date() - timedelta(days=self.days_ahead)
+        if slot_start.time() > self.cutoff:
+            day += timedelta(days=1)
+        return datetime.combine(day, time())
+
+    def next_opening(self, now: datetime, slot_start: time) -> tuple[datetime, date]:
+        """
+        Next instant at which a new day opens for the slot.
+
+        Args:
+            now: Server time
+            slot_start: Start time of the slot
+
+        Returns:
+            Tuple of (opening instant, day that opens)
+        """
+        day = self.newest_bookable_day(now, slot_start) + timedelta(days=1)
+        return self.opens_at(datetime.combine(day, slot_start)), day
+
+    def to_dict(self) -> dict[str, Any]:
+        """Plain representation for the cache."""
+        return {
+            "days_ahead": self.days_ahead,
+            "cutoff": self.cutoff.isoformat(),
+            "observed_at": self.observed_at.isoformat(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> HorizonRule:
+        """
+        Rebuild a rule from ``to_dict`` output.
+
+        Raises:
+            KeyError, TypeError, ValueError: If the data is malformed
+        """
+        return cls(
+            days_ahead=int(data["days_ahead"]),
+            cutoff=time.fromisoformat(data["cutoff"]),
+            observed_at=datetime.fromisoformat(data["observed_at"]),
+        )
+
+
+def near_midnight(start: datetime, end: datetime, margin: timedelta) -> bool:
+    """Whether ``[start - margin, end + margin]`` spans a change of date."""
+    return (start - margin).date() != (end + margin).date()
+
+
+class HorizonLearner:
+    """Learns the booking horizon and keeps it in the persistent cache."""
+
+    CACHE_KEY = "booking_horizon"
+
+    def __init__(
+        self, cache: Cache, *, ambiguity: timedelta = DEFAULT_AMBIGUITY
+    ) -> None:
+        """
+        Create a learner.
+
+        Args:
+            cache: Persistent cache holding the rule
+            ambiguity: Observations this close to midnight are ignored
+        """
+        self.cache = cache
+        self.ambiguity = ambiguity
+
+    def load(self) -> HorizonRule | None:
+        """
+        Get the learned rule.
+
+        Returns:
+            The rule, or None if nothing has been learned yet
+        """
+        data = self.cache.get(self.CACHE_KEY)
+        if data is None:
+            return None
+        try:
+            return HorizonRule.from_dict(data)
+        except (KeyError, TypeError, ValueError):
+            logger.warning("Cached booking horizon is invalid - ignoring it")
+            return None
+
+    def observe(
+        self,
+        failure: ReservationFailure,
+        handled_between: tuple[datetime, datetime],
+    ) -> HorizonRule | None:
+        """
+        Learn from a failed reservation.
+
+        Args:
+            failure: Classified failure
+            handled_between: Server-time bounds of when the server handled the
+                request (request sent, response received)
+
+        Returns:
+            The learned rule, or None if the failure did not teach anything
+        """
+        if (
+            failure.code is not ErrorCode.TOO_FAR_IN_FUTURE
+            or failure.latest_bookable is None
+        ):
+            return None
+
+        start, end = handled_between
+        if near_midnight(start, end, self.ambiguity):
+            logger.debug("Horizon observation too close to midnight - skipped")
+            return None
+
+        rule = HorizonRule.from_observation(failure.latest_bookable, end)
+        current = self.load()
+        if current is None or (current.days_ahead, current.cutoff) != (
+            rule.days_ahead,
+            rule.cutoff,
+        ):
+            logger.info(
+                f"📅 Booking horizon: {rule.days_ahead} days ahead until "
+                f"{rule.cutoff.isoformat()}"
+            )
+        self.cache.set(self.CACHE_KEY, rule.to_dict())
+        return rule
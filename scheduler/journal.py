@@ -0,0 +1,550 @@
+"""
+SQLite journal of every burst and booking attempt.
+
+The log lines of a run are gone once it ends. The journal keeps one row per
+burst (target day, release instant, firing shift, clock offset, session age,
+waves) and one row per attempt (resource, wave, outcome, error class,
+reference number, send offset and request phases) in a local SQLite file,
+which is the data needed to tune the booker.
+
+Writing never touches the burst: ``AttemptJournal.record`` only puts the
+burst on a queue, and a background thread writes queued bursts in batches,
+one transaction per batch, to a database in WAL mode (readers such as the
+``journal-stats`` command never block it).
+
+Usage:
+    uv run journal-stats resource
+    uv run journal-stats weekday --since 2025-05-01
+    uv run journal-stats offset --bucket-ms 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import atexit
+import calendar
+import logging
+import math
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from scheduler.config import journal_path
+from scheduler.errors import ErrorCode
+
+if TYPE_CHECKING:
+    from scheduler.amain import BookingResult
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 64
+DEFAULT_FLUSH_INTERVAL = 1.0
+DEFAULT_BUCKET_MS = 10.0
+# Seconds between checks that the writer thread is still alive while flushing
+FLUSH_CHECK_INTERVAL = 0.1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS bursts (
+    id TEXT PRIMARY KEY,
+    recorded_at TEXT NOT NULL,
+    source TEXT NOT NULL,
+    target_date TEXT,
+    weekday INTEGER,
+    release_at TEXT,
+    firing_shift_ms REAL,
+    clock_offset REAL,
+    session_age REAL,
+    waves TEXT
+);
+CREATE TABLE IF NOT EXISTS attempts (
+    burst_id TEXT NOT NULL REFERENCES bursts (id),
+    resource_id TEXT NOT NULL,
+    wave TEXT,
+    success INTEGER NOT NULL,
+    error_code TEXT,
+    error TEXT,
+    reference_number TEXT,
+    offset_ms REAL,
+    queue_time REAL,
+    send_time REAL,
+    server_time REAL,
+    total_time REAL,
+    new_connection INTEGER
+);
+CREATE INDEX IF NOT EXISTS attempts_burst ON attempts (burst_id);
+"""
+
+BURST_COLUMNS = (
+    "id",
+    "recorded_at",
+    "source",
+    "target_date",
+    "weekday",
+    "release_at",
+    "firing_shift_ms",
+    "clock_offset",
+    "session_age",
+    "waves",
+)
+ATTEMPT_COLUMNS = (
+    "burst_id",
+    "resource_id",
+    "wave",
+    "success",
+    "error_code",
+    "error",
+    "reference_number",
+    "offset_ms",
+    "queue_time",
+    "send_time",
+    "server_time",
+    "total_time",
+    "new_connection",
+)
+
+# Grouping expressions of the win rate queries
+DIMENSIONS = {
+    "resource": "a.resource_id",
+    "weekday": "b.weekday",
+    "offset": "bucket(a.offset_ms, :bucket_ms)",
+}
+
+
+@dataclass(frozen=True)
+class BurstEntry:
+    """One burst as stored in the journal."""
+
+    source: str
+    target_date: date | None = None
+    # Nominal release instant of a timed burst (server clock)
+    release_at: datetime | None = None
+    firing_shift_ms: float = 0.0
+    clock_offset: float = 0.0
+    # Seconds since the session used for the burst was established
+    session_age: float | None = None
+    waves: str | None = None
+    recorded_at: datetime = field(default_factory=datetime.now)
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+
+    def row(self) -> tuple[Any, ...]:
+        """Values in ``BURST_COLUMNS`` order."""
+        return (
+            self.id,
+            self.recorded_at.isoformat(),
+            self.source,
+            self.target_date.isoformat() if self.target_date else None,
+            self.target_date.weekday() if self.target_date else None,
+            self.release_at.isoformat() if self.release_at else None,
+            self.firing_shift_ms,
+            self.clock_offset,
+            self.session_age,
+            self.waves,
+        )
+
+
+@dataclass(frozen=True)
+class AttemptEntry:
+    """One booking attempt as stored in the journal."""
+
+    resource_id: str
+    success: bool
+    wave: str | None = None
+    error_code: str | None = None
+    error: str | None = None
+    reference_number: str | None = None
+    # Milliseconds after the nominal release instant the request left
+    offset_ms: float | None = None
+    queue_time: float | None = None
+    send_time: float | None = None
+    server_time: float | None = None
+    total_time: float | None = None
+    new_connection: bool | None = None
+
+    @classmethod
+    def from_result(
+        cls, result: BookingResult, release_deadline: float | None = None
+    ) -> AttemptEntry:
+        """
+        Build an entry from a booking result.
+
+        Args:
+            result: Booking result
+            release_deadline: Nominal release instant on the
+                ``time.perf_counter`` timescale (timed bursts only)
+
+        Returns:
+            The entry
+        """
+        timing = result.timing
+        offset_ms = None
+        if timing is not None and release_deadline is not None:
+            sent = timing.request_sent or timing.enqueued
+            offset_ms = round((sent - release_deadline) * 1000, 3)
+        return cls(
+            resource_id=result.resource_id,
+            success=result.success,
+            wave=result.wave,
+            error_code=result.error_code.value if result.error_code else None,
+            error=result.error,
+            reference_number=result.reference_number,
+            offset_ms=offset_ms,
+            queue_time=timing.queue_time if timing else None,
+            send_time=timing.send_time if timing else None,
+            server_time=timing.server_time if timing else None,
+            total_time=timing.total_time if timing else None,
+            new_connection=timing.new_connection if timing else None,
+        )
+
+    def row(self, burst_id: str) -> tuple[Any, ...]:
+        """Values in ``ATTEMPT_COLUMNS`` order."""
+        return (
+            burst_id,
+            self.resource_id,
+            self.wave,
+            int(self.success),
+            self.error_code,
+            self.error,
+            self.reference_number,
+            self.offset_ms,
+            self.queue_time,
+            self.send_time,
+            self.server_time,
+            self.total_time,
+            None if self.new_connection is None else int(self.new_connection),
+        )
+
+
+@dataclass(frozen=True)
+class WinRate:
+    """Outcome counts of one group of attempts."""
+
+    key: str
+    attempts: int
+    wins: int
+    conflicts: int
+    too_early: int
+
+    @property
+    def rate(self) -> float:
+        """Share of attempts that booked."""
+        return self.wins / self.attempts if self.attempts else 0.0
+
+
+def bucket(value: float | None, width: float) -> float | None:
+    """Lower bound of the ``width``-wide bucket holding ``value``."""
+    if value is None:
+        return None
+    return math.floor(value / width) * width
+
+
+def connect(path: Path) -> sqlite3.Connection:
+    """
+    Open the journal, creating it if needed.
+
+    Args:
+        path: Database file
+
+    Returns:
+        Connection in WAL mode with the schema in place
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(path)
+    connection.execute("PRAGMA journal_mode=WAL")
+    # WAL keeps the database consistent; losing the last batch on power loss is fine
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.executescript(SCHEMA)
+    connection.create_function("bucket", 2, bucket, deterministic=True)
+    return connection
+
+
+def write_bursts(
+    connection: sqlite3.Connection,
+    bursts: Iterable[tuple[BurstEntry, list[AttemptEntry]]],
+) -> None:
+    """
+    Insert bursts and their attempts in one transaction.
+
+    Args:
+        connection: Journal connection
+        bursts: (burst, attempts) pairs
+    """
+    burst_rows: list[tuple[Any, ...]] = []
+    attempt_rows: list[tuple[Any, ...]] = []
+    for burst, attempts in bursts:
+        burst_rows.append(burst.row())
+        attempt_rows.extend(attempt.row(burst.id) for attempt in attempts)
+
+    with connection:
+        connection.executemany(
+            f"INSERT INTO bursts ({', '.join(BURST_COLUMNS)}) "
+            f"VALUES ({', '.join('?' * len(BURST_COLUMNS))})",
+            burst_rows,
+        )
+        connection.executemany(
+            f"INSERT INTO attempts ({', '.join(ATTEMPT_COLUMNS)}) "
+            f"VALUES ({', '.join('?' * len(ATTEMPT_COLUMNS))})",
+            attempt_rows,
+        )
+
+
+def win_rates(
+    connection: sqlite3.Connection,
+    by: str,
+    *,
+    since: date | None = None,
+    source: str | None = None,
+    bucket_ms: float = DEFAULT_BUCKET_MS,
+) -> list[WinRate]:
+    """
+    Win rate of the journaled attempts, grouped.
+
+    Args:
+        connection: Journal connection
+        by: ``resource``, ``weekday`` (of the target day) or ``offset`` (send
+            time after the release instant in ``bucket_ms`` buckets; timed
+            bursts only)
+        since: Only bursts for target days from this day on
+        source: Only bursts from this source (``burst`` or ``sniper``)
+        bucket_ms: Width of the offset buckets in milliseconds
+
+    Returns:
+        One entry per group, in key order
+
+    Raises:
+        ValueError: If ``by`` is not a known dimension
+    """
+    if by not in DIMENSIONS:
+        raise ValueError(
+            f"Unknown dimension {by!r}, expected one of {list(DIMENSIONS)}"
+        )
+    key = DIMENSIONS[by]
+    rows = connection.execute(
+        f"""
+        SELECT {key} AS key,
+               COUNT(*),
+               SUM(a.success),
+               SUM(a.error_code IS :conflict),
+               SUM(a.error_code IS :too_early)
+        FROM attempts a JOIN bursts b ON b.id = a.burst_id
+        WHERE {key} IS NOT NULL
+          AND (:since IS NULL OR b.target_date >= :since)
+          AND (:source IS NULL OR b.source = :source)
+        GROUP BY key
+        ORDER BY CAST(key AS REAL), key
+        """,
+        {
+            "conflict": ErrorCode.CONFLICT.value,
+            "too_early": ErrorCode.TOO_FAR_IN_FUTURE.value,
+            "since": since.isoformat() if since else None,
+            "source": source,
+            "bucket_ms": bucket_ms,
+        },
+    ).fetchall()
+    return [
+        WinRate(_label(by, key), attempts, wins, conflicts, too_early)
+        for key, attempts, wins, conflicts, too_early in rows
+    ]
+
+
+def _label(by: str, key: Any) -> str:
+    if by == "weekday":
+        return str(calendar.day_abbr[key])
+    if by == "offset":
+        return f"{key:+g}ms"
+    return str(key)
+
+
+class AttemptJournal:
+    """Queues bursts and writes them to the journal on a background thread."""
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+    ) -> None:
+        """
+        Create a journal (the database is opened by the first write).
+
+        Args:
+            path: Database file
+            batch_size: Most bursts written per transaction
+            flush_interval: Seconds to collect further bursts before writing
+        """
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: queue.SimpleQueue[Any] = queue.SimpleQueue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def record(self, burst: BurstEntry, attempts: Iterable[AttemptEntry]) -> None:
+        """
+        Queue a burst for writing (never blocks).
+
+        Args:
+            burst: The burst
+            attempts: Its attempts
+        """
+        self._start()
+        self._queue.put((burst, list(attempts)))
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """
+        Wait until everything queued so far is written.
+
+        Args:
+            timeout: Seconds to wait at most
+
+        Returns:
+            True if the queue was drained in time, False on timeout or if the
+            writer thread is gone
+        """
+        thread = self._thread
+        if thread is None:
+            return True
+        written = threading.Event()
+        self._queue.put(written)
+        wait_until = None if timeout is None else time.monotonic() + timeout
+        while thread.is_alive():
+            wait = FLUSH_CHECK_INTERVAL
+            if wait_until is not None:
+                wait = min(wait, wait_until - time.monotonic())
+                if wait <= 0:
+                    return False
+            if written.wait(wait):
+                return True
+        return written.is_set()
+
+    def close(self) -> None:
+        """Write what is queued and stop the writer thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join()
+
+    def _start(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="attempt-journal", daemon=True
+                )
+                self._thread.start()
+                atexit.register(self.close)
+
+    def _run(self) -> None:
+        connection: sqlite3.Connection | None = None
+        running = True
+        while running:
+            items = [self._queue.get()]
+            collect_until = time.monotonic() + self.flush_interval
+            # Flush and stop markers end the batch
+            while len(items) < self.batch_size and isinstance(items[-1], tuple):
+                remaining = collect_until - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    items.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            bursts = [item for item in items if isinstance(item, tuple)]
+            if bursts:
+                try:
+                    connection = connection or connect(self.path)
+                    write_bursts(connection, bursts)
+                except Exception:
+                    # Any failure loses the batch, never the writer thread
+                    logger.exception(f"Could not journal {len(bursts)} bursts")
+
+            for item in items:
+                if isinstance(item, threading.Event):
+                    item.set()
+                elif item is None:
+                    running = False
+
+        if connection is not None:
+            connection.close()
+
+
+def format_win_rates(rates: list[WinRate], by: str) -> str:
+    """
+    Render win rates as a table.
+
+    Args:
+        rates: Output of ``win_rates``
+        by: Dimension the rates are grouped by
+
+    Returns:
+        The table
+    """
+    header = (
+        f"{by:>10} {'attempts':>9} {'wins':>6} {'rate':>7} "
+        f"{'conflict':>9} {'too early':>10}"
+    )
+    lines = [header]
+    for rate in rates:
+        lines.append(
+            f"{rate.key:>10} {rate.attempts:>9} {rate.wins:>6} {rate.rate:>7.1%} "
+            f"{rate.conflicts:>9} {rate.too_early:>10}"
+        )
+    return "\n".join(lines)
+
+
+def main() -> None:
+    """Print win rates from the journal."""
+    parser = argparse.ArgumentParser(description="Win rates from the attempt journal")
+    parser.add_argument("by", choices=list(DIMENSIONS), help="grouping")
+    parser.add_argument(
+        "--since",
+        type=date.fromisoformat,
+        default=None,
+        help="only target days from this day on (YYYY-MM-DD)",
+    )
+    parser.add_argument(
+        "--source",
+        choices=["burst", "sniper"],
+        default=None,
+        help="only bursts from this source",
+    )
+    parser.add_argument(
+        "--bucket-ms",
+        type=float,
+        default=DEFAULT_BUCKET_MS,
+        help="width of the offset buckets",
+    )
+    parser.add_argument("--db", type=Path, default=journal_path, help="journal file")
+    args = parser.parse_args()
+
+    if not args.db.exists():
+        raise SystemExit(f"No journal at {args.db}")
+    connection = connect(args.db)
+    try:
+        rates = win_rates(
+            connection,
+            args.by,
+            since=args.since,
+            source=args.source,
+            bucket_ms=args.bucket_ms,
+        )
+    finally:
+        connection.close()
+
+    if not rates:
+        raise SystemExit("No matching attempts in the journal")
+    print(format_win_rates(rates, args.by))
+
+
+if __name__ == "__main__":
+    main()
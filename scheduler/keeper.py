@@ -0,0 +1,145 @@
+"""
+Background session keeper.
+
+Keeps the cached session usable so that a booking burst never has to log in
+at the critical moment. Every check probes the cached session with a cheap
+authenticated request (which also keeps the server-side session active) and
+re-authenticates when the probe fails or the session approaches
+``CACHE_EXPIRY_HOURS``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+
+from scheduler.amain import (
+    AuthenticationError,
+    booking_details,
+    cache_session_data,
+    create_fresh_session,
+    create_http_client,
+    probe_session,
+    session_store,
+)
+from scheduler.config import BookingConstants
+from scheduler.metrics import metrics_endpoint
+
+logger = logging.getLogger(__name__)
+
+
+class SessionKeeper:
+    """Periodically validates and proactively refreshes the cached session."""
+
+    def __init__(
+        self,
+        *,
+        check_interval: float = BookingConstants.SESSION_CHECK_INTERVAL_SECONDS,
+        max_age: float = (
+            BookingConstants.CACHE_EXPIRY_HOURS * 60 * 60
+            - BookingConstants.SESSION_REFRESH_MARGIN_SECONDS
+        ),
+    ) -> None:
+        """
+        Create a keeper.
+
+        Args:
+            check_interval: Seconds between checks
+            max_age: Session age in seconds after which it is refreshed
+                regardless of whether it still works
+        """
+        self.check_interval = check_interval
+        self.max_age = max_age
+
+    async def refresh(self) -> None:
+        """
+        Establish a new session and cache it.
+
+        Raises:
+            AuthenticationError: If authentication fails
+        """
+        client, _ = await create_fresh_session()
+        await client.aclose()
+        logger.info("🔑 Session refreshed")
+
+    async def check_once(self) -> bool:
+        """
+        Validate the cached session and refresh it if needed.
+
+        Returns:
+            True if the session was refreshed
+        """
+        # One record, so the write-back below cannot mix two sessions
+        record = session_store.load()
+
+        if record is None:
+            logger.info("No cached session - authenticating")
+            await self.refresh()
+            return True
+
+        age = time.time() - record.created_at
+        if age > self.max_age:
+            logger.info(f"Session is {age / 3600:.1f}h old - refreshing proactively")
+            await self.refresh()
+            return True
+
+        client = create_http_client()
+        try:
+            client.headers.update(record.headers)
+            client.cookies.update(record.cookies)
+            probed_token = await probe_session(client)
+        finally:
+            await client.aclose()
+
+        if not probed_token:
+            logger.info("Cached session rejected by server - refreshing")
+            await self.refresh()
+            return True
+
+        if probed_token != record.csrf_token:
+            logger.info("Server rotated the CSRF token - updating cache")
+            cache_session_data(
+                record.headers,
+                record.cookies,
+                probed_token,
+                created_at=record.created_at,
+            )
+
+        logger.debug(f"Session valid ({age / 60:.0f} min old)")
+        return False
+
+    async def run(self, stop: asyncio.Event | None = None) -> None:
+        """
+        Run checks until ``stop`` is set.
+
+        Args:
+            stop: Event that ends the loop (runs forever if None)
+        """
+        stop = stop or asyncio.Event()
+        while not stop.is_set():
+            try:
+                await self.check_once()
+            except AuthenticationError as e:
+                logger.error(f"Session refresh failed, retrying next check: {e}")
+            except Exception:
+                logger.exception("Unexpected error in session keeper")
+
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=self.check_interval)
+            except TimeoutError:
+                pass
+
+
+def main() -> None:
+    """Synchronous entry point running the keeper as a daemon."""
+
+    async def serve_and_keep() -> None:
+        async with metrics_endpoint(booking_details.keeper_metrics_port):
+            await SessionKeeper().run()
+
+    asyncio.run(serve_and_keep())
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,7 @@ import pyotp
 import requests
 from bs4 import BeautifulSoup
 from scheduler.config import LoginDetails, BookingDetails
+from scheduler.errors import classify_server_errors
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -343,7 +344,8 @@ def create_reservation(
                 if resp_json.get("data").get("success"):
                     return True
             if error := resp_json.get("data").get("errors"):
-                logger.warning(error)
+                failure = classify_server_errors(error)
+                logger.warning(f"[{failure.code.value}] {error}")
         except Exception as e:
             logger.exception(f"Error parsing create reservation response as JSON: {e}")
             return False
@@ -353,11 +355,6 @@ def create_reservation(
 
     return False
 
-    # TODO(Andy): error messages:
-    # 1.["Die Reservierung liegt zu weit in der Zukunft. Der sp\u00e4teste Zeitpunkt ist 19\/05\/2025 23:59:00."]
-    # 2.       "Es ist nur eine Reservierung zur selben Zeit m\u00f6glich.\n20/05/2025\n"
-    # 3.       "Es gibt in Konflikt stehende Reservierungen an folgenden Tagen:\n20/05/2025"
-
 
 def update_reservation(
     session: requests.Session,
@@ -0,0 +1,442 @@
+"""
+Minimal Prometheus-style metrics for the booker.
+
+Counters, gauges and histograms render to the Prometheus text exposition
+format and can be served from a small local HTTP endpoint. Everything runs on
+a single event loop, so updates are plain attribute writes - no locks. Label
+children are bound once (``labels(...)`` returns the same child every time),
+and the booking code records a burst only after it has completed, keeping the
+burst itself free of metrics work.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import logging
+import math
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Callable, Iterable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import TypeVar
+
+from scheduler.config import BookingConstants
+
+logger = logging.getLogger(__name__)
+
+M = TypeVar("M", bound="_Metric")
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SPREAD_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class _Metric(ABC):
+    """Common parts of a metric family with optional labels."""
+
+    kind = ""
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Iterable[str] = ()
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple[str, ...], object] = {}
+
+    def _child_for(self, values: tuple[str, ...]) -> object:
+        if len(values) != len(self.labelnames):
+            raise ValueError(
+                f"{self.name} expects labels {self.labelnames}, got {values}"
+            )
+        child = self._children.get(values)
+        if child is None:
+            child = self._children[values] = self._new_child()
+        return child
+
+    @abstractmethod
+    def _new_child(self) -> object: ...
+
+    def render(self) -> list[str]:
+        """Exposition lines for this family."""
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        for values, child in self._children.items():
+            lines.extend(self._render_child(values, child))
+        return lines
+
+    @abstractmethod
+    def _render_child(self, values: tuple[str, ...], child: object) -> list[str]: ...
+
+
+class CounterChild:
+    """One labelled counter value, optionally read from a callback at scrape time."""
+
+    __slots__ = ("function", "value")
+
+    def __init__(self) -> None:
+        self.value = 0.0
+        self.function: Callable[[], float] | None = None
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increase the counter."""
+        self.value += amount
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Read the value from ``function`` (which must never decrease)."""
+        self.function = function
+
+    def get(self) -> float:
+        """Current value."""
+        return self.function() if self.function else self.value
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    kind = "counter"
+
+    def labels(self, *values: str) -> CounterChild:
+        """Child for the given label values (created once, then reused)."""
+        child = self._child_for(values)
+        assert isinstance(child, CounterChild)
+        return child
+
+    def _new_child(self) -> CounterChild:
+        return CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increase an unlabelled counter."""
+        self.labels().inc(amount)
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Read an unlabelled counter from ``function`` at scrape time."""
+        self.labels().set_function(function)
+
+    def _render_child(self, values: tuple[str, ...], child: object) -> list[str]:
+        assert isinstance(child, CounterChild)
+        labels = _format_labels(self.labelnames, values)
+        return [f"{self.name}{labels} {_format_value(child.get())}"]
+
+
+class GaugeChild:
+    """One labelled gauge value, optionally read from a callback at scrape time."""
+
+    __slots__ = ("function", "value")
+
+    def __init__(self) -> None:
+        self.value = 0.0
+        self.function: Callable[[], float] | None = None
+
+    def set(self, value: float) -> None:
+        """Set the gauge."""
+        self.value = value
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Read the value from ``function`` whenever the gauge is rendered."""
+        self.function = function
+
+    def get(self) -> float:
+        """Current value."""
+        return self.function() if self.function else self.value
+
+
+class Gauge(_Metric):
+    """Value that can go up and down."""
+
+    kind = "gauge"
+
+    def labels(self, *values: str) -> GaugeChild:
+        """Child for the given label values (created once, then reused)."""
+        child = self._child_for(values)
+        assert isinstance(child, GaugeChild)
+        return child
+
+    def _new_child(self) -> GaugeChild:
+        return GaugeChild()
+
+    def set(self, value: float) -> None:
+        """Set an unlabelled gauge."""
+        self.labels().set(value)
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Read an unlabelled gauge from ``function`` at scrape time."""
+        self.labels().set_function(function)
+
+    def _render_child(self, values: tuple[str, ...], child: object) -> list[str]:
+        assert isinstance(child, GaugeChild)
+        labels = _format_labels(self.labelnames, values)
+        return [f"{self.name}{labels} {_format_value(child.get())}"]
+
+
+class HistogramChild:
+    """One labelled histogram."""
+
+    __slots__ = ("buckets", "count", "counts", "sum")
+
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """Record one observation."""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Histogram(_Metric):
+    """Distribution of observations in cumulative buckets."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        *,
+        buckets: Iterable[float] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def labels(self, *values: str) -> HistogramChild:
+        """Child for the given label values (created once, then reused)."""
+        child = self._child_for(values)
+        assert isinstance(child, HistogramChild)
+        return child
+
+    def _new_child(self) -> HistogramChild:
+        return HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        """Record an observation on an unlabelled histogram."""
+        self.labels().observe(value)
+
+    def _render_child(self, values: tuple[str, ...], child: object) -> list[str]:
+        assert isinstance(child, HistogramChild)
+        names = self.labelnames + ("le",)
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (math.inf,), child.counts):
+            cumulative += count
+            labels = _format_labels(names, values + (_format_value(bound),))
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _format_labels(self.labelnames, values)
+        lines.append(f"{self.name}_sum{labels} {_format_value(child.sum)}")
+        lines.append(f"{self.name}_count{labels} {child.count}")
+        return lines
+
+
+class Registry:
+    """Collection of metric families rendered together."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: M) -> M:
+        """
+        Add a metric family.
+
+        Args:
+            metric: Metric family to add
+
+        Returns:
+            The metric, for assignment at module level
+
+        Raises:
+            ValueError: If a family with the same name is already registered
+        """
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} already registered")
+        self._metrics[metric.name] = metric
+        if not metric.labelnames:
+            metric._child_for(())  # Unlabelled metrics report 0 before first use
+        return metric
+
+    def render(self) -> str:
+        """Full exposition text."""
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    """Tiny HTTP endpoint serving a registry on ``/metrics``."""
+
+    def __init__(
+        self, registry: Registry, *, host: str = BookingConstants.METRICS_HOST
+    ) -> None:
+        """
+        Create a server (call ``start`` to listen).
+
+        Args:
+            registry: Metrics to serve
+            host: Interface to bind (local only by default)
+        """
+        self.registry = registry
+        self.host = host
+        self.port = 0
+        self._server: asyncio.Server | None = None
+
+    async def start(self, port: int = 0) -> None:
+        """Listen on ``port`` (0 picks a free one, see ``self.port``)."""
+        self._server = await asyncio.start_server(self._handle, self.host, port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info(f"📈 Metrics on http://{self.host}:{self.port}/metrics")
+
+    async def stop(self) -> None:
+        """Stop listening."""
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            request_line = await reader.readline()
+            while await reader.readline() not in (b"\r\n", b"\n", b""):
+                pass
+
+            parts = request_line.decode("latin-1").split()
+            if len(parts) >= 2 and parts[0] == "GET" and parts[1] == "/metrics":
+                status, body = "200 OK", self.registry.render().encode()
+            else:
+                status, body = "404 Not Found", b"Not Found\n"
+
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: {CONTENT_TYPE}\r\n"
+                f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode()
+                + body
+            )
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+@asynccontextmanager
+async def metrics_endpoint(
+    port: int | None, registry: Registry | None = None
+) -> AsyncIterator[MetricsServer | None]:
+    """
+    Serve metrics for the duration of the block.
+
+    Args:
+        port: Port to listen on; no endpoint is started if None
+        registry: Metrics to serve (defaults to ``REGISTRY``)
+
+    Yields:
+        The running server, or None if disabled
+    """
+    if port is None:
+        yield None
+        return
+
+    server = MetricsServer(registry or REGISTRY)
+    await server.start(port)
+    try:
+        yield server
+    finally:
+        await server.stop()
+
+
+@dataclass(frozen=True)
+class ResourceCounters:
+    """Pre-bound per-resource counter children."""
+
+    attempts: CounterChild
+    successes: CounterChild
+
+
+def bind_resource(resource_id: str) -> ResourceCounters:
+    """Bind the per-resource counters for one resource."""
+    return ResourceCounters(
+        attempts=booking_attempts.labels(resource_id),
+        successes=booking_successes.labels(resource_id),
+    )
+
+
+REGISTRY = Registry()
+
+booking_attempts = REGISTRY.register(
+    Counter("booker_booking_attempts_total", "Reservation requests sent", ["resource"])
+)
+booking_successes = REGISTRY.register(
+    Counter("booker_booking_successes_total", "Confirmed reservations", ["resource"])
+)
+booking_errors = REGISTRY.register(
+    Counter(
+        "booker_booking_errors_total",
+        "Failed reservation requests by error class",
+        ["resource", "error_class"],
+    )
+)
+request_latency = REGISTRY.register(
+    Histogram(
+        "booker_request_latency_seconds",
+        "Reservation request latency from enqueue to complete response",
+    )
+)
+burst_spread = REGISTRY.register(
+    Histogram(
+        "booker_burst_spread_seconds",
+        "Time between the first and last request of a burst leaving the client",
+        buckets=SPREAD_BUCKETS,
+    )
+)
+bursts = REGISTRY.register(Counter("booker_bursts_total", "Booking bursts fired"))
+wave_requests = REGISTRY.register(
+    Counter(
+        "booker_wave_requests_total",
+        "Reservation requests per burst wave by outcome",
+        ["wave", "outcome"],
+    )
+)
+wave_lateness = REGISTRY.register(
+    Histogram(
+        "booker_wave_lateness_seconds",
+        "Delay between a wave's target instant and its release",
+        ["wave"],
+        buckets=SPREAD_BUCKETS,
+    )
+)
+session_refreshes = REGISTRY.register(
+    Counter("booker_session_refreshes_total", "Fresh logins")
+)
+session_cache_hits = REGISTRY.register(
+    Counter("booker_session_cache_hits_total", "Session loads served from memory")
+)
+session_cache_misses = REGISTRY.register(
+    Counter("booker_session_cache_misses_total", "Session loads that read the record")
+)
+session_cache_hit_ratio = REGISTRY.register(
+    Gauge("booker_session_cache_hit_ratio", "Share of session loads served from memory")
+)
@@ -0,0 +1,193 @@
+"""
+Per-resource booking statistics and win-probability ranking.
+
+Not every seat in ``PREFERRED_RANGE`` is equally contested. Every booking
+result updates the statistics of its resource - contested attempts, wins,
+conflicts and response latency - kept in the persistent cache. Counts decay
+by ``decay`` per recorded burst so the model follows changing habits over
+the weeks.
+
+Only wins and conflicts say something about a seat; answers such as "too far
+in the future" or network errors would have been the same for any seat and
+are not counted as attempts. The win probability is the posterior mean of a
+Beta prior (``prior_wins`` and ``prior_losses``), so seats without history
+rank between proven and contested ones.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING
+
+from diskcache import Cache
+
+from scheduler.errors import ErrorCode
+
+if TYPE_CHECKING:
+    from scheduler.amain import BookingResult
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DECAY = 0.95
+DEFAULT_PRIOR_WINS = 1.0
+DEFAULT_PRIOR_LOSSES = 1.0
+
+
+@dataclass
+class ResourceStats:
+    """Decayed outcome counts of one resource."""
+
+    attempts: float = 0.0
+    wins: float = 0.0
+    conflicts: float = 0.0
+    latency_sum: float = 0.0
+    latency_count: int = 0
+
+    @property
+    def conflict_rate(self) -> float:
+        """Share of contested attempts lost to someone else."""
+        return self.conflicts / self.attempts if self.attempts else 0.0
+
+    @property
+    def mean_latency(self) -> float | None:
+        """Mean response latency in seconds."""
+        if not self.latency_count:
+            return None
+        return self.latency_sum / self.latency_count
+
+    def win_probability(
+        self,
+        prior_wins: float = DEFAULT_PRIOR_WINS,
+        prior_losses: float = DEFAULT_PRIOR_LOSSES,
+    ) -> float:
+        """
+        Estimated chance that a request for this resource books it.
+
+        Args:
+            prior_wins: Pseudo-wins of the Beta prior
+            prior_losses: Pseudo-losses of the Beta prior
+
+        Returns:
+            Posterior mean win probability
+        """
+        return (self.wins + prior_wins) / (self.attempts + prior_wins + prior_losses)
+
+    def decay(self, factor: float) -> None:
+        """Fade the outcome counts (latencies are kept as they are)."""
+        self.attempts *= factor
+        self.wins *= factor
+        self.conflicts *= factor
+
+
+class ResourceStatsStore:
+    """Statistics of all resources, kept in the persistent cache."""
+
+    CACHE_KEY = "resource_stats"
+
+    def __init__(
+        self,
+        cache: Cache,
+        *,
+        decay: float = DEFAULT_DECAY,
+        prior_wins: float = DEFAULT_PRIOR_WINS,
+        prior_losses: float = DEFAULT_PRIOR_LOSSES,
+    ) -> None:
+        """
+        Create a store.
+
+        Args:
+            cache: Persistent cache holding the statistics
+            decay: Factor applied to all counts per recorded burst
+            prior_wins: Pseudo-wins of the Beta prior
+            prior_losses: Pseudo-losses of the Beta prior
+        """
+        self.cache = cache
+        self.decay = decay
+        self.prior_wins = prior_wins
+        self.prior_losses = prior_losses
+
+    def load(self) -> dict[str, ResourceStats]:
+        """
+        Get the statistics by resource id.
+
+        Returns:
+            The statistics (empty if none or the cache entry is invalid)
+        """
+        data = self.cache.get(self.CACHE_KEY) or {}
+        try:
+            return {
+                str(resource_id): ResourceStats(**stats)
+                for resource_id, stats in data.items()
+            }
+        except (AttributeError, TypeError):
+            logger.warning("Cached resource statistics are invalid - ignoring them")
+            return {}
+
+    def record(self, results: Iterable[BookingResult]) -> None:
+        """
+        Update the statistics from the results of one burst.
+
+        Args:
+            results: Booking results
+        """
+        results = list(results)
+        if not results:
+            return
+
+        stats = self.load()
+        for entry in stats.values():
+            entry.decay(self.decay)
+
+        for result in results:
+            entry = stats.setdefault(result.resource_id, ResourceStats())
+            if result.success:
+                entry.attempts += 1
+                entry.wins += 1
+            elif result.error_code is ErrorCode.CONFLICT:
+                entry.attempts += 1
+                entry.conflicts += 1
+            if result.timing is not None and result.timing.total_time is not None:
+                entry.latency_sum += result.timing.total_time
+                entry.latency_count += 1
+
+        self.cache.set(
+            self.CACHE_KEY,
+            {resource_id: asdict(entry) for resource_id, entry in stats.items()},
+        )
+
+    def win_probabilities(self, resource_ids: Iterable[str]) -> dict[str, float]:
+        """
+        Estimated win probability of every resource.
+
+        Args:
+            resource_ids: Resources to estimate
+
+        Returns:
+            Probability by resource id (the prior mean for unknown resources)
+        """
+        stats = self.load()
+        return {
+            resource_id: stats.get(resource_id, ResourceStats()).win_probability(
+                self.prior_wins, self.prior_losses
+            )
+            for resource_id in resource_ids
+        }
+
+    def rank(self, resource_ids: Iterable[str]) -> list[str]:
+        """
+        Order resources by estimated win probability, most likely first.
+
+        Ties keep their order, so without history the preference order is
+        unchanged.
+
+        Args:
+            resource_ids: Resources in order of preference
+
+        Returns:
+            Reordered resource ids
+        """
+        resource_ids = list(resource_ids)
+        probabilities = self.win_probabilities(resource_ids)
+        return sorted(resource_ids, key=lambda r: -probabilities[r])
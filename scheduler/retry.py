@@ -0,0 +1,199 @@
+"""
+Async retry scheduling for booking rounds.
+
+A ``RetryPolicy`` describes when another round is worth it and how long to
+wait before it: fixed or exponential backoff (optionally with jitter), a
+cap on the number of retries, an optional overall deadline and the error
+codes that justify a retry. A ``RetryScheduler`` applies a policy to one
+run of rounds and waits with ``asyncio.sleep``, so keep-alive, metrics and
+other tasks on the event loop keep running in between.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass, field
+
+from scheduler.errors import ACTIONS, ErrorAction, ErrorCode
+
+logger = logging.getLogger(__name__)
+
+# Codes after which the same request can succeed later
+RETRYABLE_CODES = frozenset(
+    code for code, action in ACTIONS.items() if action is ErrorAction.RETRY
+)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    When to retry and how long to wait.
+
+    The delay before retry ``n`` (starting at 1) is
+    ``delay * multiplier ** (n - 1)``, capped at ``max_delay`` and spread by
+    up to ``±jitter`` of itself. A ``multiplier`` of 1 gives a fixed delay.
+    """
+
+    max_retries: int = 1
+    delay: float = 30.0
+    multiplier: float = 1.0
+    max_delay: float | None = None
+    jitter: float = 0.0
+    # Seconds from the end of the first attempt after which no retry is started
+    deadline: float | None = None
+    retry_on: frozenset[ErrorCode] = field(default=RETRYABLE_CODES)
+
+    @classmethod
+    def fixed(
+        cls,
+        delay: float,
+        max_retries: int = 1,
+        *,
+        jitter: float = 0.0,
+        deadline: float | None = None,
+        retry_on: frozenset[ErrorCode] = RETRYABLE_CODES,
+    ) -> RetryPolicy:
+        """Constant delay between attempts."""
+        return cls(
+            max_retries=max_retries,
+            delay=delay,
+            jitter=jitter,
+            deadline=deadline,
+            retry_on=retry_on,
+        )
+
+    @classmethod
+    def exponential(
+        cls,
+        delay: float,
+        max_retries: int = 5,
+        *,
+        multiplier: float = 2.0,
+        max_delay: float | None = None,
+        jitter: float = 0.2,
+        deadline: float | None = None,
+        retry_on: frozenset[ErrorCode] = RETRYABLE_CODES,
+    ) -> RetryPolicy:
+        """Delay growing by ``multiplier`` per retry, with jitter."""
+        return cls(
+            max_retries=max_retries,
+            delay=delay,
+            multiplier=multiplier,
+            max_delay=max_delay,
+            jitter=jitter,
+            deadline=deadline,
+            retry_on=retry_on,
+        )
+
+    def delay_for(self, retry: int, rng: random.Random | None = None) -> float:
+        """
+        Delay before a retry.
+
+        Args:
+            retry: Number of the retry (1 for the first)
+            rng: Source of jitter
+
+        Returns:
+            Seconds to wait (never negative)
+        """
+        delay = self.delay * self.multiplier ** (retry - 1)
+        if self.max_delay is not None:
+            delay = min(delay, self.max_delay)
+        if self.jitter:
+            delay *= 1 + (rng or random).uniform(-self.jitter, self.jitter)
+        return max(0.0, delay)
+
+    def is_retryable(self, codes: Iterable[ErrorCode | None]) -> bool:
+        """
+        Whether a failed round is worth repeating.
+
+        Args:
+            codes: Error codes of the round's failures
+
+        Returns:
+            True if any failure is retryable, or if there were no classified
+            failures at all
+        """
+        known = [code for code in codes if code is not None]
+        return not known or any(code in self.retry_on for code in known)
+
+
+class RetryScheduler:
+    """Applies a policy to one run of attempts."""
+
+    def __init__(
+        self,
+        policy: RetryPolicy,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[object]] = asyncio.sleep,
+        rng: random.Random | None = None,
+    ) -> None:
+        """
+        Create a scheduler.
+
+        The deadline counts from the end of the first attempt, not from here:
+        a timed run may wait hours for its release before attempting at all.
+
+        Args:
+            policy: Retry policy
+            clock: Monotonic clock in seconds
+            sleep: Coroutine used to wait between attempts
+            rng: Source of jitter
+        """
+        self.policy = policy
+        self.clock = clock
+        self.sleep = sleep
+        self.rng = rng or random.Random()
+        self.started_at: float | None = None
+        self.attempt = 1
+
+    def start(self) -> None:
+        """Start the deadline clock (only the first call counts)."""
+        if self.started_at is None:
+            self.started_at = self.clock()
+
+    @property
+    def attempts_allowed(self) -> int:
+        """Total number of attempts the policy allows."""
+        return self.policy.max_retries + 1
+
+    async def next_attempt(
+        self, codes: Iterable[ErrorCode | None] = (), *, immediate: bool = False
+    ) -> bool:
+        """
+        Decide on another attempt and wait for it without blocking the loop.
+
+        Args:
+            codes: Error codes of the failed attempt (checked against
+                ``retry_on``)
+            immediate: Retry without the backoff delay (e.g. after a session
+                refresh)
+
+        Returns:
+            True if another attempt should be made
+        """
+        self.start()
+        if self.attempt > self.policy.max_retries:
+            logger.info(f"No retries left after {self.attempt} attempts")
+            return False
+        if not self.policy.is_retryable(codes):
+            logger.info("Failures are not retryable - giving up")
+            return False
+
+        delay = 0.0 if immediate else self.policy.delay_for(self.attempt, self.rng)
+        if self.policy.deadline is not None and self.started_at is not None:
+            remaining = self.policy.deadline - (self.clock() - self.started_at)
+            if delay >= remaining:
+                logger.info("Retry deadline reached - giving up")
+                return False
+
+        if delay:
+            logger.info(f"⏳ Retrying in {delay:.1f}s")
+            await self.sleep(delay)
+        self.attempt += 1
+        return True
@@ -0,0 +1,179 @@
+"""
+Session record storage: one atomic disk entry fronted by an in-process cache.
+
+Headers, cookies and CSRF token are stored together as a single record, so a
+reader can never combine parts of two different sessions. A separate version
+counter is bumped on every write; readers keep the last record in memory,
+look at the version on disk at most every ``check_interval`` seconds and only
+read the record again when the version has moved.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import time
+from dataclasses import dataclass, field, replace
+from typing import Any
+
+from diskcache import Cache
+
+logger = logging.getLogger(__name__)
+
+# Seconds a hot copy is served before the version on disk is checked again
+DEFAULT_CHECK_INTERVAL = 5.0
+
+
+@dataclass(frozen=True)
+class SessionRecord:
+    """Everything needed to resume an authenticated session."""
+
+    headers: dict[str, str]
+    cookies: dict[str, str]
+    csrf_token: str
+    created_at: float = field(default_factory=time.time)
+    version: int = 0
+
+    def is_valid(self) -> bool:
+        """Check field types (records may come from an older version on disk)."""
+        return (
+            isinstance(self.headers, dict)
+            and isinstance(self.cookies, dict)
+            and isinstance(self.csrf_token, str)
+            and bool(self.headers and self.cookies and self.csrf_token)
+            and all(isinstance(value, str) for value in self.cookies.values())
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Plain representation for the cache."""
+        return {
+            "headers": self.headers,
+            "cookies": self.cookies,
+            "csrf_token": self.csrf_token,
+            "created_at": self.created_at,
+            "version": self.version,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> SessionRecord:
+        """
+        Rebuild a record from ``to_dict`` output.
+
+        Raises:
+            KeyError, TypeError, ValueError: If the data is malformed
+        """
+        return cls(
+            headers=data["headers"],
+            cookies=data["cookies"],
+            csrf_token=data["csrf_token"],
+            created_at=float(data["created_at"]),
+            version=int(data["version"]),
+        )
+
+
+class SessionStore:
+    """Versioned session record in diskcache with an in-memory hot copy."""
+
+    RECORD_KEY = "session_record"
+    VERSION_KEY = "session_record_version"
+
+    def __init__(
+        self,
+        cache: Cache,
+        *,
+        max_age: float,
+        check_interval: float = DEFAULT_CHECK_INTERVAL,
+    ) -> None:
+        """
+        Create a store.
+
+        Args:
+            cache: Persistent cache to store the record in
+            max_age: Seconds after ``created_at`` at which a record expires
+            check_interval: Seconds the in-memory copy is served without
+                looking at the disk (writes by other processes are seen
+                this late at most)
+        """
+        self.cache = cache
+        self.max_age = max_age
+        self.check_interval = check_interval
+        self.hits = 0
+        self.misses = 0
+        self._hot: SessionRecord | None = None
+        self._checked_at = -math.inf
+
+    @property
+    def hit_ratio(self) -> float:
+        """Share of loads answered from the in-memory copy."""
+        loads = self.hits + self.misses
+        return self.hits / loads if loads else 0.0
+
+    def save(self, record: SessionRecord) -> SessionRecord:
+        """
+        Store a record atomically and bump the version.
+
+        Args:
+            record: Session record to store
+
+        Returns:
+            The stored record with its new version
+        """
+        remaining = self.max_age - (time.time() - record.created_at)
+        with self.cache.transact():
+            version = self.cache.incr(self.VERSION_KEY, default=0)
+            record = replace(record, version=version)
+            self.cache.set(self.RECORD_KEY, record.to_dict(), expire=remaining)
+        self._hot = record if record.is_valid() else None
+        self._checked_at = time.monotonic()
+        return record
+
+    def load(self) -> SessionRecord | None:
+        """
+        Load the current record.
+
+        The in-memory copy is served without touching the disk for
+        ``check_interval`` seconds; after that only the version counter is
+        read while it is still current.
+
+        Returns:
+            The record, or None if there is no valid, unexpired record
+        """
+        hot = self._hot
+        if hot is not None and not self._expired(hot):
+            now = time.monotonic()
+            if now - self._checked_at < self.check_interval:
+                self.hits += 1
+                return hot
+            if self.cache.get(self.VERSION_KEY) == hot.version:
+                self._checked_at = now
+                self.hits += 1
+                return hot
+
+        self.misses += 1
+        self._hot = None
+        data = self.cache.get(self.RECORD_KEY)
+        if data is None:
+            return None
+        try:
+            record = SessionRecord.from_dict(data)
+        except (KeyError, TypeError, ValueError):
+            record = None
+        if record is None or not record.is_valid():
+            logger.warning("Cached session record is invalid - ignoring it")
+            return None
+        if self._expired(record):
+            return None
+
+        self._hot = record
+        self._checked_at = time.monotonic()
+        return record
+
+    def clear(self) -> None:
+        """Drop the stored record (the version keeps counting)."""
+        with self.cache.transact():
+            self.cache.incr(self.VERSION_KEY, default=0)
+            self.cache.delete(self.RECORD_KEY)
+        self._hot = None
+
+    def _expired(self, record: SessionRecord) -> bool:
+        return time.time() - record.created_at >= self.max_age
@@ -0,0 +1,320 @@
+"""
+Cancellation sniper.
+
+Seats freed by cancellations after the release burst are lost to a booker
+that runs once and exits. The sniper keeps an authenticated session, polls
+the schedule of the target day and, as soon as a resource of
+``PREFERRED_RANGE`` is free for the slot, fires reservations at every free
+one (the first success wins).
+
+Polls share the delta feed of ``poll_schedule``: a ``LAST_REFRESH`` delta
+lists new and changed reservations, and the full listing requested every
+``SCHEDULE_FULL_REFRESH_SECONDS`` drops removed ones. Seats listed free but
+taken in the meantime fail fast and are skipped until the schedule changes.
+
+The polling interval adapts: it shrinks as the slot approaches and while the
+schedule churns (seats being freed or taken), and relaxes towards
+``SNIPE_MAX_INTERVAL_SECONDS`` when nothing happens.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+
+import httpx
+
+from scheduler import amain
+from scheduler.amain import (
+    OWNER_ID,
+    PREFERRED_RANGE,
+    AuthenticationError,
+    BookingRequest,
+    BookingResult,
+    SessionExpiredError,
+    authenticated_session,
+    booking_details,
+    calculate_booking_times,
+    create_single_reservation,
+    poll_schedule,
+    record_burst_metrics,
+    wait_for_first_success,
+)
+from scheduler.config import BookingConstants
+from scheduler.errors import ErrorAction, ErrorCode
+from scheduler.metrics import metrics_endpoint
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PollPacer:
+    """
+    Adaptive polling interval.
+
+    Far from the slot the interval is ``max_interval``; within ``ramp``
+    seconds of the slot it shrinks linearly towards ``min_interval``. Churn
+    (an exponentially weighted average of changes per poll) divides the
+    interval further, so a busy schedule is watched more closely.
+    """
+
+    min_interval: float = BookingConstants.SNIPE_MIN_INTERVAL_SECONDS
+    max_interval: float = BookingConstants.SNIPE_MAX_INTERVAL_SECONDS
+    ramp: float = BookingConstants.SNIPE_RAMP_SECONDS
+    decay: float = 0.8
+    churn: float = 0.0
+
+    def observe(self, changes: int) -> None:
+        """Record the number of resources that changed state in one poll."""
+        self.churn = self.decay * self.churn + (1 - self.decay) * changes
+
+    def interval(self, seconds_to_slot: float) -> float:
+        """
+        Seconds to wait before the next poll.
+
+        Args:
+            seconds_to_slot: Time until the slot starts
+
+        Returns:
+            Interval between ``min_interval`` and ``max_interval``
+        """
+        urgency = min(1.0, max(seconds_to_slot, 0.0) / self.ramp)
+        base = self.min_interval + (self.max_interval - self.min_interval) * urgency
+        return max(self.min_interval, base / (1 + self.churn))
+
+
+class CancellationSniper:
+    """Watches the schedule for freed seats and books one immediately."""
+
+    def __init__(
+        self,
+        target_date: date,
+        resource_ids: list[str] | None = None,
+        *,
+        pacer: PollPacer | None = None,
+        max_poll_failures: int = 3,
+    ) -> None:
+        """
+        Create a sniper.
+
+        Args:
+            target_date: Day of the slot
+            resource_ids: Resources in order of preference (defaults to
+                ``PREFERRED_RANGE``)
+            pacer: Polling interval policy
+            max_poll_failures: Consecutive failed polls after which the
+                session is refreshed
+        """
+        self.target_date = target_date
+        self.resource_ids = resource_ids or [str(r) for r in PREFERRED_RANGE]
+        self.pacer = pacer or PollPacer()
+        self.max_poll_failures = max_poll_failures
+        self.slot_start, self.slot_end = calculate_booking_times(target_date)
+        self.results: list[BookingResult] = []
+        self.booked: BookingResult | None = None
+        self.finished = False
+        self.polls = 0
+        self._free: set[str] | None = None
+        # Seats that failed while listed as free - skipped until the schedule
+        # shows them taken (a later cancellation makes them worth a try again)
+        self.failed: set[str] = set()
+
+    def free_resources(self) -> list[str]:
+        """Preferred resources free for the slot according to the last poll."""
+        # Looked up on the module: the index is replaced in tests
+        return amain.schedule_index.free_resources(
+            self.resource_ids, self.slot_start, self.slot_end
+        )
+
+    async def fire(
+        self, client: httpx.AsyncClient, csrf_token: str, resource_ids: list[str]
+    ) -> BookingResult | None:
+        """
+        Reserve free resources concurrently until one succeeds.
+
+        Requests still in flight are only cancelled once one of them has
+        booked: a "one at a time" answer may come from the request that wins.
+
+        Args:
+            client: Authenticated HTTP client
+            csrf_token: CSRF token for the requests
+            resource_ids: Free resources in order of preference
+
+        Returns:
+            The successful result, or None
+
+        Raises:
+            SessionExpiredError: If the server rejected the session
+        """
+        logger.info(f"🎯 Freed: {', '.join(resource_ids)} - firing")
+        tasks = [
+            asyncio.create_task(
+                create_single_reservation(
+                    client,
+                    BookingRequest(resource_id, OWNER_ID, self.target_date),
+                    csrf_token,
+                )
+            )
+            for resource_id in resource_ids
+        ]
+        decision = await wait_for_first_success(tasks)
+        if decision is not None and decision.success:
+            for task in tasks:
+                task.cancel()
+        outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+
+        results = [o for o in outcomes if isinstance(o, BookingResult)]
+        self.results.extend(results)
+        record_burst_metrics(results)
+        amain.resource_stats.record(results)
+        amain.journal_burst(results, self.target_date, source="sniper")
+        if any(isinstance(o, SessionExpiredError) for o in outcomes):
+            raise SessionExpiredError("Session rejected while sniping")
+
+        for result in results:
+            if result.success:
+                self.booked = result
+                self.finished = True
+                logger.info(
+                    f"✅ Sniped resource {result.resource_id} "
+                    f"(ref: {result.reference_number})"
+                )
+                return result
+
+        for result in results:
+            failure = result.failure
+            if failure is None:
+                continue
+            if (
+                failure.action is ErrorAction.STOP
+                or failure.code is ErrorCode.TOO_FAR_IN_FUTURE
+            ):
+                logger.info(f"🛑 {failure.code.value} - stopping")
+                self.finished = True
+            elif failure.action is ErrorAction.NEXT_RESOURCE:
+                self.failed.add(result.resource_id)
+        return None
+
+    async def watch(
+        self,
+        client: httpx.AsyncClient,
+        csrf_token: str,
+        stop: asyncio.Event | None = None,
+    ) -> bool:
+        """
+        Poll and fire with one session until finished, stopped or the
+        session fails.
+
+        Args:
+            client: Authenticated HTTP client
+            csrf_token: CSRF token for the requests
+            stop: Event that ends the loop
+
+        Returns:
+            True if the session should be refreshed
+        """
+        stop = stop or asyncio.Event()
+        failures = 0
+        while not stop.is_set() and not self.finished:
+            seconds_to_slot = (self.slot_start - datetime.now()).total_seconds()
+            if seconds_to_slot <= 0:
+                logger.info("⏰ Slot has started - nothing left to snipe")
+                self.finished = True
+                break
+
+            received = await poll_schedule(client, csrf_token, self.target_date)
+            self.polls += 1
+            if received is None:
+                failures += 1
+                if failures >= self.max_poll_failures:
+                    logger.warning(f"{failures} schedule polls failed in a row")
+                    return True
+            else:
+                failures = 0
+                free = self.free_resources()
+                if self._free is not None:
+                    self.pacer.observe(len(self._free.symmetric_difference(free)))
+                self._free = set(free)
+                self.failed &= self._free
+                targets = [r for r in free if r not in self.failed]
+                if targets:
+                    try:
+                        await self.fire(client, csrf_token, targets)
+                    except SessionExpiredError:
+                        return True
+
+            interval = self.pacer.interval(seconds_to_slot)
+            logger.debug(f"Next poll in {interval:.1f}s (churn {self.pacer.churn:.2f})")
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=interval)
+            except TimeoutError:
+                pass
+        return False
+
+    async def run(self, stop: asyncio.Event | None = None) -> BookingResult | None:
+        """
+        Watch until a seat is booked, the slot starts or ``stop`` is set.
+
+        Args:
+            stop: Event that ends the loop (runs until finished if None)
+
+        Returns:
+            The successful result, or None
+        """
+        stop = stop or asyncio.Event()
+        refresh = False
+        logger.info(
+            f"👀 Watching {len(self.resource_ids)} resources for "
+            f"{self.slot_start.isoformat()} - {self.slot_end.time().isoformat()}"
+        )
+        while not stop.is_set() and not self.finished:
+            try:
+                async with authenticated_session(refresh=refresh) as (
+                    client,
+                    csrf_token,
+                ):
+                    refresh = await self.watch(client, csrf_token, stop)
+            except AuthenticationError as e:
+                logger.error(f"Authentication failed, retrying: {e}")
+                refresh = True
+                try:
+                    await asyncio.wait_for(stop.wait(), timeout=self.pacer.max_interval)
+                except TimeoutError:
+                    pass
+        return self.booked
+
+
+def default_target_date(now: datetime) -> date:
+    """Today if the slot has not started yet, otherwise tomorrow."""
+    slot_start, _ = calculate_booking_times(now.date())
+    return now.date() if now < slot_start else now.date() + timedelta(days=1)
+
+
+def main() -> None:
+    """Synchronous entry point watching one day for cancellations."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--date",
+        type=date.fromisoformat,
+        default=None,
+        help="day to watch (default: the next slot that has not started)",
+    )
+    args = parser.parse_args()
+
+    if amain.SCHEDULE_ID is None:
+        raise SystemExit("Set schedule_id in scheduler/config.py to snipe")
+
+    target_date = args.date or default_target_date(datetime.now())
+
+    async def serve_and_snipe() -> None:
+        async with metrics_endpoint(booking_details.sniper_metrics_port):
+            await CancellationSniper(target_date).run()
+
+    asyncio.run(serve_and_snipe())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Precompiled multipart bodies for reservation bursts.
+
+Within one burst every reservation POST is identical except for the resource
+id. Instead of rebuilding the payload dict, serializing it and letting httpx
+encode a fresh multipart body per request, the body is encoded once around a
+placeholder and the resource id is spliced in with two concatenations.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from typing import Any
+
+import httpx
+
+# Placeholder spliced out of the encoded body; must survive JSON serialization
+# unchanged and never occur in real payload data
+PLACEHOLDER = "__UZH_BOOKER_SPLICE__"
+
+
+class MultipartTemplate:
+    """Multipart body encoded once with a single splice point."""
+
+    def __init__(self, prefix: bytes, suffix: bytes, boundary: str) -> None:
+        """
+        Create a template from its encoded parts.
+
+        Args:
+            prefix: Encoded body up to the splice point
+            suffix: Encoded body after the splice point
+            boundary: Multipart boundary used in the body
+        """
+        self.prefix = prefix
+        self.suffix = suffix
+        self.boundary = boundary
+        self.content_type = f"multipart/form-data; boundary={boundary}"
+
+    @classmethod
+    def compile(
+        cls, files: dict[str, Any], *, boundary: str | None = None
+    ) -> MultipartTemplate:
+        """
+        Encode multipart form parts containing ``PLACEHOLDER`` exactly once.
+
+        The body is produced by httpx itself, so templates are byte-for-byte
+        identical to what ``files=`` would have sent.
+
+        Args:
+            files: Form parts in httpx ``files=`` format
+            boundary: Multipart boundary (random if None)
+
+        Returns:
+            Compiled template
+
+        Raises:
+            ValueError: If the placeholder does not occur exactly once
+        """
+        boundary = boundary or os.urandom(16).hex()
+        request = httpx.Request(
+            "POST",
+            "http://template.invalid/",
+            files=files,
+            headers={"Content-Type": f"multipart/form-data; boundary={boundary}"},
+        )
+        parts = request.read().split(PLACEHOLDER.encode())
+        if len(parts) != 2:
+            raise ValueError(
+                f"Template placeholder must occur exactly once, found {len(parts) - 1}"
+            )
+        return cls(parts[0], parts[1], boundary)
+
+    def render(self, value: str) -> bytes:
+        """
+        Produce the body with ``value`` spliced in.
+
+        Args:
+            value: Text to insert; escaped for the JSON string it lands in
+
+        Returns:
+            Encoded multipart body
+        """
+        if not value.isalnum():
+            value = json.dumps(value)[1:-1]
+        return self.prefix + value.encode() + self.suffix
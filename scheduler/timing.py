@@ -0,0 +1,114 @@
+"""
+Per-request timing for reservation requests.
+
+Each request records when it was queued, when it got a connection, when its
+body was written, when the response headers arrived and when the response was
+complete. The middle three come from httpcore's ``trace`` request extension,
+so they reflect the transport rather than our event loop. Comparing the
+phases tells whether a seat was lost to the network, to local queueing or to
+the server.
+"""
+
+from __future__ import annotations
+
+import statistics
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any
+
+# httpcore trace events (prefixed with "http11." or "http2.")
+CONNECT_EVENT = "connection.connect_tcp.started"
+HEADERS_STARTED_SUFFIX = ".send_request_headers.started"
+BODY_SENT_SUFFIX = ".send_request_body.complete"
+FIRST_BYTE_SUFFIX = ".receive_response_headers.complete"
+
+
+@dataclass
+class RequestTiming:
+    """``time.perf_counter`` timestamps of one request's phases."""
+
+    enqueued: float
+    connection_acquired: float | None = None
+    request_sent: float | None = None
+    first_byte: float | None = None
+    completed: float | None = None
+    new_connection: bool = False
+
+    @classmethod
+    def start(cls) -> RequestTiming:
+        """Timing for a request queued now."""
+        return cls(enqueued=time.perf_counter())
+
+    async def trace(self, event_name: str, info: dict[str, Any]) -> None:
+        """
+        httpcore trace callback (pass as the ``trace`` request extension).
+
+        Args:
+            event_name: Transport event, e.g. ``http11.send_request_body.complete``
+            info: Event details (unused)
+        """
+        now = time.perf_counter()
+        if event_name == CONNECT_EVENT:
+            self.new_connection = True
+        elif event_name.endswith(HEADERS_STARTED_SUFFIX):
+            self.connection_acquired = now
+        elif event_name.endswith(BODY_SENT_SUFFIX):
+            self.request_sent = now
+        elif event_name.endswith(FIRST_BYTE_SUFFIX):
+            self.first_byte = now
+
+    @property
+    def queue_time(self) -> float | None:
+        """Seconds from enqueue until a connection was ready (includes connect)."""
+        return _span(self.enqueued, self.connection_acquired)
+
+    @property
+    def send_time(self) -> float | None:
+        """Seconds spent writing the request."""
+        return _span(self.connection_acquired, self.request_sent)
+
+    @property
+    def server_time(self) -> float | None:
+        """Seconds from request written to response headers (network + server)."""
+        return _span(self.request_sent, self.first_byte)
+
+    @property
+    def total_time(self) -> float | None:
+        """Seconds from enqueue to complete response."""
+        return _span(self.enqueued, self.completed)
+
+
+def _span(start: float | None, end: float | None) -> float | None:
+    if start is None or end is None:
+        return None
+    return end - start
+
+
+def summarize_timings(timings: Iterable[RequestTiming]) -> str:
+    """
+    One-line summary of median phase durations.
+
+    Args:
+        timings: Timings of the requests in a burst
+
+    Returns:
+        Human readable summary (phases without data are left out)
+    """
+    timings = list(timings)
+    phases = {
+        "queue": [t.queue_time for t in timings],
+        "send": [t.send_time for t in timings],
+        "server": [t.server_time for t in timings],
+        "total": [t.total_time for t in timings],
+    }
+
+    parts = []
+    for name, values in phases.items():
+        measured = [v for v in values if v is not None]
+        if measured:
+            parts.append(f"{name} {statistics.median(measured) * 1000:.2f}ms")
+
+    new_connections = sum(t.new_connection for t in timings)
+    parts.append(f"{new_connections}/{len(timings)} new connections")
+    return "median " + ", ".join(parts)
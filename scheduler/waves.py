@@ -0,0 +1,157 @@
+"""
+Multi-wave burst plans.
+
+The server's release instant is only known to within a few milliseconds, so
+a burst can be split into waves fired at staggered offsets around it (e.g.
+20ms early, on time and 15ms late). Each wave covers the resource list in its
+own order, so an early wave that arrives too soon does not burn the same
+resources first as the next one. Waves not yet released when the burst is
+decided (a success, or a failure showing none can succeed) are skipped.
+
+``WaveOutcome`` records what each wave achieved so the offsets can be tuned.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
+from enum import StrEnum
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from scheduler.errors import ErrorCode
+
+
+class WaveOrder(StrEnum):
+    """Order in which a wave covers the resource list."""
+
+    PREFERENCE = "preference"
+    REVERSED = "reversed"
+    # Every other resource first: 1, 3, 5, ... then 2, 4, 6, ...
+    INTERLEAVED = "interleaved"
+    # Starting from the middle of the list and wrapping around
+    ROTATED = "rotated"
+
+    def apply(self, resource_ids: Sequence[str]) -> list[str]:
+        """
+        Order resources for a wave.
+
+        Args:
+            resource_ids: Resources in order of preference
+
+        Returns:
+            The same resources in this wave's order
+        """
+        ids = list(resource_ids)
+        match self:
+            case WaveOrder.REVERSED:
+                return ids[::-1]
+            case WaveOrder.INTERLEAVED:
+                return ids[::2] + ids[1::2]
+            case WaveOrder.ROTATED:
+                middle = len(ids) // 2
+                return ids[middle:] + ids[:middle]
+            case _:
+                return ids
+
+
+@dataclass(frozen=True)
+class Wave:
+    """One wave of a burst."""
+
+    name: str
+    # Milliseconds relative to the release instant (negative fires early)
+    offset_ms: float = 0.0
+    order: WaveOrder = WaveOrder.PREFERENCE
+
+
+@dataclass(frozen=True)
+class WavePlan:
+    """Waves of a burst, released in order of their offsets."""
+
+    waves: tuple[Wave, ...] = (Wave("A"),)
+
+    def __post_init__(self) -> None:
+        """
+        Validate the plan and sort the waves by offset.
+
+        Raises:
+            ValueError: If the plan has no waves or duplicate wave names
+        """
+        if not self.waves:
+            raise ValueError("A wave plan needs at least one wave")
+        names = [wave.name for wave in self.waves]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Wave names must be unique: {names}")
+        object.__setattr__(
+            self, "waves", tuple(sorted(self.waves, key=lambda w: w.offset_ms))
+        )
+
+    @classmethod
+    def staggered(
+        cls, offsets_ms: Iterable[float], orders: Iterable[WaveOrder] = ()
+    ) -> WavePlan:
+        """
+        Build a plan from offsets, naming the waves A, B, C, ... in firing order.
+
+        Args:
+            offsets_ms: Offset of each wave
+            orders: Order of each wave, matching ``offsets_ms`` (missing ones
+                use preference order)
+
+        Returns:
+            The plan
+        """
+        offsets = list(offsets_ms)
+        wave_orders = list(orders) + [WaveOrder.PREFERENCE] * len(offsets)
+        timed = sorted(zip(offsets, wave_orders), key=lambda pair: pair[0])
+        return cls(
+            tuple(
+                Wave(chr(ord("A") + i), offset, order)
+                for i, (offset, order) in enumerate(timed)
+            )
+        )
+
+    @property
+    def lead_ms(self) -> float:
+        """How far before the release instant the first wave fires."""
+        return max(0.0, -self.waves[0].offset_ms)
+
+    def describe(self) -> str:
+        """One-line description, e.g. ``A@-20ms B@+0ms``."""
+        return " ".join(f"{w.name}@{w.offset_ms:+g}ms" for w in self.waves)
+
+
+@dataclass
+class WaveOutcome:
+    """What one wave of a burst achieved."""
+
+    name: str
+    offset_ms: float
+    planned: int
+    skipped: bool = False
+    # How late the wave left relative to its own target instant
+    lateness_ms: float = 0.0
+    successes: int = 0
+    cancelled: int = 0
+    errors: Counter[ErrorCode | None] = field(default_factory=Counter)
+
+    @property
+    def failures(self) -> int:
+        """Completed requests that did not book."""
+        return sum(self.errors.values())
+
+    def summary(self) -> str:
+        """One-line human readable summary."""
+        if self.skipped:
+            return f"{self.name} ({self.offset_ms:+g}ms): skipped"
+        errors = ", ".join(
+            f"{count} {code.value if code else 'unclassified'}"
+            for code, count in self.errors.most_common()
+        )
+        return (
+            f"{self.name} ({self.offset_ms:+g}ms, {self.lateness_ms:.2f}ms late): "
+            f"{self.planned} sent, {self.successes} booked, "
+            f"{self.cancelled} cancelled" + (f", {errors}" if errors else "")
+        )
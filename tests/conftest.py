@@ -0,0 +1,56 @@
+"""Shared test fixtures."""
+
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+import pytest
+from diskcache import Cache
+
+from scheduler.availability import IntervalIndex
+from scheduler.calibration import FiringCalibrator
+from scheduler.config import BookingConstants
+from scheduler.horizon import HorizonLearner
+from scheduler.journal import AttemptJournal
+from scheduler.resource_stats import ResourceStatsStore
+from scheduler.session_store import SessionStore
+
+
+@dataclass
+class IsolatedState:
+    """Throwaway stand-ins for the module-level state of ``scheduler.amain``."""
+
+    horizon: HorizonLearner
+    calibrator: FiringCalibrator
+    resource_stats: ResourceStatsStore
+    session_store: SessionStore
+    schedule: IntervalIndex
+    journal: AttemptJournal
+
+
+@pytest.fixture(autouse=True)
+def isolated_state(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> Iterator[IsolatedState]:
+    """Keep every test out of the real persistent cache and journal."""
+    with Cache(tmp_path / "cache") as cache:
+        state = IsolatedState(
+            horizon=HorizonLearner(cache),
+            calibrator=FiringCalibrator(cache),
+            resource_stats=ResourceStatsStore(cache),
+            session_store=SessionStore(
+                cache, max_age=BookingConstants.CACHE_EXPIRY_HOURS * 60 * 60
+            ),
+            schedule=IntervalIndex(),
+            journal=AttemptJournal(tmp_path / "journal.sqlite3", flush_interval=0),
+        )
+        monkeypatch.setattr("scheduler.amain.horizon_learner", state.horizon)
+        monkeypatch.setattr("scheduler.amain.firing_calibrator", state.calibrator)
+        monkeypatch.setattr("scheduler.amain.resource_stats", state.resource_stats)
+        monkeypatch.setattr("scheduler.amain.session_store", state.session_store)
+        monkeypatch.setattr("scheduler.keeper.session_store", state.session_store)
+        monkeypatch.setattr("scheduler.amain.schedule_index", state.schedule)
+        monkeypatch.setattr("scheduler.amain.schedule_feeds", {})
+        monkeypatch.setattr("scheduler.amain.attempt_journal", state.journal)
+        yield state
+        state.journal.close()
@@ -1,5 +1,8 @@
 """Tests for the refactored async booking module using VCR for real HTTP interactions."""
 
+import asyncio
+
+import httpx
 import pytest
 import vcr
 from datetime import date, timedelta
@@ -16,7 +19,10 @@ from scheduler.amain import (
     generate_totp_code,
     calculate_booking_times,
     create_reservation_payload,
+    warm_up_connections,
 )
+from scheduler.errors import ErrorCode
+from scheduler.waves import Wave, WavePlan
 
 
 # VCR configuration
@@ -83,6 +89,143 @@ class TestUtilityFunctions:
         assert payload["updateScope"] == "full"
 
 
+class TestConnectionWarmup:
+    """Test pre-burst connection warm-up (mock transport, no network)."""
+
+    @pytest.mark.asyncio
+    async def test_warm_up_issues_concurrent_probes(self):
+        """One probe per requested connection, all in flight together."""
+
+        seen = []
+
+        def handler(request):
+            seen.append(request.method)
+            return httpx.Response(404)
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            warmed = await warm_up_connections(client, 5)
+
+        assert warmed == 5
+        assert seen == ["HEAD"] * 5
+
+
+class TestEarlyCancel:
+    """Test stopping the burst at the first success (mock transport)."""
+
+    @pytest.mark.asyncio
+    async def test_stop_on_success_cancels_outstanding(self):
+        """Slow requests are cancelled once a fast one succeeds."""
+
+        async def handler(request):
+            body = request.content.decode()
+            if '"resourceIds": ["231"]' in body:
+                return httpx.Response(
+                    200,
+                    json={
+                        "success": True,
+                        "data": {"success": True, "referenceNumber": "REF"},
+                    },
+                )
+            await asyncio.sleep(5)
+            return httpx.Response(
+                200, json={"success": True, "data": {"success": False}}
+            )
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            with patch("scheduler.amain.PREFERRED_RANGE", range(231, 235)):
+                results = await asyncio.wait_for(
+                    attempt_batch_booking(
+                        client, "token", date(2024, 1, 15), stop_on_success=True
+                    ),
+                    timeout=2,
+                )
+
+        assert [r.resource_id for r in results] == ["231"]
+        assert results[0].reference_number == "REF"
+
+    @pytest.mark.asyncio
+    async def test_one_at_a_time_error_keeps_requests_in_flight(self):
+        """A concurrent success survives a "one at a time" answer."""
+
+        async def handler(request):
+            body = request.content.decode()
+            if '"resourceIds": ["231"]' in body:
+                return httpx.Response(
+                    200,
+                    json={
+                        "success": True,
+                        "data": {
+                            "success": False,
+                            "errors": [
+                                (
+                                    "Es ist nur eine Reservierung zur selben Zeit "
+                                    "möglich.\n15/01/2024\n"
+                                )
+                            ],
+                        },
+                    },
+                )
+            if '"resourceIds": ["232"]' in body:
+                await asyncio.sleep(0.1)
+                return httpx.Response(
+                    200,
+                    json={
+                        "success": True,
+                        "data": {"success": True, "referenceNumber": "REF"},
+                    },
+                )
+            await asyncio.sleep(5)
+            return httpx.Response(
+                200, json={"success": True, "data": {"success": False}}
+            )
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            with patch("scheduler.amain.PREFERRED_RANGE", range(231, 235)):
+                results = await asyncio.wait_for(
+                    attempt_batch_booking(
+                        client, "token", date(2024, 1, 15), stop_on_success=True
+                    ),
+                    timeout=2,
+                )
+
+        assert [(r.resource_id, r.error_code) for r in results] == [
+            ("231", ErrorCode.ONE_AT_A_TIME),
+            ("232", None),
+        ]
+        assert results[1].reference_number == "REF"
+
+    @pytest.mark.asyncio
+    async def test_one_at_a_time_error_skips_later_waves(self):
+        """After a "one at a time" answer later waves stay parked."""
+
+        async def handler(request):
+            if '"resourceIds": ["231"]' in request.content.decode():
+                return httpx.Response(
+                    200,
+                    json={
+                        "success": True,
+                        "data": {
+                            "success": False,
+                            "errors": ["Es ist nur eine Reservierung zur selben Zeit"],
+                        },
+                    },
+                )
+            await asyncio.sleep(0.05)
+            return httpx.Response(
+                200, json={"success": True, "data": {"success": False}}
+            )
+
+        plan = WavePlan((Wave("A", 0), Wave("B", 300)))
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            with patch("scheduler.amain.PREFERRED_RANGE", range(231, 235)):
+                results = await attempt_batch_booking(
+                    client, "token", date(2024, 1, 15), stop_on_success=True, plan=plan
+                )
+
+        assert [r.resource_id for r in results] == ["231", "232", "233", "234"]
+        assert {r.wave for r in results} == {"A"}
+
+
 class TestWithVCRRecordings:
     """Tests using VCR to record/replay real HTTP interactions."""
 
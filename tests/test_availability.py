@@ -0,0 +1,357 @@
+"""Tests for availability-aware resource ordering."""
+
+from datetime import date, datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from benchmarks.standin import (
+    BookedStandIn,
+    LatencyModel,
+    StandInConfig,
+    point_booker_at,
+)
+from scheduler.amain import (
+    authenticate_client,
+    calculate_booking_times,
+    create_http_client,
+    get_csrf_token_from_schedule_page,
+    poll_schedule,
+    rank_resources,
+    schedule_feed,
+)
+from scheduler.availability import (
+    IntervalIndex,
+    Occupancy,
+    ScheduleFeed,
+    order_by_availability,
+    parse_refresh_marker,
+    parse_schedule_reservations,
+    parse_timestamp,
+)
+
+
+class TestParseScheduleReservations:
+    """Test the tolerant schedule parser."""
+
+    def test_booked_listing(self):
+        """The listing format of Booked is understood."""
+        payload = [
+            {
+                "ReferenceNumber": "ABC",
+                "ResourceId": 231,
+                "StartDate": "2025-05-20 06:30:00",
+                "EndDate": "2025-05-20 16:30:00",
+                "IsReservation": True,
+            }
+        ]
+
+        assert parse_schedule_reservations(payload) == [
+            Occupancy(
+                "231",
+                datetime(2025, 5, 20, 6, 30),
+                datetime(2025, 5, 20, 16, 30),
+                "ABC",
+            )
+        ]
+
+    def test_wrapped_payload_and_alternative_keys(self):
+        """Wrapped lists and camelCase keys are accepted."""
+        payload = {
+            "reservations": [
+                {
+                    "resourceId": "232",
+                    "startDate": "2025-05-20T06:30:00",
+                    "endDate": "2025-05-20T08:00:00",
+                }
+            ]
+        }
+
+        (occupancy,) = parse_schedule_reservations(payload)
+
+        assert occupancy.resource_id == "232"
+        assert occupancy.reference_number is None
+
+    def test_unreadable_items_skipped(self):
+        """Broken items are skipped instead of failing the whole listing."""
+        payload = [
+            "nonsense",
+            {"ResourceId": 1, "StartDate": "soon", "EndDate": "later"},
+            {"ResourceId": 2, "StartDate": "2025-05-20 10:00:00"},
+            {
+                "ResourceId": 3,
+                "StartDate": "2025-05-20 10:00:00",
+                "EndDate": "2025-05-20 09:00:00",
+            },
+        ]
+
+        assert parse_schedule_reservations(payload) == []
+
+    def test_unexpected_payload(self):
+        """Payloads without a listing give no occupancies."""
+        assert parse_schedule_reservations(None) == []
+        assert parse_schedule_reservations({"message": "error"}) == []
+
+    def test_timestamp_with_offset(self):
+        """Offsets are converted to naive local time."""
+        parsed = parse_timestamp("2025-05-20T06:30:00+00:00")
+
+        assert parsed is not None
+        assert parsed.tzinfo is None
+
+
+def at(hour: int, minute: int = 0, day: int = 20) -> datetime:
+    """A time in May 2025."""
+    return datetime(2025, 5, day, hour, minute)
+
+
+class TestIntervalIndex:
+    """Test the per-resource interval index."""
+
+    SLOT = (at(6, 30), at(16, 30))
+
+    def test_overlap_is_half_open(self):
+        """Back-to-back reservations do not overlap the slot."""
+        index = IntervalIndex()
+        index.update(
+            [
+                Occupancy("231", at(5), at(6, 30)),
+                Occupancy("232", at(16), at(18)),
+                Occupancy("233", at(6, day=21), at(18, day=21)),
+            ]
+        )
+
+        assert index.occupied(*self.SLOT) == {"232"}
+        assert index.free_resources(["231", "232", "233", "234"], *self.SLOT) == [
+            "231",
+            "233",
+            "234",
+        ]
+
+    def test_gap_between_reservations(self):
+        """A slot fitting between two reservations is free."""
+        index = IntervalIndex()
+        index.update(
+            [
+                Occupancy("231", at(8), at(10), "A"),
+                Occupancy("231", at(12), at(14), "B"),
+            ]
+        )
+
+        assert index.is_free("231", at(10), at(12))
+        assert not index.is_free("231", at(9), at(11))
+        assert not index.is_free("231", at(7), at(15))
+        assert index.is_free("231", at(14), at(16))
+
+    def test_overlapping_entries_are_merged(self):
+        """Overlapping entries (e.g. blackout and reservation) form one interval."""
+        index = IntervalIndex()
+        index.update(
+            [
+                Occupancy("231", at(8), at(12)),
+                Occupancy("231", at(9), at(10), "A"),
+                Occupancy("231", at(12), at(13), "B"),
+            ]
+        )
+
+        assert len(index) == 3
+        assert not index.is_free("231", at(12, 30), at(14))
+        assert index.is_free("231", at(13), at(14))
+
+    def test_update_replaces_by_reference(self):
+        """A changed reservation replaces its previous version."""
+        index = IntervalIndex()
+        index.update([Occupancy("231", at(8), at(10), "A")])
+        index.update([Occupancy("232", at(11), at(12), "A")])
+
+        assert len(index) == 1
+        assert index.is_free("231", at(8), at(10))
+        assert not index.is_free("232", at(11), at(12))
+
+    def test_replace_window_drops_cancelled(self):
+        """Entries missing from a fresh listing of the window are removed."""
+        index = IntervalIndex()
+        index.update(
+            [
+                Occupancy("231", at(8), at(10), "A"),
+                Occupancy("232", at(8), at(10), "B"),
+                Occupancy("233", at(8, day=21), at(10, day=21), "C"),
+            ]
+        )
+
+        index.replace_window(
+            at(0), at(0, day=21), [Occupancy("232", at(8), at(10), "B")]
+        )
+
+        assert index.is_free("231", at(8), at(10))
+        assert not index.is_free("232", at(8), at(10))
+        assert not index.is_free("233", at(8, day=21), at(10, day=21))
+
+    def test_prune(self):
+        """Past occupancies can be dropped to keep the index small."""
+        index = IntervalIndex()
+        index.update(
+            [
+                Occupancy("231", at(8, day=19), at(10, day=19), "A"),
+                Occupancy("231", at(8), at(10), "B"),
+            ]
+        )
+
+        index.prune(at(0))
+
+        assert len(index) == 1
+        assert index.resources == {"231"}
+
+
+class TestScheduleFeed:
+    """Test delta polling state."""
+
+    def feed(self) -> ScheduleFeed:
+        """A feed for 20 May 2025."""
+        return ScheduleFeed(
+            IntervalIndex(),
+            at(0),
+            at(0, day=21),
+            full_refresh_interval=timedelta(minutes=5),
+        )
+
+    def item(self, reference: str, resource_id: int, hour: int) -> dict:
+        """A listing item of one hour."""
+        return {
+            "ReferenceNumber": reference,
+            "ResourceId": resource_id,
+            "StartDate": at(hour).isoformat(sep=" "),
+            "EndDate": at(hour + 1).isoformat(sep=" "),
+        }
+
+    def test_first_poll_is_full(self):
+        """Without a previous poll the whole window is listed."""
+        feed = self.feed()
+
+        assert feed.marker(at(9)) == ""
+
+    def test_deltas_merge_into_index(self):
+        """Deltas add to the index instead of replacing the window."""
+        feed = self.feed()
+        feed.apply([self.item("A", 231, 8)], at(9), full=True)
+
+        marker = feed.marker(at(9, 1))
+        feed.apply([self.item("B", 232, 8)], at(9, 1), full=False)
+
+        assert marker == "2025-05-20 08:59:58"
+        assert feed.index.occupied(at(8), at(9)) == {"231", "232"}
+
+    def test_full_refresh_drops_cancelled(self):
+        """A due full listing removes what the deltas could not."""
+        feed = self.feed()
+        feed.apply([self.item("A", 231, 8), self.item("B", 232, 8)], at(9), full=True)
+
+        assert feed.marker(at(9, 5)) == ""
+        feed.apply([self.item("B", 232, 8)], at(9, 5), full=True)
+
+        assert feed.index.occupied(at(8), at(9)) == {"232"}
+        assert (feed.polls, feed.full_polls) == (2, 2)
+
+    def test_full_refresh_prunes_past_days(self):
+        """Reservations of past days leave the index with the next full listing."""
+        feed = self.feed()
+        feed.index.update([Occupancy("231", at(8, day=19), at(9, day=19), "Y")])
+
+        feed.apply([self.item("A", 232, 8)], at(9), full=True)
+
+        assert feed.index.resources == {"232"}
+
+    def test_server_marker_preferred(self):
+        """A marker sent by the server is echoed back."""
+        feed = self.feed()
+        feed.apply({"reservations": [], "lastRefresh": "1747724400"}, at(9), full=True)
+
+        assert feed.marker(at(9, 1)) == "1747724400"
+        assert parse_refresh_marker([]) is None
+        assert parse_refresh_marker({"LAST_REFRESH": ""}) is None
+
+
+class TestOrdering:
+    """Test ordering by availability."""
+
+    def test_taken_resources_go_last(self):
+        """Free resources keep their order ahead of taken ones."""
+        ordered = order_by_availability(["1", "2", "3", "4"], {"1", "3"})
+
+        assert ordered == ["2", "4", "1", "3"]
+
+    def test_taken_resources_dropped(self):
+        """Taken resources can be left out."""
+        ordered = order_by_availability(["1", "2", "3"], {"2"}, drop_taken=True)
+
+        assert ordered == ["1", "3"]
+
+
+class TestRankAgainstStandIn:
+    """Ranking from the stand-in's schedule listing."""
+
+    @pytest.mark.asyncio
+    async def test_taken_seats_are_tried_last(self):
+        """Seats booked by others move to the back of the queue."""
+        target = date.today() + timedelta(days=7)
+        start, end = calculate_booking_times(target)
+        config = StandInConfig(latency=LatencyModel(1.0, 0.0))
+        async with BookedStandIn(config) as server:
+            await server.reserve("someone", "232", start, end)
+            await server.reserve(
+                "someone-else", "234", start - timedelta(hours=3), start
+            )
+            with (
+                point_booker_at(server.base_url),
+                patch("scheduler.amain.SCHEDULE_ID", 1),
+            ):
+                client = create_http_client()
+                await authenticate_client(client)
+                csrf_token = await get_csrf_token_from_schedule_page(client)
+                ranked = await rank_resources(
+                    client, csrf_token, target, ["231", "232", "233", "234"]
+                )
+                await client.aclose()
+
+        assert ranked == ["231", "233", "234", "232"]
+
+    @pytest.mark.asyncio
+    async def test_without_schedule_keeps_order(self):
+        """Without a configured schedule nothing is fetched."""
+        ranked = await rank_resources(None, "token", date.today(), ["2", "1"])
+
+        assert ranked == ["2", "1"]
+
+
+class TestPollAgainstStandIn:
+    """Delta polling of the stand-in's schedule."""
+
+    @pytest.mark.asyncio
+    async def test_deltas_and_full_refresh(self, isolated_state):
+        """Deltas list new reservations only; full listings catch cancellations."""
+        target = date.today() + timedelta(days=7)
+        start, end = calculate_booking_times(target)
+        config = StandInConfig(latency=LatencyModel(1.0, 0.0))
+        async with BookedStandIn(config) as server:
+            first, _ = await server.reserve("someone", "231", start, end)
+            server.reservations[0].created_at -= 60  # Older than the delta overlap
+            with (
+                point_booker_at(server.base_url),
+                patch("scheduler.amain.SCHEDULE_ID", 1),
+            ):
+                client = create_http_client()
+                await authenticate_client(client)
+                csrf_token = await get_csrf_token_from_schedule_page(client)
+
+                assert await poll_schedule(client, csrf_token, target) == 1
+                await server.reserve("someone-else", "232", start, end)
+                assert await poll_schedule(client, csrf_token, target) == 1
+                assert isolated_state.schedule.occupied(start, end) == {"231", "232"}
+
+                await server.cancel(first)
+                schedule_feed(target).full_refresh_interval = timedelta(0)
+                assert await poll_schedule(client, csrf_token, target) == 1
+                await client.aclose()
+
+        assert isolated_state.schedule.occupied(start, end) == {"232"}
+        assert schedule_feed(target).full_polls == 2
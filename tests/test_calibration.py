@@ -0,0 +1,181 @@
+"""Tests for the firing offset calibrator."""
+
+from datetime import date, datetime, timedelta
+from unittest.mock import patch
+
+import httpx
+import pytest
+from diskcache import Cache
+
+from scheduler.amain import attempt_batch_booking
+from scheduler.calibration import BurstObservation, FiringCalibrator
+from scheduler.errors import ErrorCode
+
+TOO_FAR = ErrorCode.TOO_FAR_IN_FUTURE
+CONFLICT = ErrorCode.CONFLICT
+
+
+@pytest.fixture
+def calibrator(tmp_path):
+    """A calibrator on a throwaway cache."""
+    with Cache(tmp_path / "cache") as cache:
+        yield FiringCalibrator(cache, history=5, step_ms=10, margin_ms=2)
+
+
+def burst(*sends: tuple[float, ErrorCode | None]) -> BurstObservation:
+    """Observation of a burst with the given (offset, code) sends."""
+    return BurstObservation.from_sends(sends, datetime(2025, 5, 12), 0.01)
+
+
+def simulate(calibrator: FiringCalibrator, edge_ms: float, bursts: int) -> float:
+    """Fire bursts at the suggested shift against a server opening at ``edge_ms``."""
+    for _ in range(bursts):
+        shift = calibrator.suggest_shift_ms()
+        sends = [shift + i * 0.5 for i in range(10)]
+        calibrator.record(
+            burst(*[(t, TOO_FAR if t < edge_ms else CONFLICT) for t in sends])
+        )
+    return calibrator.suggest_shift_ms()
+
+
+class TestBurstObservation:
+    """Test the bounds of one burst."""
+
+    def test_bounds(self):
+        """Too-far answers bound the edge from below, handled ones from above."""
+        observation = burst(
+            (-5.0, TOO_FAR),
+            (-1.0, TOO_FAR),
+            (2.0, None),
+            (3.0, CONFLICT),
+            (-3.0, ErrorCode.NETWORK_ERROR),
+        )
+
+        assert observation.latest_rejected_ms == -1.0
+        assert observation.earliest_accepted_ms == 2.0
+
+    def test_round_trip(self):
+        """Observations survive the cache representation."""
+        observation = burst((1.0, CONFLICT), (0.5, None))
+
+        assert BurstObservation.from_dict(observation.to_dict()) == observation
+        assert observation.earliest_accepted_ms == 0.5
+
+
+class TestFiringCalibrator:
+    """Test shift suggestions."""
+
+    def test_no_history(self, calibrator):
+        """Without history the nominal instant is used."""
+        assert calibrator.suggest_shift_ms() == 0.0
+
+    def test_probes_earlier_when_always_accepted(self, calibrator):
+        """Bursts that were never too early move the next one earlier."""
+        calibrator.record(burst((0.0, CONFLICT), (1.0, None)))
+
+        assert calibrator.suggest_shift_ms() == -10.0
+
+    def test_probes_later_when_always_too_early(self, calibrator):
+        """Bursts that were always too early move the next one later."""
+        calibrator.record(burst((0.0, TOO_FAR), (1.0, TOO_FAR)))
+
+        assert calibrator.suggest_shift_ms() == 11.0
+
+    def test_fires_just_after_edge(self, calibrator):
+        """With evidence on both sides the shift lands just after the edge."""
+        calibrator.record(burst((4.0, TOO_FAR), (8.0, CONFLICT)))
+
+        assert calibrator.suggest_shift_ms() == 8.0
+
+    def test_shift_is_bounded(self, tmp_path):
+        """Suggestions never exceed the configured maximum."""
+        with Cache(tmp_path / "bounded") as cache:
+            calibrator = FiringCalibrator(cache, max_shift_ms=50)
+            calibrator.record(burst((400.0, TOO_FAR)))
+
+            assert calibrator.suggest_shift_ms() == 50
+
+    def test_history_is_trimmed(self, calibrator):
+        """Only the most recent bursts are kept."""
+        for i in range(8):
+            calibrator.record(burst((float(i), CONFLICT)))
+
+        assert [o.earliest_accepted_ms for o in calibrator.load()] == [
+            3.0,
+            4.0,
+            5.0,
+            6.0,
+            7.0,
+        ]
+
+    def test_invalid_cache_entry(self, calibrator):
+        """Garbage in the cache is ignored."""
+        calibrator.cache.set(FiringCalibrator.CACHE_KEY, [{"samples": "x"}])
+
+        assert calibrator.load() == []
+
+    @pytest.mark.parametrize("edge_ms", [-35.0, 0.0, 42.0])
+    def test_converges_on_edge(self, calibrator, edge_ms):
+        """Repeated bursts settle just after the server's edge."""
+        shift = simulate(calibrator, edge_ms, bursts=30)
+
+        assert edge_ms - 1 <= shift <= edge_ms + 10
+
+
+class TestTimedBurstIsRecorded:
+    """Test recording from attempt_batch_booking."""
+
+    @pytest.mark.asyncio
+    async def test_send_offsets_recorded(self, isolated_state):
+        """A timed burst records send offsets relative to the release instant."""
+
+        def handler(request):
+            if request.method == "HEAD":
+                return httpx.Response(404)
+            return httpx.Response(
+                200,
+                json={"success": True, "data": {"success": False, "errors": []}},
+            )
+
+        fire_at = datetime.now() + timedelta(milliseconds=200)
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            with (
+                patch("scheduler.amain.PREFERRED_RANGE", range(231, 235)),
+                patch("scheduler.amain.WARM_CONNECTIONS", 1),
+            ):
+                await attempt_batch_booking(
+                    client,
+                    "token",
+                    date(2024, 1, 15),
+                    fire_at=fire_at,
+                    firing_shift=0.05,
+                )
+
+        (observation,) = isolated_state.calibrator.load()
+        offsets = [t for t, _ in observation.samples]
+        assert len(offsets) == 4
+        assert all(50 <= t < 150 for t in offsets)
+
+    @pytest.mark.asyncio
+    async def test_late_burst_not_recorded(self, isolated_state):
+        """A burst fired well after its release instant teaches nothing."""
+
+        def handler(request):
+            if request.method == "HEAD":
+                return httpx.Response(404)
+            return httpx.Response(
+                200,
+                json={"success": True, "data": {"success": False, "errors": []}},
+            )
+
+        fire_at = datetime.now() - timedelta(seconds=3)
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            with (
+                patch("scheduler.amain.PREFERRED_RANGE", range(231, 235)),
+                patch("scheduler.amain.WARM_CONNECTIONS", 1),
+            ):
+                await attempt_batch_booking(
+                    client, "token", date(2024, 1, 15), fire_at=fire_at
+                )
+
+        assert isolated_state.calibrator.load() == []
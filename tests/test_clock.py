@@ -0,0 +1,72 @@
+"""Tests for server clock-offset estimation."""
+
+import time
+from email.utils import formatdate
+
+import httpx
+import pytest
+
+from scheduler.clock import (
+    ClockSample,
+    combine_samples,
+    estimate_clock_offset,
+    parse_date_header,
+)
+
+
+def make_skewed_server(skew: float) -> httpx.MockTransport:
+    """Create a transport whose Date headers run ``skew`` seconds ahead."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            404, headers={"Date": formatdate(time.time() + skew, usegmt=True)}
+        )
+
+    return httpx.MockTransport(handler)
+
+
+class TestClockSamples:
+    """Test offset arithmetic (no HTTP required)."""
+
+    def test_parse_date_header(self):
+        """Apache Date headers (as recorded in the cassettes) are parsed."""
+        response = httpx.Response(
+            200, headers={"Date": "Sun, 15 Jun 2025 17:23:13 GMT"}
+        )
+        assert parse_date_header(response) == 1750008193.0
+
+    def test_parse_date_header_missing(self):
+        """Responses without Date header yield None."""
+        assert parse_date_header(httpx.Response(200)) is None
+
+    def test_combine_samples_intersects_bounds(self):
+        """Bounds from samples on either side of a boundary narrow the offset."""
+        samples = [
+            ClockSample(sent_at=99.70, received_at=99.72, server_date=100.0),
+            ClockSample(sent_at=100.68, received_at=100.70, server_date=100.0),
+        ]
+        estimate = combine_samples(samples)
+
+        assert estimate.offset == pytest.approx(0.30)
+        assert estimate.uncertainty == pytest.approx(0.02)
+        assert estimate.rtt == pytest.approx(0.02)
+
+    def test_combine_samples_requires_samples(self):
+        """An empty sample list is rejected."""
+        with pytest.raises(ValueError):
+            combine_samples([])
+
+
+class TestEstimateClockOffset:
+    """Test the probing estimator against a simulated skewed server."""
+
+    @pytest.mark.asyncio
+    async def test_estimates_sub_second_skew(self):
+        """Boundary probing resolves a skew far below the Date resolution."""
+        async with httpx.AsyncClient(transport=make_skewed_server(0.3)) as client:
+            estimate = await estimate_clock_offset(
+                client, "https://example.test/favicon.ico", probes=4
+            )
+
+        assert estimate.offset == pytest.approx(0.3, abs=0.1)
+        assert estimate.samples == 4
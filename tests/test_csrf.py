@@ -0,0 +1,126 @@
+"""Tests for the fast CSRF token scanner."""
+
+from pathlib import Path
+
+import httpx
+import pytest
+import yaml
+from bs4 import BeautifulSoup
+
+from scheduler.amain import extract_csrf_token, get_csrf_token_from_schedule_page
+from scheduler.csrf import CsrfStreamScanner, scan_csrf_token
+
+CASSETTE_DIR = Path(__file__).parent / "cassettes"
+
+
+def recorded_pages_with_token() -> list[str]:
+    """HTML bodies from the cassettes that contain a CSRF input."""
+    pages = []
+    for cassette in sorted(CASSETTE_DIR.glob("*.yaml")):
+        data = yaml.safe_load(cassette.read_text())
+        for interaction in data["interactions"]:
+            body = interaction["response"]["body"].get("string", "")
+            if isinstance(body, str) and 'name="CSRF_TOKEN"' in body:
+                pages.append(body)
+    return pages
+
+
+class TestScanCsrfToken:
+    """Test the byte-level scanner."""
+
+    @pytest.mark.parametrize(
+        "html",
+        [
+            b'<input type="hidden" name="CSRF_TOKEN" value="abc+/=123"/>',
+            b'<input value="abc+/=123" name="CSRF_TOKEN">',
+            b"<INPUT type='hidden' name='CSRF_TOKEN' value='abc+/=123'>",
+        ],
+    )
+    def test_scans_common_markup(self, html):
+        """Attribute order, quoting and case variations are handled."""
+        assert scan_csrf_token(html) == "abc+/=123"
+
+    def test_skips_non_input_occurrences(self):
+        """Mentions outside an input tag are ignored."""
+        html = (
+            b'<div data-name="CSRF_TOKEN" value="nope"></div>'
+            b'<meta name="CSRF_TOKEN" value="nope">'
+            b'<input name="CSRF_TOKEN" value="real">'
+        )
+        assert scan_csrf_token(html) == "real"
+
+    def test_unusual_values_are_left_to_the_parser(self):
+        """Values with entities are not guessed at."""
+        html = b'<input name="CSRF_TOKEN" value="a&amp;b">'
+        assert scan_csrf_token(html) is None
+        assert extract_csrf_token(html) == "a&b"
+
+    def test_missing_or_empty_token(self):
+        """Empty values are not accepted by either path."""
+        html = b'<input name="CSRF_TOKEN" value="">'
+        assert scan_csrf_token(html) is None
+        with pytest.raises(ValueError, match="CSRF_TOKEN not found"):
+            extract_csrf_token(html)
+
+    def test_matches_parser_on_recorded_pages(self):
+        """The scanner agrees with BeautifulSoup on real Booked pages."""
+        pages = recorded_pages_with_token()
+        assert pages
+
+        for page in pages:
+            soup = BeautifulSoup(page, "html.parser")
+            expected = soup.find("input", {"name": "CSRF_TOKEN"})["value"]
+            assert scan_csrf_token(page.encode()) == expected
+
+
+class CountingStream(httpx.AsyncByteStream):
+    """Response body that records how many chunks were consumed."""
+
+    def __init__(self, chunks: list[bytes]) -> None:
+        self.chunks = chunks
+        self.consumed = 0
+
+    async def __aiter__(self):
+        for chunk in self.chunks:
+            self.consumed += 1
+            yield chunk
+
+
+class TestStreamingExtraction:
+    """Test incremental scanning of chunked responses."""
+
+    def test_token_split_across_chunks(self):
+        """The token is found wherever the chunk boundary falls."""
+        html = b"<html>" + b"x" * 50 + b'<input name="CSRF_TOKEN" value="tok=="/>'
+        for split in range(1, len(html)):
+            scanner = CsrfStreamScanner()
+            found = scanner.feed(html[:split]) or scanner.feed(html[split:])
+            assert found == "tok=="
+
+    @pytest.mark.asyncio
+    async def test_schedule_page_read_stops_at_token(self):
+        """The rest of the page is not downloaded once the token is seen."""
+        stream = CountingStream(
+            [b"<html>", b'<input name="CSRF_TOKEN" value="tok"/>']
+            + [b"<div>filler</div>"] * 100
+        )
+
+        def handler(request):
+            return httpx.Response(200, stream=stream)
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            token = await get_csrf_token_from_schedule_page(client)
+
+        assert token == "tok"
+        assert stream.consumed == 2
+
+    @pytest.mark.asyncio
+    async def test_schedule_page_falls_back_to_parser(self):
+        """Pages the scanner cannot read are parsed in full."""
+        stream = CountingStream([b'<input name="CSRF_TOKEN" value="a&amp;b">'])
+
+        def handler(request):
+            return httpx.Response(200, stream=stream)
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            assert await get_csrf_token_from_schedule_page(client) == "a&b"
@@ -0,0 +1,96 @@
+"""Tests for reservation error classification."""
+
+from datetime import date, datetime
+
+import httpx
+
+from scheduler.errors import (
+    ErrorAction,
+    ErrorCode,
+    classify_exception,
+    classify_http_status,
+    classify_message,
+    classify_server_errors,
+)
+
+# Messages as decoded from real reservation responses
+TOO_FAR = (
+    "Die Reservierung liegt zu weit in der Zukunft. "
+    "Der späteste Zeitpunkt ist 19/05/2025 23:59:00."
+)
+ONE_AT_A_TIME = "Es ist nur eine Reservierung zur selben Zeit möglich.\n22/06/2025\n"
+CONFLICT = "Es gibt in Konflikt stehende Reservierungen an folgenden Tagen:\n20/05/2025"
+
+
+class TestClassifyMessage:
+    """Test classification of the known server messages."""
+
+    def test_too_far_in_future(self):
+        """The latest bookable instant is parsed from the message."""
+        failure = classify_message(TOO_FAR)
+
+        assert failure.code is ErrorCode.TOO_FAR_IN_FUTURE
+        assert failure.latest_bookable == datetime(2025, 5, 19, 23, 59, 0)
+        assert failure.action is ErrorAction.RETRY
+
+    def test_one_at_a_time(self):
+        """Holding a reservation at that time stops the burst."""
+        failure = classify_message(ONE_AT_A_TIME)
+
+        assert failure.code is ErrorCode.ONE_AT_A_TIME
+        assert failure.dates == (date(2025, 6, 22),)
+        assert failure.action is ErrorAction.STOP
+
+    def test_conflict(self):
+        """A taken resource means moving on to the next one."""
+        failure = classify_message(CONFLICT)
+
+        assert failure.code is ErrorCode.CONFLICT
+        assert failure.dates == (date(2025, 5, 20),)
+        assert failure.action is ErrorAction.NEXT_RESOURCE
+
+    def test_unknown_message(self):
+        """Unrecognised text is kept verbatim."""
+        failure = classify_message("Something else")
+
+        assert failure.code is ErrorCode.UNKNOWN
+        assert failure.message == "Something else"
+
+
+class TestClassifyServerErrors:
+    """Test classification of a whole ``data.errors`` list."""
+
+    def test_first_recognised_message_wins(self):
+        """Unknown messages are skipped in favour of a known one."""
+        failure = classify_server_errors(["Warnung", CONFLICT])
+
+        assert failure.code is ErrorCode.CONFLICT
+
+    def test_all_unknown(self):
+        """Without a known message all messages are kept."""
+        failure = classify_server_errors(["a", "b"])
+
+        assert failure.code is ErrorCode.UNKNOWN
+        assert failure.message == "a\nb"
+
+
+class TestClassifyTransport:
+    """Test classification of HTTP and transport failures."""
+
+    def test_http_status(self):
+        """HTTP errors keep their status and are retried."""
+        failure = classify_http_status(503, "HTTP 503: busy")
+
+        assert failure.code is ErrorCode.HTTP_ERROR
+        assert failure.status_code == 503
+        assert failure.action is ErrorAction.RETRY
+
+    def test_network_error(self):
+        """Transport errors are network errors."""
+        failure = classify_exception(httpx.ConnectError("refused"))
+
+        assert failure.code is ErrorCode.NETWORK_ERROR
+
+    def test_other_exception(self):
+        """Anything else is unknown."""
+        assert classify_exception(ValueError("x")).code is ErrorCode.UNKNOWN
@@ -0,0 +1,102 @@
+"""Tests for the precision release-time firing primitives."""
+
+import time
+from contextlib import ExitStack
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from scheduler.firing import monotonic_deadline, next_release_time, sleep_until
+
+
+class TestReleaseTime:
+    """Test release time calculation (no timing required)."""
+
+    def test_next_release_later_today(self):
+        """Release later on the same day is returned unchanged."""
+        now = datetime(2025, 6, 15, 23, 58, 30)
+        assert next_release_time(23, 59, now=now) == datetime(2025, 6, 15, 23, 59)
+
+    def test_next_release_rolls_over_midnight(self):
+        """Release already passed today rolls over to tomorrow."""
+        now = datetime(2025, 6, 15, 23, 58, 30)
+        assert next_release_time(0, 0, now=now) == datetime(2025, 6, 16, 0, 0)
+
+    def test_monotonic_deadline_tracks_wall_clock(self):
+        """Deadline conversion preserves the distance to the target."""
+        target = datetime.now() + timedelta(seconds=10)
+        remaining = monotonic_deadline(target) - time.perf_counter()
+        assert remaining == pytest.approx(10, abs=0.01)
+
+    def test_monotonic_deadline_applies_clock_offset(self):
+        """A server clock ahead of ours moves the deadline earlier."""
+        target = datetime.now() + timedelta(seconds=10)
+        remaining = monotonic_deadline(target, clock_offset=2.0) - time.perf_counter()
+        assert remaining == pytest.approx(8, abs=0.01)
+
+
+class FakeClock:
+    """Clock whose reads take a little time and whose sleeps overshoot."""
+
+    def __init__(self, overshoot: float) -> None:
+        self.now = 0.0
+        self.overshoot = overshoot
+        self.sleeps: list[float] = []
+
+    def perf_counter(self) -> float:
+        self.now += 1e-5
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds + self.overshoot
+
+    def patched(self) -> ExitStack:
+        """Use this clock in ``scheduler.firing``."""
+        stack = ExitStack()
+        stack.enter_context(
+            patch("scheduler.firing.time", MagicMock(perf_counter=self.perf_counter))
+        )
+        stack.enter_context(
+            patch("scheduler.firing.asyncio", MagicMock(sleep=self.sleep))
+        )
+        return stack
+
+
+class TestSleepUntil:
+    """Test the high-resolution sleep."""
+
+    @pytest.mark.asyncio
+    async def test_spins_after_coarse_sleep(self):
+        """An overshooting coarse sleep is absorbed by the spin margin."""
+        clock = FakeClock(overshoot=0.003)
+        with clock.patched():
+            lateness = await sleep_until(0.05)
+
+        assert clock.sleeps == [pytest.approx(0.045, abs=1e-4)]
+        assert clock.now >= 0.05
+        assert 0 <= lateness < 1e-4
+
+    @pytest.mark.asyncio
+    async def test_reports_lateness_beyond_spin_margin(self):
+        """An overshoot larger than the spin margin shows up as lateness."""
+        clock = FakeClock(overshoot=0.01)
+        with clock.patched():
+            lateness = await sleep_until(0.05)
+
+        assert lateness == pytest.approx(0.005, abs=1e-4)
+
+    @pytest.mark.asyncio
+    async def test_sleep_until_never_early(self):
+        """On the real clocks the wake-up is never before the deadline."""
+        deadline = time.perf_counter() + 0.02
+        lateness = await sleep_until(deadline)
+        assert time.perf_counter() >= deadline
+        assert lateness >= 0
+
+    @pytest.mark.asyncio
+    async def test_sleep_until_past_deadline_returns_immediately(self):
+        """A deadline in the past does not block."""
+        lateness = await sleep_until(time.perf_counter() - 1)
+        assert lateness >= 1
@@ -0,0 +1,73 @@
+"""Tests for the booking concurrency governor."""
+
+import asyncio
+
+import pytest
+
+from scheduler.governor import WAIT_HISTORY, ConcurrencyGovernor
+
+
+async def hold_slot(governor: ConcurrencyGovernor, host: str, seconds: float) -> None:
+    """Occupy a governor slot for a while."""
+    async with governor.slot(host):
+        await asyncio.sleep(seconds)
+
+
+class TestConcurrencyGovernor:
+    """Test limits and queueing metrics."""
+
+    @pytest.mark.asyncio
+    async def test_global_limit(self):
+        """No more than max_concurrent requests are in flight."""
+        governor = ConcurrencyGovernor(max_concurrent=3)
+        await asyncio.gather(*(hold_slot(governor, "a", 0.01) for _ in range(10)))
+
+        assert governor.metrics.acquired == 10
+        assert governor.metrics.peak_in_flight == 3
+        assert governor.metrics.queued == 7
+        assert governor.metrics.in_flight == 0
+        assert governor.metrics.max_wait > 0
+
+    @pytest.mark.asyncio
+    async def test_per_host_limit(self):
+        """The per-host cap applies to each host separately."""
+        governor = ConcurrencyGovernor(max_concurrent=10, per_host=2)
+        await asyncio.gather(
+            *(hold_slot(governor, host, 0.01) for host in ["a"] * 4 + ["b"] * 4)
+        )
+
+        assert governor.metrics.peak_in_flight == 4
+
+    @pytest.mark.asyncio
+    async def test_uncontended_slots_do_not_queue(self):
+        """Slots below the limit are granted without queueing."""
+        governor = ConcurrencyGovernor(max_concurrent=5)
+        await asyncio.gather(*(hold_slot(governor, "a", 0) for _ in range(5)))
+
+        assert governor.metrics.queued == 0
+        assert "5 slots" in governor.metrics.summary()
+
+    @pytest.mark.asyncio
+    async def test_saturated_host_does_not_block_others(self):
+        """Requests queued for a busy host leave global slots to other hosts."""
+        governor = ConcurrencyGovernor(max_concurrent=2, per_host=1)
+        finished = []
+
+        async def request(host: str, seconds: float) -> None:
+            await hold_slot(governor, host, seconds)
+            finished.append(host)
+
+        await asyncio.gather(
+            request("a", 0.05), request("a", 0.05), request("a", 0.05), request("b", 0)
+        )
+
+        assert finished[0] == "b"
+
+    def test_wait_history_is_bounded(self):
+        """Only recent waits are kept; the totals cover every slot."""
+        metrics = ConcurrencyGovernor().metrics
+        for _ in range(WAIT_HISTORY + 10):
+            metrics.record_wait(0.001)
+
+        assert len(metrics.waits) == WAIT_HISTORY
+        assert metrics.acquired == WAIT_HISTORY + 10
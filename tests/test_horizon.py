@@ -0,0 +1,154 @@
+"""Tests for the booking horizon learner."""
+
+from datetime import date, datetime, time, timedelta
+
+import pytest
+from diskcache import Cache
+
+from benchmarks.standin import (
+    BookedStandIn,
+    LatencyModel,
+    StandInConfig,
+    point_booker_at,
+)
+from scheduler.amain import (
+    BookingRequest,
+    authenticate_client,
+    bookable_target_date,
+    create_http_client,
+    create_single_reservation,
+    get_csrf_token_from_schedule_page,
+)
+from scheduler.errors import ErrorCode, ReservationFailure, classify_message
+from scheduler.horizon import HorizonLearner, HorizonRule, near_midnight
+
+TOO_FAR = (
+    "Die Reservierung liegt zu weit in der Zukunft. "
+    "Der späteste Zeitpunkt ist 19/05/2025 23:59:00."
+)
+
+
+@pytest.fixture
+def learner(tmp_path):
+    """A learner on a throwaway cache."""
+    with Cache(tmp_path / "cache") as cache:
+        yield HorizonLearner(cache)
+
+
+def around(moment: datetime) -> tuple[datetime, datetime]:
+    """Handling window of 50ms ending at ``moment``."""
+    return moment - timedelta(milliseconds=50), moment
+
+
+class TestHorizonRule:
+    """Test the horizon arithmetic."""
+
+    RULE = HorizonRule(
+        days_ahead=7, cutoff=time(23, 59), observed_at=datetime(2025, 5, 12)
+    )
+
+    def test_from_observation(self):
+        """Days ahead are counted from the server's date at the request."""
+        rule = HorizonRule.from_observation(
+            datetime(2025, 5, 19, 23, 59), datetime(2025, 5, 12, 14, 3)
+        )
+
+        assert rule.days_ahead == 7
+        assert rule.cutoff == time(23, 59)
+
+    def test_newest_bookable_day(self):
+        """Slots before the cut-off are bookable on the last day."""
+        now = datetime(2025, 5, 12, 9, 0)
+
+        assert self.RULE.newest_bookable_day(now, time(6, 30)) == date(2025, 5, 19)
+
+    def test_slot_after_cutoff_needs_another_day(self):
+        """Slots starting after the cut-off open a day later."""
+        rule = HorizonRule(7, time(12, 0), datetime(2025, 5, 12))
+
+        assert rule.newest_bookable_day(datetime(2025, 5, 12), time(13, 0)) == date(
+            2025, 5, 18
+        )
+        assert rule.opens_at(datetime(2025, 5, 19, 13, 0)) == datetime(2025, 5, 13)
+
+    def test_next_opening(self):
+        """The next day opens at the following midnight."""
+        fire_at, day = self.RULE.next_opening(datetime(2025, 5, 12, 22, 0), time(6, 30))
+
+        assert fire_at == datetime(2025, 5, 13)
+        assert day == date(2025, 5, 20)
+        assert self.RULE.newest_bookable_day(fire_at, time(6, 30)) == day
+
+    def test_round_trip(self):
+        """Rules survive the cache representation."""
+        assert HorizonRule.from_dict(self.RULE.to_dict()) == self.RULE
+
+
+class TestHorizonLearner:
+    """Test learning from failures."""
+
+    def test_learns_and_persists(self, learner):
+        """A too-far failure produces a persisted rule."""
+        failure = classify_message(TOO_FAR)
+
+        rule = learner.observe(failure, around(datetime(2025, 5, 12, 14, 3)))
+
+        assert rule is not None
+        assert learner.load() == rule
+        assert rule.days_ahead == 7
+
+    def test_ignores_other_failures(self, learner):
+        """Only too-far failures teach the horizon."""
+        failure = ReservationFailure(ErrorCode.CONFLICT)
+
+        assert learner.observe(failure, around(datetime(2025, 5, 12, 14))) is None
+        assert learner.load() is None
+
+    def test_skips_observations_at_midnight(self, learner):
+        """Near midnight the server's date is uncertain."""
+        failure = classify_message(TOO_FAR)
+        window = around(datetime(2025, 5, 13, 0, 0, 0, 20_000))
+
+        assert learner.observe(failure, window) is None
+
+    def test_invalid_cache_entry(self, learner):
+        """Garbage in the cache is ignored."""
+        learner.cache.set(HorizonLearner.CACHE_KEY, {"days_ahead": "x"})
+
+        assert learner.load() is None
+
+
+class TestHorizonInBookingFlow:
+    """Learning from the stand-in's responses."""
+
+    def test_default_without_rule(self):
+        """Until a rule is learned the target is one week ahead."""
+        assert bookable_target_date(datetime(2025, 5, 12, 0, 0)) == date(2025, 5, 19)
+
+    @pytest.mark.asyncio
+    async def test_learns_from_too_far_reservation(self, isolated_state):
+        """A too-far reservation teaches the stand-in's horizon."""
+        config = StandInConfig(latency=LatencyModel(1.0, 0.0), horizon_days=5)
+        async with BookedStandIn(config) as server:
+            with point_booker_at(server.base_url):
+                client = create_http_client()
+                await authenticate_client(client)
+                csrf_token = await get_csrf_token_from_schedule_page(client)
+                result = await create_single_reservation(
+                    client,
+                    BookingRequest(
+                        resource_id="231",
+                        owner_id=1843,
+                        reservation_date=date.today() + timedelta(days=9),
+                    ),
+                    csrf_token,
+                )
+                await client.aclose()
+
+        assert result.error_code is ErrorCode.TOO_FAR_IN_FUTURE
+        rule = isolated_state.horizon.load()
+        now = datetime.now()
+        if not near_midnight(now, now, timedelta(seconds=5)):
+            assert rule is not None
+            assert rule.days_ahead == 5
+            assert bookable_target_date(datetime.now()) == date.today() + timedelta(5)
@@ -0,0 +1,275 @@
+"""Tests for the attempt journal."""
+
+import sqlite3
+from datetime import date, datetime, timedelta
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from scheduler.amain import BookingResult, attempt_batch_booking
+from scheduler.errors import ErrorCode, ReservationFailure
+from scheduler.journal import (
+    AttemptEntry,
+    AttemptJournal,
+    BurstEntry,
+    connect,
+    format_win_rates,
+    win_rates,
+    write_bursts,
+)
+from scheduler.timing import RequestTiming
+
+MONDAY = date(2025, 5, 12)
+TUESDAY = date(2025, 5, 13)
+
+
+def attempt(
+    resource_id: str,
+    code: ErrorCode | None = None,
+    offset_ms: float | None = None,
+) -> AttemptEntry:
+    """A journaled attempt; no code means a success."""
+    return AttemptEntry(
+        resource_id,
+        code is None,
+        error_code=code.value if code else None,
+        offset_ms=offset_ms,
+    )
+
+
+@pytest.fixture
+def connection(tmp_path):
+    """A journal with two bursts."""
+    connection = connect(tmp_path / "journal.sqlite3")
+    write_bursts(
+        connection,
+        [
+            (
+                BurstEntry("burst", MONDAY),
+                [
+                    attempt("231", offset_ms=-3.0),
+                    attempt("232", ErrorCode.CONFLICT, offset_ms=4.0),
+                    attempt("233", ErrorCode.TOO_FAR_IN_FUTURE, offset_ms=-12.5),
+                ],
+            ),
+            (
+                BurstEntry("sniper", TUESDAY),
+                [attempt("231", ErrorCode.CONFLICT), attempt("233")],
+            ),
+        ],
+    )
+    yield connection
+    connection.close()
+
+
+class TestAttemptEntry:
+    """Test building entries from booking results."""
+
+    def test_from_result(self):
+        """Outcome, timings and the send offset are taken over."""
+        result = BookingResult(
+            "231",
+            False,
+            error="taken",
+            failure=ReservationFailure(ErrorCode.CONFLICT),
+            timing=RequestTiming(enqueued=10.0, request_sent=10.002, completed=10.05),
+            wave="A",
+        )
+
+        entry = AttemptEntry.from_result(result, release_deadline=10.0)
+
+        assert entry.error_code == "conflict"
+        assert entry.wave == "A"
+        assert entry.offset_ms == 2.0
+        assert entry.total_time == pytest.approx(0.05)
+
+    def test_untimed_burst_has_no_offset(self):
+        """Without a release instant there is no send offset."""
+        result = BookingResult("231", True, reference_number="REF")
+
+        entry = AttemptEntry.from_result(result)
+
+        assert entry.offset_ms is None
+        assert entry.reference_number == "REF"
+
+
+class TestWinRates:
+    """Test the analytics queries."""
+
+    def test_by_resource(self, connection):
+        """Attempts are grouped per resource."""
+        rates = {r.key: r for r in win_rates(connection, "resource")}
+
+        assert (rates["231"].attempts, rates["231"].wins) == (2, 1)
+        assert rates["231"].rate == 0.5
+        assert rates["232"].conflicts == 1
+        assert rates["233"].too_early == 1
+
+    def test_by_weekday(self, connection):
+        """Attempts are grouped by the weekday of the target day."""
+        assert [
+            (r.key, r.attempts, r.wins) for r in win_rates(connection, "weekday")
+        ] == [
+            ("Mon", 3, 1),
+            ("Tue", 2, 1),
+        ]
+
+    def test_by_offset(self, connection):
+        """Timed attempts are grouped in send offset buckets."""
+        rates = win_rates(connection, "offset", bucket_ms=5)
+
+        assert [(r.key, r.attempts) for r in rates] == [
+            ("-15ms", 1),
+            ("-5ms", 1),
+            ("+0ms", 1),
+        ]
+
+    def test_filters(self, connection):
+        """Bursts can be restricted by target day and source."""
+        assert [r.key for r in win_rates(connection, "weekday", since=TUESDAY)] == [
+            "Tue"
+        ]
+        assert [r.key for r in win_rates(connection, "resource", source="sniper")] == [
+            "231",
+            "233",
+        ]
+
+    def test_groups_without_failures(self, connection):
+        """Groups of successes only count zero failures."""
+        write_bursts(connection, [(BurstEntry("burst", MONDAY), [attempt("240")])])
+
+        rates = {r.key: r for r in win_rates(connection, "resource")}
+
+        assert (rates["240"].conflicts, rates["240"].too_early) == (0, 0)
+
+    def test_unknown_dimension(self, connection):
+        """Only known groupings are accepted."""
+        with pytest.raises(ValueError):
+            win_rates(connection, "resource_id; DROP TABLE attempts")
+
+    def test_table(self, connection):
+        """Rates render as one line per group."""
+        table = format_win_rates(win_rates(connection, "resource"), "resource")
+
+        assert len(table.splitlines()) == 4
+        assert "50.0%" in table
+
+
+class TestAttemptJournal:
+    """Test the background writer."""
+
+    def test_writes_in_background(self, tmp_path):
+        """Recorded bursts reach the database in WAL mode."""
+        path = tmp_path / "journal.sqlite3"
+        journal = AttemptJournal(path, flush_interval=0)
+        journal.record(BurstEntry("burst", MONDAY), [attempt("231")])
+        journal.record(BurstEntry("burst", TUESDAY), [attempt("232")])
+
+        assert journal.flush(timeout=5)
+        with sqlite3.connect(path) as reader:
+            assert reader.execute("SELECT COUNT(*) FROM bursts").fetchone() == (2,)
+            assert reader.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+        journal.close()
+
+    def test_close_writes_pending_bursts(self, tmp_path):
+        """Closing waits for bursts still being collected."""
+        path = tmp_path / "journal.sqlite3"
+        journal = AttemptJournal(path, flush_interval=60)
+        journal.record(BurstEntry("burst", MONDAY), [attempt("231")])
+
+        journal.close()
+
+        with sqlite3.connect(path) as reader:
+            assert reader.execute("SELECT COUNT(*) FROM attempts").fetchone() == (1,)
+
+    def test_write_errors_are_logged(self, tmp_path, caplog):
+        """A broken database loses the batch, not the run."""
+        path = tmp_path / "journal.sqlite3"
+        path.write_text("not a database")
+        journal = AttemptJournal(path, flush_interval=0)
+        journal.record(BurstEntry("burst", MONDAY), [attempt("231")])
+
+        assert journal.flush(timeout=5)
+        journal.close()
+        assert "Could not journal" in caplog.text
+
+    def test_unusable_directory_keeps_writer_alive(self, tmp_path, caplog):
+        """An unusable journal location is logged and the writer keeps going."""
+        blocker = tmp_path / "blocker"
+        blocker.write_text("a file, not a directory")
+        journal = AttemptJournal(blocker / "journal.sqlite3", flush_interval=0)
+        journal.record(BurstEntry("burst", MONDAY), [attempt("231")])
+        assert journal.flush(timeout=5)
+
+        journal.record(BurstEntry("burst", TUESDAY), [attempt("232")])
+        assert journal.flush(timeout=5)
+        journal.close()
+        assert caplog.text.count("Could not journal") == 2
+
+    def test_bad_burst_keeps_writer_alive(self, tmp_path, caplog):
+        """An entry that cannot be written loses its batch, not the writer."""
+        path = tmp_path / "journal.sqlite3"
+        journal = AttemptJournal(path, flush_interval=0)
+        journal.record(BurstEntry("burst", "not a date"), [attempt("231")])
+        assert journal.flush(timeout=5)
+
+        journal.record(BurstEntry("burst", TUESDAY), [attempt("232")])
+        assert journal.flush(timeout=5)
+        journal.close()
+        assert "Could not journal" in caplog.text
+        with sqlite3.connect(path) as reader:
+            assert reader.execute("SELECT COUNT(*) FROM bursts").fetchone() == (1,)
+
+    def test_flush_returns_when_writer_is_gone(self, tmp_path):
+        """Flushing does not wait forever for a writer thread that has died."""
+        journal = AttemptJournal(tmp_path / "journal.sqlite3")
+        with patch.object(journal, "_run", lambda: None):
+            journal.record(BurstEntry("burst", MONDAY), [attempt("231")])
+            journal._thread.join()
+
+        assert not journal.flush()
+
+
+class TestBurstIsJournaled:
+    """Test journaling from attempt_batch_booking."""
+
+    @pytest.mark.asyncio
+    async def test_timed_burst_journaled(self, isolated_state):
+        """A timed burst is journaled with its release instant and offsets."""
+
+        def handler(request):
+            if request.method == "HEAD":
+                return httpx.Response(404)
+            return httpx.Response(
+                200,
+                json={"success": True, "data": {"success": False, "errors": []}},
+            )
+
+        fire_at = datetime.now() + timedelta(milliseconds=100)
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            with (
+                patch("scheduler.amain.PREFERRED_RANGE", range(231, 234)),
+                patch("scheduler.amain.WARM_CONNECTIONS", 1),
+            ):
+                await attempt_batch_booking(
+                    client, "token", MONDAY, fire_at=fire_at, firing_shift=0.02
+                )
+
+        assert isolated_state.journal.flush(timeout=5)
+        connection = connect(isolated_state.journal.path)
+        try:
+            burst = connection.execute(
+                "SELECT source, target_date, weekday, release_at, firing_shift_ms "
+                "FROM bursts"
+            ).fetchone()
+            offsets = [
+                offset
+                for (offset,) in connection.execute("SELECT offset_ms FROM attempts")
+            ]
+        finally:
+            connection.close()
+
+        assert burst == ("burst", "2025-05-12", 0, fire_at.isoformat(), 20.0)
+        assert len(offsets) == 3
+        assert all(20 <= offset < 120 for offset in offsets)
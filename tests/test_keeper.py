@@ -0,0 +1,88 @@
+"""Tests for the background session keeper (no HTTP required)."""
+
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from scheduler.keeper import SessionKeeper
+from scheduler.session_store import SessionRecord
+
+HEADERS = {"User-Agent": "test"}
+COOKIES = {"login_token": "abc"}
+
+
+def keeper_patches(created_at, probed="csrf"):
+    """Patch the session helpers used by the keeper."""
+    fresh_client = MagicMock(aclose=AsyncMock())
+    record = None
+    if created_at is not None:
+        record = SessionRecord(HEADERS, COOKIES, "csrf", created_at=created_at)
+    return {
+        "store": patch(
+            "scheduler.keeper.session_store", MagicMock(load=lambda: record)
+        ),
+        "probe": patch(
+            "scheduler.keeper.probe_session", AsyncMock(return_value=probed)
+        ),
+        "fresh": patch(
+            "scheduler.keeper.create_fresh_session",
+            AsyncMock(return_value=(fresh_client, "new")),
+        ),
+        "cache": patch("scheduler.keeper.cache_session_data"),
+    }
+
+
+async def run_check(created_at, **kwargs):
+    """Run one keeper check and return (refreshed, mocks)."""
+    patches = keeper_patches(created_at, **kwargs)
+    mocks = {name: p.start() for name, p in patches.items()}
+    try:
+        refreshed = await SessionKeeper(max_age=3600).check_once()
+    finally:
+        for p in patches.values():
+            p.stop()
+    return refreshed, mocks
+
+
+class TestSessionKeeper:
+    """Test refresh decisions."""
+
+    @pytest.mark.asyncio
+    async def test_valid_session_is_kept(self):
+        """A young session accepted by the server is left alone."""
+        refreshed, mocks = await run_check(time.time() - 60)
+        assert not refreshed
+        mocks["fresh"].assert_not_called()
+        mocks["cache"].assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_missing_session_is_created(self):
+        """Without a cached session the keeper logs in."""
+        refreshed, mocks = await run_check(None)
+        assert refreshed
+        mocks["fresh"].assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_old_session_is_refreshed_proactively(self):
+        """Sessions past max_age are refreshed without probing."""
+        refreshed, mocks = await run_check(time.time() - 7200)
+        assert refreshed
+        mocks["probe"].assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_rejected_session_is_refreshed(self):
+        """A failed probe triggers re-authentication."""
+        refreshed, mocks = await run_check(time.time() - 60, probed=None)
+        assert refreshed
+        mocks["fresh"].assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_rotated_token_is_cached(self):
+        """A new CSRF token is written back with the original creation time."""
+        created_at = time.time() - 60
+        refreshed, mocks = await run_check(created_at, probed="rotated")
+        assert not refreshed
+        mocks["cache"].assert_called_once_with(
+            HEADERS, COOKIES, "rotated", created_at=created_at
+        )
@@ -0,0 +1,163 @@
+"""Tests for the metrics registry and endpoint."""
+
+import asyncio
+
+import pytest
+
+from scheduler import metrics
+from scheduler.amain import BookingResult, record_burst_metrics
+from scheduler.errors import classify_http_status
+from scheduler.metrics import (
+    Counter,
+    Gauge,
+    Histogram,
+    MetricsServer,
+    Registry,
+    metrics_endpoint,
+)
+from scheduler.timing import RequestTiming
+
+
+class TestMetricFamilies:
+    """Test metric types and exposition format."""
+
+    def test_labelled_children_are_reused(self):
+        """Binding the same labels twice returns the same child."""
+        counter = Counter("c_total", "A counter", ["resource"])
+
+        assert counter.labels("231") is counter.labels("231")
+        assert counter.labels("231") is not counter.labels("232")
+
+    def test_wrong_label_count_rejected(self):
+        """Label values must match the declared label names."""
+        counter = Counter("c_total", "A counter", ["resource", "error_class"])
+
+        with pytest.raises(ValueError):
+            counter.labels("231")
+
+    def test_counter_and_gauge_render(self):
+        """Counters and gauges render one sample per child."""
+        registry = Registry()
+        counter = registry.register(Counter("c_total", "A counter", ["resource"]))
+        gauge = registry.register(Gauge("g", "A gauge"))
+        counter.labels('2"31').inc(2)
+        gauge.set_function(lambda: 0.5)
+
+        text = registry.render()
+
+        assert "# TYPE c_total counter" in text
+        assert 'c_total{resource="2\\"31"} 2.0' in text
+        assert "g 0.5" in text
+
+    def test_counter_read_at_scrape_time(self):
+        """Counters kept elsewhere are read when rendered."""
+        registry = Registry()
+        counter = registry.register(Counter("hits_total", "Hits"))
+        hits = [3]
+        counter.set_function(lambda: hits[0])
+        hits[0] = 5
+
+        assert "# TYPE hits_total counter" in registry.render()
+        assert "hits_total 5.0" in registry.render()
+
+    def test_unlabelled_metrics_start_at_zero(self):
+        """Unlabelled metrics are reported before their first update."""
+        registry = Registry()
+        registry.register(Counter("c_total", "A counter"))
+
+        assert "c_total 0.0" in registry.render()
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Bucket counts include every smaller bucket; +Inf equals the count."""
+        registry = Registry()
+        histogram = registry.register(Histogram("h", "A histogram", buckets=[1, 2]))
+        for value in (0.5, 1.0, 1.5, 3.0):
+            histogram.observe(value)
+
+        text = registry.render()
+
+        assert 'h_bucket{le="1.0"} 2' in text
+        assert 'h_bucket{le="2.0"} 3' in text
+        assert 'h_bucket{le="+Inf"} 4' in text
+        assert "h_sum 6.0" in text
+        assert "h_count 4" in text
+
+    def test_duplicate_names_rejected(self):
+        """A family name can only be registered once."""
+        registry = Registry()
+        registry.register(Counter("c_total", "A counter"))
+
+        with pytest.raises(ValueError):
+            registry.register(Counter("c_total", "Another counter"))
+
+
+class TestBurstMetrics:
+    """Test recording booking results."""
+
+    def test_record_burst(self):
+        """Attempts, successes, error classes, latency and spread are recorded."""
+        attempts = metrics.booking_attempts.labels("231").value
+        successes = metrics.booking_successes.labels("231").value
+        http_errors = metrics.booking_errors.labels("232", "http_error").value
+        spread = metrics.burst_spread.labels()
+        spread_count = spread.count
+
+        record_burst_metrics(
+            [
+                BookingResult(
+                    "231",
+                    True,
+                    timing=RequestTiming(enqueued=0.0, request_sent=0.1, completed=0.2),
+                ),
+                BookingResult(
+                    "232",
+                    False,
+                    error="HTTP 500: oops",
+                    failure=classify_http_status(500),
+                    timing=RequestTiming(enqueued=0.0, request_sent=0.3, completed=0.4),
+                ),
+            ]
+        )
+
+        assert metrics.booking_attempts.labels("231").value == attempts + 1
+        assert metrics.booking_successes.labels("231").value == successes + 1
+        assert (
+            metrics.booking_errors.labels("232", "http_error").value == http_errors + 1
+        )
+        assert spread.count == spread_count + 1
+
+
+class TestMetricsServer:
+    """Test the HTTP endpoint."""
+
+    @pytest.mark.asyncio
+    async def test_serves_metrics(self):
+        """GET /metrics returns the exposition text; other paths are 404."""
+        registry = Registry()
+        registry.register(Counter("c_total", "A counter")).inc()
+
+        async with metrics_endpoint(0, registry) as server:
+            assert isinstance(server, MetricsServer)
+            ok = await fetch(server.port, "/metrics")
+            missing = await fetch(server.port, "/")
+
+        assert ok.startswith(b"HTTP/1.1 200 OK")
+        assert b"text/plain; version=0.0.4" in ok
+        assert ok.endswith(b"c_total 1.0\n")
+        assert missing.startswith(b"HTTP/1.1 404")
+
+    @pytest.mark.asyncio
+    async def test_disabled_without_port(self):
+        """No endpoint is started when no port is configured."""
+        async with metrics_endpoint(None) as server:
+            assert server is None
+
+
+async def fetch(port: int, path: str) -> bytes:
+    """Raw HTTP GET against the local endpoint."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    return response
@@ -0,0 +1,120 @@
+"""Tests for per-resource statistics and ranking."""
+
+from datetime import date
+from unittest.mock import patch
+
+import httpx
+import pytest
+from diskcache import Cache
+
+from scheduler.amain import BookingResult, attempt_batch_booking
+from scheduler.errors import ErrorCode, ReservationFailure
+from scheduler.resource_stats import ResourceStats, ResourceStatsStore
+from scheduler.timing import RequestTiming
+
+
+@pytest.fixture
+def store(tmp_path):
+    """A store on a throwaway cache, without decay."""
+    with Cache(tmp_path / "cache") as cache:
+        yield ResourceStatsStore(cache, decay=1.0)
+
+
+def won(resource_id: str) -> BookingResult:
+    """A successful result."""
+    return BookingResult(resource_id, True, reference_number="REF")
+
+
+def lost(resource_id: str, code: ErrorCode = ErrorCode.CONFLICT) -> BookingResult:
+    """A failed result."""
+    return BookingResult(resource_id, False, failure=ReservationFailure(code))
+
+
+class TestResourceStats:
+    """Test the per-resource estimates."""
+
+    def test_prior_without_history(self):
+        """Unknown resources get the prior mean."""
+        assert ResourceStats().win_probability() == 0.5
+
+    def test_estimates(self):
+        """Wins raise the estimate, conflicts lower it."""
+        stats = ResourceStats(attempts=4, wins=1, conflicts=3)
+
+        assert stats.win_probability() == pytest.approx(2 / 6)
+        assert stats.conflict_rate == 0.75
+        assert stats.mean_latency is None
+
+
+class TestResourceStatsStore:
+    """Test recording and ranking."""
+
+    def test_records_contested_outcomes(self, store):
+        """Wins and conflicts count as attempts, other failures do not."""
+        timed = lost("232")
+        timed.timing = RequestTiming(enqueued=1.0, completed=1.25)
+        store.record(
+            [won("231"), timed, lost("232"), lost("233", ErrorCode.TOO_FAR_IN_FUTURE)]
+        )
+
+        stats = store.load()
+        assert (stats["231"].attempts, stats["231"].wins) == (1, 1)
+        assert (stats["232"].attempts, stats["232"].conflicts) == (2, 2)
+        assert stats["232"].mean_latency == pytest.approx(0.25)
+        assert stats["233"].attempts == 0
+
+    def test_counts_decay_per_burst(self, tmp_path):
+        """Older bursts weigh less."""
+        with Cache(tmp_path / "decaying") as cache:
+            store = ResourceStatsStore(cache, decay=0.5)
+            store.record([lost("231")])
+            store.record([won("232")])
+
+            assert store.load()["231"].conflicts == 0.5
+
+    def test_rank_by_win_probability(self, store):
+        """Seats we win go first, contested ones last, unknown ones between."""
+        store.record([won("233"), lost("231"), lost("231")])
+
+        assert store.rank(["231", "232", "233", "234"]) == ["233", "232", "234", "231"]
+
+    def test_rank_keeps_order_without_history(self, store):
+        """Without history the preference order is kept."""
+        assert store.rank(["3", "1", "2"]) == ["3", "1", "2"]
+
+    def test_invalid_cache_entry(self, store):
+        """Garbage in the cache is ignored."""
+        store.cache.set(ResourceStatsStore.CACHE_KEY, {"231": {"bogus": 1}})
+
+        assert store.load() == {}
+
+
+class TestRankingInBurst:
+    """Test that bursts use and feed the statistics."""
+
+    @pytest.mark.asyncio
+    async def test_likely_seats_fire_first(self, isolated_state):
+        """The burst sends its first request to the most promising seat."""
+        isolated_state.resource_stats.record([won("234"), lost("231")])
+        sent = []
+
+        def handler(request):
+            body = request.content.decode()
+            sent.append(body.split('"resourceIds": ["', 1)[1].split('"', 1)[0])
+            return httpx.Response(
+                200,
+                json={
+                    "success": True,
+                    "data": {
+                        "success": False,
+                        "errors": ["Es gibt in Konflikt stehende Reservierungen"],
+                    },
+                },
+            )
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            with patch("scheduler.amain.PREFERRED_RANGE", range(231, 235)):
+                await attempt_batch_booking(client, "token", date(2024, 1, 15))
+
+        assert sent == ["234", "232", "233", "231"]
+        assert isolated_state.resource_stats.load()["234"].conflicts > 0
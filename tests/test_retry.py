@@ -0,0 +1,219 @@
+"""Tests for async retry scheduling."""
+
+import asyncio
+import random
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from scheduler.amain import BookingResult, SessionExpiredError, main_async
+from scheduler.errors import ErrorCode, ReservationFailure
+from scheduler.retry import RETRYABLE_CODES, RetryPolicy, RetryScheduler
+
+
+class FakeTime:
+    """Clock advanced by the scheduler's sleeps."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def clock(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def scheduler_for(policy: RetryPolicy) -> tuple[RetryScheduler, FakeTime]:
+    """A scheduler on a fake clock."""
+    fake = FakeTime()
+    return RetryScheduler(policy, clock=fake.clock, sleep=fake.sleep), fake
+
+
+class TestRetryPolicy:
+    """Test delays and retryability."""
+
+    def test_fixed_delay(self):
+        """A fixed policy waits the same time before every retry."""
+        policy = RetryPolicy.fixed(5, max_retries=3)
+
+        assert [policy.delay_for(n) for n in (1, 2, 3)] == [5, 5, 5]
+
+    def test_exponential_delay_is_capped(self):
+        """Exponential delays double up to the cap."""
+        policy = RetryPolicy.exponential(1, max_delay=5, jitter=0)
+
+        assert [policy.delay_for(n) for n in (1, 2, 3, 4)] == [1, 2, 4, 5]
+
+    def test_jitter_stays_in_bounds(self):
+        """Jitter spreads delays by at most the configured fraction."""
+        policy = RetryPolicy.exponential(10, jitter=0.2)
+        rng = random.Random(1)
+
+        delays = {policy.delay_for(1, rng) for _ in range(50)}
+
+        assert len(delays) > 1
+        assert all(8 <= d <= 12 for d in delays)
+
+    def test_retryable_codes(self):
+        """Only failures that can succeed later justify a retry."""
+        policy = RetryPolicy()
+
+        assert ErrorCode.NETWORK_ERROR in RETRYABLE_CODES
+        assert policy.is_retryable([ErrorCode.CONFLICT, ErrorCode.HTTP_ERROR])
+        assert not policy.is_retryable([ErrorCode.CONFLICT, ErrorCode.ONE_AT_A_TIME])
+        assert policy.is_retryable([None])
+
+
+class TestRetryScheduler:
+    """Test retry decisions and waiting."""
+
+    @pytest.mark.asyncio
+    async def test_retries_are_limited(self):
+        """No more than max_retries retries are granted."""
+        retries, fake = scheduler_for(RetryPolicy.fixed(2, max_retries=2))
+
+        granted = [await retries.next_attempt() for _ in range(3)]
+
+        assert granted == [True, True, False]
+        assert retries.attempt == 3
+        assert fake.sleeps == [2, 2]
+
+    @pytest.mark.asyncio
+    async def test_immediate_retry_skips_delay(self):
+        """Immediate retries do not wait."""
+        retries, fake = scheduler_for(RetryPolicy.fixed(2, max_retries=1))
+
+        assert await retries.next_attempt(immediate=True)
+        assert fake.sleeps == []
+
+    @pytest.mark.asyncio
+    async def test_deadline_bounds_retries(self):
+        """A retry that would start after the deadline is not made."""
+        policy = RetryPolicy.exponential(4, max_retries=10, jitter=0, deadline=10)
+        retries, fake = scheduler_for(policy)
+
+        while await retries.next_attempt():
+            pass
+
+        assert fake.sleeps == [4]
+        assert fake.now <= 10
+
+    @pytest.mark.asyncio
+    async def test_deadline_counts_from_first_attempt(self):
+        """Time spent before the first attempt ends does not use up the deadline."""
+        retries, fake = scheduler_for(RetryPolicy.fixed(4, max_retries=1, deadline=10))
+        fake.now = 3600
+
+        assert await retries.next_attempt()
+        assert fake.sleeps == [4]
+
+    @pytest.mark.asyncio
+    async def test_non_retryable_failures_stop(self):
+        """Failures no retry can fix end the run at once."""
+        retries, fake = scheduler_for(RetryPolicy.fixed(2, max_retries=5))
+
+        assert not await retries.next_attempt([ErrorCode.ONE_AT_A_TIME])
+        assert fake.sleeps == []
+
+
+def failed_round(code: ErrorCode = ErrorCode.HTTP_ERROR) -> list[BookingResult]:
+    """Results of a burst without a success."""
+    return [BookingResult("231", False, failure=ReservationFailure(code))]
+
+
+@asynccontextmanager
+async def fake_session(refresh: bool = False):
+    """Authenticated session stand-in."""
+    yield MagicMock(), "token"
+
+
+class TestMainAsyncRetries:
+    """Test the retry loop of main_async."""
+
+    @pytest.mark.asyncio
+    async def test_waiting_does_not_block_the_loop(self):
+        """Other tasks keep running while main_async waits to retry."""
+        ticks = 0
+
+        async def ticker() -> None:
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.005)
+
+        batch = AsyncMock(return_value=failed_round())
+        with (
+            patch("scheduler.amain.authenticated_session", fake_session),
+            patch("scheduler.amain.attempt_batch_booking", batch),
+            patch("scheduler.amain.RETRY_ON_FAIL", True),
+        ):
+            ticking = asyncio.create_task(ticker())
+            await main_async(policy=RetryPolicy.fixed(0.05, max_retries=2))
+            ticking.cancel()
+
+        assert batch.await_count == 3
+        assert ticks >= 10
+
+    @pytest.mark.asyncio
+    async def test_no_retry_without_retry_on_fail(self):
+        """Failed rounds are only repeated when configured."""
+        batch = AsyncMock(return_value=failed_round())
+        with (
+            patch("scheduler.amain.authenticated_session", fake_session),
+            patch("scheduler.amain.attempt_batch_booking", batch),
+        ):
+            await main_async(policy=RetryPolicy.fixed(0, max_retries=3))
+
+        assert batch.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_session_expiry_retries_with_fresh_session(self):
+        """An expired session is retried at once with a new login."""
+        refreshes = []
+
+        @asynccontextmanager
+        async def session(refresh: bool = False):
+            refreshes.append(refresh)
+            yield MagicMock(), "token"
+
+        batch = AsyncMock(side_effect=[SessionExpiredError(), failed_round()])
+        with (
+            patch("scheduler.amain.authenticated_session", session),
+            patch("scheduler.amain.attempt_batch_booking", batch),
+        ):
+            await main_async(policy=RetryPolicy.fixed(60, max_retries=1))
+
+        assert refreshes == [False, True]
+
+    @pytest.mark.asyncio
+    async def test_deadline_counts_from_delayed_release(self):
+        """Waiting for a late release does not use up the retry deadline."""
+
+        async def burst(*args, fire_at=None, **kwargs):
+            # The first burst waits for the release before it fails
+            if batch.await_count == 1:
+                await asyncio.sleep(0.2)
+            return failed_round()
+
+        batch = AsyncMock(side_effect=burst)
+        with (
+            patch("scheduler.amain.authenticated_session", fake_session),
+            patch("scheduler.amain.probe_session", AsyncMock(return_value="token")),
+            patch(
+                "scheduler.amain.measure_server_clock_offset",
+                AsyncMock(return_value=0.0),
+            ),
+            patch("scheduler.amain.attempt_batch_booking", batch),
+            patch("scheduler.amain.RETRY_ON_FAIL", True),
+        ):
+            await main_async(
+                fire_at=datetime.now() + timedelta(seconds=0.2),
+                policy=RetryPolicy.fixed(0, max_retries=1, deadline=0.1),
+            )
+
+        assert batch.await_count == 2
@@ -0,0 +1,104 @@
+"""Tests for the versioned session store."""
+
+import time
+from unittest.mock import patch
+
+import pytest
+from diskcache import Cache
+
+from scheduler.session_store import SessionRecord, SessionStore
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """A throwaway diskcache."""
+    with Cache(tmp_path / "cache") as cache:
+        yield cache
+
+
+def make_record(**overrides) -> SessionRecord:
+    """A valid session record."""
+    fields = {
+        "headers": {"User-Agent": "test"},
+        "cookies": {"login_token": "abc"},
+        "csrf_token": "csrf",
+    }
+    fields.update(overrides)
+    return SessionRecord(**fields)
+
+
+class TestSessionStore:
+    """Test atomic storage and the in-memory hot copy."""
+
+    def test_round_trip_across_instances(self, cache):
+        """A record saved by one process is loaded by another."""
+        SessionStore(cache, max_age=3600).save(make_record())
+        record = SessionStore(cache, max_age=3600).load()
+
+        assert record is not None
+        assert record.csrf_token == "csrf"
+        assert record.version == 1
+
+    def test_repeated_loads_hit_memory(self, cache):
+        """Unchanged records are served without touching the disk."""
+        store = SessionStore(cache, max_age=3600)
+        store.save(make_record())
+
+        with patch.object(cache, "get", wraps=cache.get) as get:
+            for _ in range(3):
+                assert store.load() is not None
+
+        assert store.hits == 3
+        get.assert_not_called()
+
+    def test_version_checked_after_interval(self, cache):
+        """Once the interval has passed only the version is read from disk."""
+        store = SessionStore(cache, max_age=3600, check_interval=0)
+        store.save(make_record())
+
+        with patch.object(cache, "get", wraps=cache.get) as get:
+            assert store.load() is not None
+
+        assert store.hits == 1
+        keys = [call.args[0] for call in get.call_args_list]
+        assert keys == [SessionStore.VERSION_KEY]
+
+    def test_writes_from_other_instances_are_seen(self, cache):
+        """A version bump by another writer invalidates the hot copy."""
+        reader = SessionStore(cache, max_age=3600, check_interval=0)
+        SessionStore(cache, max_age=3600).save(make_record(csrf_token="old"))
+        assert reader.load().csrf_token == "old"
+
+        SessionStore(cache, max_age=3600).save(make_record(csrf_token="new"))
+        assert reader.load().csrf_token == "new"
+
+    def test_expired_records_are_not_returned(self, cache):
+        """Records older than max_age are treated as missing."""
+        store = SessionStore(cache, max_age=3600)
+        store.save(make_record(created_at=time.time() - 3000))
+        assert store.load() is not None
+
+        store.max_age = 1800
+        assert store.load() is None
+
+    def test_invalid_records_are_rejected(self, cache):
+        """Records with non-string cookie values are ignored."""
+        store = SessionStore(cache, max_age=3600)
+        store.save(make_record(cookies={"login_token": 123}))
+        assert SessionStore(cache, max_age=3600).load() is None
+
+    @pytest.mark.parametrize("entry", [make_record(), {"headers": {}}, "not a record"])
+    def test_bad_entries_are_misses(self, cache, entry):
+        """Entries not written as a record dict are treated as missing."""
+        cache.set(SessionStore.RECORD_KEY, entry)
+        store = SessionStore(cache, max_age=3600)
+
+        assert store.load() is None
+        assert store.misses == 1
+
+    def test_clear(self, cache):
+        """Cleared records are gone for every reader."""
+        store = SessionStore(cache, max_age=3600)
+        store.save(make_record())
+        store.clear()
+        assert SessionStore(cache, max_age=3600).load() is None
@@ -0,0 +1,241 @@
+"""Tests for the cancellation sniper."""
+
+import asyncio
+from datetime import date, datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from benchmarks.standin import (
+    BookedStandIn,
+    LatencyModel,
+    StandInConfig,
+    point_booker_at,
+)
+from scheduler.amain import (
+    BookingResult,
+    authenticate_client,
+    calculate_booking_times,
+    create_http_client,
+    get_csrf_token_from_schedule_page,
+)
+from scheduler.availability import Occupancy
+from scheduler.config import BookingConstants
+from scheduler.errors import ErrorCode, ReservationFailure
+from scheduler.sniper import CancellationSniper, PollPacer, default_target_date
+
+FAST = LatencyModel(1.0, 0.0)
+
+
+def fast_pacer() -> PollPacer:
+    """A pacer polling every few milliseconds."""
+    return PollPacer(min_interval=0.005, max_interval=0.01, ramp=60)
+
+
+class TestPollPacer:
+    """Test the adaptive polling interval."""
+
+    def test_relaxed_far_from_slot(self):
+        """Far from the slot the maximum interval is used."""
+        pacer = PollPacer(min_interval=2, max_interval=60, ramp=3600)
+
+        assert pacer.interval(86400) == 60
+
+    def test_shrinks_towards_slot(self):
+        """Within the ramp the interval approaches the minimum."""
+        pacer = PollPacer(min_interval=2, max_interval=60, ramp=3600)
+
+        assert pacer.interval(1800) == pytest.approx(31)
+        assert pacer.interval(0) == 2
+
+    def test_churn_speeds_up_polling(self):
+        """Seats changing hands shorten the interval, calm lengthens it again."""
+        pacer = PollPacer(min_interval=2, max_interval=60, ramp=3600)
+
+        pacer.observe(5)
+        busy = pacer.interval(86400)
+        for _ in range(20):
+            pacer.observe(0)
+
+        assert busy == pytest.approx(30)
+        assert pacer.interval(86400) > 55
+
+
+class TestDefaultTargetDate:
+    """Test the day watched by default."""
+
+    def test_today_before_slot(self):
+        """Before the slot starts today is watched."""
+        now = datetime.combine(date(2025, 5, 20), datetime.min.time())
+
+        assert default_target_date(now) == date(2025, 5, 20)
+
+    def test_tomorrow_after_slot(self):
+        """Once the slot has started the next day is watched."""
+        start, _ = calculate_booking_times(date(2025, 5, 20))
+
+        assert default_target_date(start) == date(2025, 5, 21)
+
+
+async def login(server: BookedStandIn):
+    """Authenticated client and CSRF token for the stand-in."""
+    client = create_http_client()
+    await authenticate_client(client)
+    return client, await get_csrf_token_from_schedule_page(client)
+
+
+class TestSniperAgainstStandIn:
+    """Sniping freed seats from the stand-in."""
+
+    @pytest.mark.asyncio
+    async def test_books_cancelled_seat(self):
+        """A cancellation is noticed with the next full listing and booked."""
+        target = date.today() + timedelta(days=3)
+        start, end = calculate_booking_times(target)
+        async with BookedStandIn(StandInConfig(latency=FAST)) as server:
+            await server.reserve("someone", "232", start, end)
+            freed, _ = await server.reserve("someone-else", "231", start, end)
+            with (
+                point_booker_at(server.base_url),
+                patch("scheduler.amain.SCHEDULE_ID", 1),
+                patch.object(BookingConstants, "SCHEDULE_FULL_REFRESH_SECONDS", 0.1),
+            ):
+                client, csrf_token = await login(server)
+                sniper = CancellationSniper(target, ["231", "232"], pacer=fast_pacer())
+                watching = asyncio.create_task(sniper.watch(client, csrf_token))
+                await asyncio.sleep(0.05)
+                assert sniper.booked is None
+
+                await server.cancel(freed)
+                refresh = await asyncio.wait_for(watching, timeout=5)
+                await client.aclose()
+
+        assert not refresh
+        assert sniper.booked is not None
+        assert sniper.booked.resource_id == "231"
+        assert sniper.booked.reference_number in {
+            r.reference_number for r in server.reservations
+        }
+
+    @pytest.mark.asyncio
+    async def test_stops_when_already_holding_slot(self):
+        """Holding a reservation at that time ends the watch."""
+        target = date.today() + timedelta(days=3)
+        start, end = calculate_booking_times(target)
+        async with BookedStandIn(StandInConfig(latency=FAST)) as server:
+            with (
+                point_booker_at(server.base_url),
+                patch("scheduler.amain.SCHEDULE_ID", 1),
+            ):
+                client, csrf_token = await login(server)
+                (our_session,) = server.sessions
+                await server.reserve(our_session, "233", start, end)
+                sniper = CancellationSniper(target, ["231", "232"], pacer=fast_pacer())
+                await asyncio.wait_for(sniper.watch(client, csrf_token), timeout=5)
+                await client.aclose()
+
+        assert sniper.finished
+        assert sniper.booked is None
+        assert sniper.results[0].error_code is ErrorCode.ONE_AT_A_TIME
+
+    @pytest.mark.asyncio
+    async def test_failed_polls_request_new_session(self):
+        """Repeated poll failures hand back for a session refresh."""
+        target = date.today() + timedelta(days=3)
+        async with BookedStandIn(StandInConfig(latency=FAST)) as server:
+            with (
+                point_booker_at(server.base_url),
+                patch("scheduler.amain.SCHEDULE_ID", 1),
+            ):
+                client = create_http_client()
+                sniper = CancellationSniper(target, ["231"], pacer=fast_pacer())
+                refresh = await asyncio.wait_for(
+                    sniper.watch(client, "stale"), timeout=5
+                )
+                await client.aclose()
+
+        assert refresh
+        assert sniper.polls == sniper.max_poll_failures
+
+    @pytest.mark.asyncio
+    async def test_stops_beyond_booking_horizon(self):
+        """A day that is not bookable yet ends the watch after one round."""
+        target = date.today() + timedelta(days=10)
+        async with BookedStandIn(StandInConfig(latency=FAST)) as server:
+            with (
+                point_booker_at(server.base_url),
+                patch("scheduler.amain.SCHEDULE_ID", 1),
+            ):
+                client, csrf_token = await login(server)
+                sniper = CancellationSniper(target, ["231", "232"], pacer=fast_pacer())
+                await asyncio.wait_for(sniper.watch(client, csrf_token), timeout=5)
+                await client.aclose()
+
+        assert sniper.finished
+        assert [r.error_code for r in sniper.results] == [
+            ErrorCode.TOO_FAR_IN_FUTURE
+        ] * 2
+
+
+class TestFailedSeats:
+    """Seats that fail while listed as free."""
+
+    @pytest.mark.asyncio
+    async def test_skipped_until_schedule_changes(self, isolated_state):
+        """A conflicting seat is not fired at again until it was listed taken."""
+        target = date.today() + timedelta(days=3)
+        start, end = calculate_booking_times(target)
+        fired = []
+        polls = 0
+        stop = asyncio.Event()
+
+        async def poll(client, csrf_token, target_date):
+            nonlocal polls
+            polls += 1
+            if polls == 4:  # Taken by someone ...
+                isolated_state.schedule.update([Occupancy("231", start, end, "R1")])
+            elif polls == 5:  # ... and cancelled again
+                isolated_state.schedule.replace_window(start, end, [])
+            elif polls == 7:
+                stop.set()
+            return 0
+
+        async def reserve(client, request, csrf_token):
+            fired.append(request.resource_id)
+            return BookingResult(
+                request.resource_id,
+                False,
+                failure=ReservationFailure(ErrorCode.CONFLICT),
+            )
+
+        with (
+            patch("scheduler.sniper.poll_schedule", poll),
+            patch("scheduler.sniper.create_single_reservation", reserve),
+        ):
+            sniper = CancellationSniper(target, ["231", "232"], pacer=fast_pacer())
+            await asyncio.wait_for(sniper.watch(None, "token", stop), timeout=5)
+
+        assert fired == ["231", "232", "231"]
+        assert sniper.failed == {"231", "232"}
+        assert not sniper.finished
+
+    @pytest.mark.asyncio
+    async def test_one_at_a_time_keeps_winning_request(self):
+        """A "one at a time" answer does not cancel the request that books."""
+        target = date.today() + timedelta(days=3)
+
+        async def reserve(client, request, csrf_token):
+            if request.resource_id == "231":
+                return BookingResult(
+                    "231", False, failure=ReservationFailure(ErrorCode.ONE_AT_A_TIME)
+                )
+            await asyncio.sleep(0.05)
+            return BookingResult(request.resource_id, True, reference_number="REF")
+
+        with patch("scheduler.sniper.create_single_reservation", reserve):
+            sniper = CancellationSniper(target, ["231", "232"])
+            booked = await sniper.fire(None, "token", ["231", "232"])
+
+        assert booked is not None
+        assert booked.reference_number == "REF"
+        assert sniper.booked is booked
@@ -0,0 +1,150 @@
+"""End-to-end tests of the booking flow against the local Booked stand-in."""
+
+import asyncio
+import time
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from benchmarks.standin import (
+    BookedStandIn,
+    LatencyModel,
+    StandInConfig,
+    point_booker_at,
+)
+from scheduler.amain import (
+    BookingRequest,
+    SessionExpiredError,
+    authenticate_client,
+    create_http_client,
+    create_single_reservation,
+    fetch_schedule_reservations,
+    get_csrf_token_from_schedule_page,
+)
+from scheduler.errors import ErrorCode
+
+FAST = LatencyModel(median_ms=1.0, sigma=0.0)
+
+
+async def login(server: BookedStandIn):
+    """Authenticate a fresh client against the stand-in."""
+    client = create_http_client()
+    await authenticate_client(client)
+    return client, await get_csrf_token_from_schedule_page(client)
+
+
+def request_for(resource_id: str, days_ahead: int = 7) -> BookingRequest:
+    """Booking request for the configured slot ``days_ahead`` from today."""
+    return BookingRequest(
+        resource_id=resource_id,
+        owner_id=1843,
+        reservation_date=date.today() + timedelta(days=days_ahead),
+    )
+
+
+class TestStandInBookingFlow:
+    """Drive the real client code against the stand-in server."""
+
+    @pytest.mark.asyncio
+    async def test_login_and_book(self):
+        """Login, 2FA, CSRF extraction and a successful booking."""
+        async with BookedStandIn(StandInConfig(latency=FAST)) as server:
+            with point_booker_at(server.base_url):
+                client, csrf_token = await login(server)
+                result = await create_single_reservation(
+                    client, request_for("231"), csrf_token
+                )
+                await client.aclose()
+
+        assert result.success
+        assert result.reference_number
+
+    @pytest.mark.asyncio
+    async def test_german_error_messages(self):
+        """The booking rules produce the real server's error payloads."""
+        async with BookedStandIn(StandInConfig(latency=FAST)) as server:
+            with point_booker_at(server.base_url):
+                client, csrf_token = await login(server)
+                other, other_token = await login(server)
+
+                await create_single_reservation(client, request_for("231"), csrf_token)
+                same_time = await create_single_reservation(
+                    client, request_for("232"), csrf_token
+                )
+                taken = await create_single_reservation(
+                    other, request_for("231"), other_token
+                )
+                too_far = await create_single_reservation(
+                    client, request_for("233", days_ahead=8), csrf_token
+                )
+                await client.aclose()
+                await other.aclose()
+
+        assert "nur eine Reservierung zur selben Zeit" in same_time.error
+        assert "in Konflikt stehende Reservierungen" in taken.error
+        assert "zu weit in der Zukunft" in too_far.error
+        assert "23:59:00" in too_far.error
+
+        assert same_time.error_code is ErrorCode.ONE_AT_A_TIME
+        assert taken.error_code is ErrorCode.CONFLICT
+        assert too_far.error_code is ErrorCode.TOO_FAR_IN_FUTURE
+        assert too_far.failure.latest_bookable.date() == date.today() + timedelta(7)
+
+    @pytest.mark.asyncio
+    async def test_release_instant_opens_window(self):
+        """Before release_at the target day is still too far in the future."""
+        config = StandInConfig(latency=FAST, release_at=time.time() + 0.3)
+        async with BookedStandIn(config) as server:
+            with point_booker_at(server.base_url):
+                client, csrf_token = await login(server)
+                early = await create_single_reservation(
+                    client, request_for("231"), csrf_token
+                )
+                await asyncio.sleep(0.35)
+                late = await create_single_reservation(
+                    client, request_for("231"), csrf_token
+                )
+                await client.aclose()
+
+        assert "zu weit in der Zukunft" in early.error
+        assert late.success
+
+    @pytest.mark.asyncio
+    async def test_expired_session_returns_401(self):
+        """Expired sessions surface as SessionExpiredError."""
+        async with BookedStandIn(StandInConfig(latency=FAST, session_ttl=0)) as server:
+            with point_booker_at(server.base_url):
+                client = create_http_client()
+                await authenticate_client(client)
+                with pytest.raises(SessionExpiredError):
+                    await create_single_reservation(client, request_for("231"), "x")
+                await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_competitors_take_seats(self):
+        """Simulated competitors book seats visible in the schedule."""
+        target = date.today() + timedelta(days=7)
+        config = StandInConfig(
+            latency=FAST,
+            competitors=5,
+            competitor_burst=2,
+            competitor_slot=(
+                datetime.combine(target, datetime.min.time()).replace(hour=6),
+                datetime.combine(target, datetime.min.time()).replace(hour=17),
+            ),
+            competitor_reaction=FAST,
+            seed=1,
+        )
+        async with BookedStandIn(config) as server:
+            with point_booker_at(server.base_url):
+                client, csrf_token = await login(server)
+                await asyncio.sleep(0.1)
+                schedule = await fetch_schedule_reservations(
+                    client, server.base_url, 1, target, target, csrf_token
+                )
+                await client.aclose()
+
+        assert len(schedule) == 5
+        assert {item["ReferenceNumber"] for item in schedule} == {
+            r.reference_number for r in server.reservations
+        }
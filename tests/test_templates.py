@@ -0,0 +1,54 @@
+"""Tests for precompiled multipart reservation bodies."""
+
+import httpx
+import pytest
+
+from scheduler.templates import PLACEHOLDER, MultipartTemplate
+
+
+def encode_with_httpx(files: dict, boundary: str) -> bytes:
+    """Encode form parts the regular way."""
+    request = httpx.Request(
+        "POST",
+        "http://example.test/",
+        files=files,
+        headers={"Content-Type": f"multipart/form-data; boundary={boundary}"},
+    )
+    return request.read()
+
+
+def reservation_parts(resource_id: str) -> dict:
+    """Form parts shaped like a reservation POST."""
+    return {
+        "request": (
+            None,
+            f'{{"reservation": {{"resourceIds": ["{resource_id}"]}}}}',
+            "application/json",
+        ),
+        "CSRF_TOKEN": (None, "token=="),
+        "BROWSER_TIMEZONE": (None, "Europe/Zurich"),
+    }
+
+
+class TestMultipartTemplate:
+    """Test template compilation and rendering."""
+
+    def test_render_matches_httpx_encoding(self):
+        """Rendered bodies are byte-identical to httpx's own encoding."""
+        template = MultipartTemplate.compile(
+            reservation_parts(PLACEHOLDER), boundary="fixedboundary"
+        )
+        expected = encode_with_httpx(reservation_parts("231"), "fixedboundary")
+
+        assert template.render("231") == expected
+        assert template.content_type == "multipart/form-data; boundary=fixedboundary"
+
+    def test_render_escapes_json_special_characters(self):
+        """Values are escaped for the JSON string they are spliced into."""
+        template = MultipartTemplate.compile(reservation_parts(PLACEHOLDER))
+        assert b'["a\\"b"]' in template.render('a"b')
+
+    def test_compile_requires_single_placeholder(self):
+        """Templates without exactly one splice point are rejected."""
+        with pytest.raises(ValueError, match="exactly once"):
+            MultipartTemplate.compile(reservation_parts("231"))
@@ -0,0 +1,112 @@
+"""Tests for per-request timing."""
+
+from datetime import date, timedelta
+
+import pytest
+
+from benchmarks.standin import (
+    BookedStandIn,
+    LatencyModel,
+    StandInConfig,
+    point_booker_at,
+)
+from scheduler.amain import (
+    BookingRequest,
+    authenticate_client,
+    create_http_client,
+    create_single_reservation,
+    get_csrf_token_from_schedule_page,
+)
+from scheduler.timing import RequestTiming, summarize_timings
+
+
+class TestRequestTiming:
+    """Test trace event handling and derived phases."""
+
+    @pytest.mark.asyncio
+    async def test_trace_events_fill_phases(self):
+        """Transport events map onto the request phases."""
+        timing = RequestTiming(enqueued=0.0)
+        await timing.trace("connection.connect_tcp.started", {})
+        await timing.trace("http11.send_request_headers.started", {})
+        await timing.trace("http11.send_request_body.complete", {})
+        await timing.trace("http11.receive_response_headers.complete", {})
+
+        assert timing.new_connection
+        assert timing.connection_acquired is not None
+        assert timing.request_sent is not None
+        assert timing.first_byte is not None
+        assert timing.connection_acquired <= timing.request_sent <= timing.first_byte
+
+    def test_phases_from_timestamps(self):
+        """Phase durations are differences of consecutive timestamps."""
+        timing = RequestTiming(
+            enqueued=1.0,
+            connection_acquired=1.5,
+            request_sent=1.75,
+            first_byte=2.75,
+            completed=3.0,
+        )
+
+        assert timing.queue_time == 0.5
+        assert timing.send_time == 0.25
+        assert timing.server_time == 1.0
+        assert timing.total_time == 2.0
+
+    def test_missing_phases_are_none(self):
+        """Phases the transport did not report stay unknown."""
+        timing = RequestTiming(enqueued=1.0, completed=2.0)
+
+        assert timing.queue_time is None
+        assert timing.server_time is None
+        assert timing.total_time == 1.0
+
+    def test_summary_skips_unmeasured_phases(self):
+        """The summary reports medians of the phases that were measured."""
+        timings = [
+            RequestTiming(enqueued=0.0, completed=0.010),
+            RequestTiming(enqueued=0.0, completed=0.030, new_connection=True),
+        ]
+
+        summary = summarize_timings(timings)
+
+        assert "total 20.00ms" in summary
+        assert "server" not in summary
+        assert "1/2 new connections" in summary
+
+
+class TestTimingAgainstStandIn:
+    """Timings recorded through a real connection."""
+
+    @pytest.mark.asyncio
+    async def test_reservation_result_carries_timing(self):
+        """Every phase is timestamped, in order, for a real request."""
+        config = StandInConfig(latency=LatencyModel(median_ms=5.0, sigma=0.0))
+        async with BookedStandIn(config) as server:
+            with point_booker_at(server.base_url):
+                client = create_http_client()
+                await authenticate_client(client)
+                csrf_token = await get_csrf_token_from_schedule_page(client)
+                result = await create_single_reservation(
+                    client,
+                    BookingRequest(
+                        resource_id="231",
+                        owner_id=1843,
+                        reservation_date=date.today() + timedelta(days=7),
+                    ),
+                    csrf_token,
+                )
+                await client.aclose()
+
+        timing = result.timing
+        assert timing is not None
+        stamps = [
+            timing.enqueued,
+            timing.connection_acquired,
+            timing.request_sent,
+            timing.first_byte,
+            timing.completed,
+        ]
+        assert None not in stamps
+        assert stamps == sorted(stamps)
+        assert timing.server_time >= 0.004
@@ -0,0 +1,144 @@
+"""Tests for multi-wave burst plans."""
+
+import asyncio
+import time
+from collections import Counter
+from datetime import date
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from scheduler import metrics
+from scheduler.amain import attempt_batch_booking
+from scheduler.errors import ErrorCode
+from scheduler.waves import Wave, WaveOrder, WaveOutcome, WavePlan
+
+CONFLICT = {
+    "success": True,
+    "data": {
+        "success": False,
+        "errors": ["Es gibt Konflikte mit anderen Reservierungen.\n15/01/2024"],
+    },
+}
+BOOKED = {"success": True, "data": {"success": True, "referenceNumber": "REF"}}
+
+
+def resource_of(request: httpx.Request) -> str:
+    """Resource id in a reservation request body."""
+    body = request.content.decode()
+    return body.split('"resourceIds": ["', 1)[1].split('"', 1)[0]
+
+
+class TestWaveOrder:
+    """Test the orders in which waves cover the resources."""
+
+    IDS = ("1", "2", "3", "4", "5")
+
+    def test_orders(self):
+        """Every order is a permutation of the preference order."""
+        assert WaveOrder.PREFERENCE.apply(self.IDS) == list(self.IDS)
+        assert WaveOrder.REVERSED.apply(self.IDS) == ["5", "4", "3", "2", "1"]
+        assert WaveOrder.INTERLEAVED.apply(self.IDS) == ["1", "3", "5", "2", "4"]
+        assert WaveOrder.ROTATED.apply(self.IDS) == ["3", "4", "5", "1", "2"]
+
+
+class TestWavePlan:
+    """Test plan construction."""
+
+    def test_waves_sorted_by_offset(self):
+        """Waves are released in offset order whatever the listing order."""
+        plan = WavePlan((Wave("late", 15), Wave("early", -20), Wave("on-time")))
+
+        assert [w.name for w in plan.waves] == ["early", "on-time", "late"]
+        assert plan.lead_ms == 20
+        assert plan.describe() == "early@-20ms on-time@+0ms late@+15ms"
+
+    def test_staggered_names_in_firing_order(self):
+        """Staggered plans name waves A, B, C in the order they fire."""
+        plan = WavePlan.staggered([0, -20, 15], [WaveOrder.REVERSED])
+
+        assert [(w.name, w.offset_ms) for w in plan.waves] == [
+            ("A", -20),
+            ("B", 0),
+            ("C", 15),
+        ]
+        assert plan.waves[1].order is WaveOrder.REVERSED
+
+    def test_invalid_plans(self):
+        """Empty plans and duplicate names are rejected."""
+        with pytest.raises(ValueError):
+            WavePlan(())
+        with pytest.raises(ValueError):
+            WavePlan((Wave("A"), Wave("A", 10)))
+
+    def test_outcome_summary(self):
+        """Outcomes summarise per error code."""
+        outcome = WaveOutcome(
+            "A", -20, 4, lateness_ms=0.5, errors=Counter({ErrorCode.CONFLICT: 3})
+        )
+        outcome.successes = 1
+
+        assert outcome.failures == 3
+        assert "4 sent, 1 booked" in outcome.summary()
+        assert "3 conflict" in outcome.summary()
+        assert "skipped" in WaveOutcome("B", 0, 4, skipped=True).summary()
+
+
+class TestWavesInBurst:
+    """Test firing waves with a mock transport."""
+
+    @pytest.mark.asyncio
+    async def test_waves_fire_staggered_in_their_order(self):
+        """Each wave covers every resource in its order, after its offset."""
+        arrivals = []
+
+        async def handler(request):
+            arrivals.append((time.perf_counter(), resource_of(request)))
+            return httpx.Response(200, json=CONFLICT)
+
+        plan = WavePlan((Wave("A", 0), Wave("B", 40, WaveOrder.REVERSED)))
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            with patch("scheduler.amain.PREFERRED_RANGE", range(231, 235)):
+                results = await attempt_batch_booking(
+                    client, "token", date(2024, 1, 15), plan=plan
+                )
+
+        assert Counter(r.wave for r in results) == {"A": 4, "B": 4}
+        assert [r.resource_id for r in results if r.wave == "B"] == [
+            "234",
+            "233",
+            "232",
+            "231",
+        ]
+        first_a = min(t for t, _ in arrivals[:4])
+        first_b = min(t for t, _ in arrivals[4:])
+        assert first_b - first_a >= 0.035
+
+    @pytest.mark.asyncio
+    async def test_later_waves_skipped_after_success(self):
+        """A success in an early wave keeps later waves from firing."""
+        sent = []
+
+        async def handler(request):
+            sent.append(resource_of(request))
+            if resource_of(request) == "231":
+                return httpx.Response(200, json=BOOKED)
+            return httpx.Response(200, json=CONFLICT)
+
+        skipped = metrics.wave_requests.labels("late", "skipped")
+        before = skipped.value
+        plan = WavePlan((Wave("early", 0), Wave("late", 100)))
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            with patch("scheduler.amain.PREFERRED_RANGE", range(231, 235)):
+                results = await asyncio.wait_for(
+                    attempt_batch_booking(
+                        client, "token", date(2024, 1, 15), plan=plan
+                    ),
+                    timeout=2,
+                )
+
+        assert len(sent) == 4
+        assert {r.wave for r in results} == {"early"}
+        assert any(r.success for r in results)
+        assert skipped.value - before == 4